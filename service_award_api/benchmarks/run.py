@@ -0,0 +1,327 @@
+'''
+Benchmark dos endpoints principais com uma organização sintética e um Mail-E local.
+
+Popula um banco novo (benchmarks/seed.py), sobe o Mail-E de testes (utils/mail_e_server.py) e
+dispara requisições concorrentes contra a aplicação em processo (httpx + ASGITransport) e/ou
+através do uvicorn. Reporta p50/p95/p99 e vazão por endpoint em um JSON marcado com o commit,
+para comparar versões.
+
+Requer httpx (pip install httpx). Uso (na pasta service_award_api):
+	python benchmarks/run.py --mode both --employees 100000 --concurrency 16
+	python benchmarks/run.py --compare benchmarks/results/<resultado anterior>.json
+'''
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(APP_DIR, 'benchmarks', 'results')
+
+
+class Scenario:
+	"""Um endpoint medido: como montar cada requisição, quantas e com qual concorrência"""
+
+	def __init__(self, name: str, build_request: Callable[[int], dict], requests: int, concurrency: int, warmup: int):
+		self.name = name
+		self.build_request = build_request  # índice -> argumentos do httpx (method, url, headers, ...)
+		self.requests = requests
+		self.concurrency = concurrency
+		self.warmup = warmup
+
+
+def free_port() -> int:
+	with socket.socket() as sock:
+		sock.bind(('127.0.0.1', 0))
+		return sock.getsockname()[1]
+
+
+def git_revision() -> dict:
+	def git(*args):
+		result = subprocess.run(['git', *args], cwd=APP_DIR, capture_output=True, text=True)
+		return result.stdout.strip() if result.returncode == 0 else None
+
+	status = git('status', '--porcelain', '--', '.')
+	return {'commit': git('rev-parse', '--short', 'HEAD'), 'dirty': bool(status)}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+	if not sorted_values:
+		return 0.0
+	index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+	return sorted_values[index]
+
+
+def summarize(latencies: List[float], statuses: Counter, wall_time: float) -> dict:
+	ordered = sorted(latencies)
+	return {
+		'requests': len(latencies),
+		'statuses': {str(code): count for code, count in sorted(statuses.items())},
+		'p50_ms': round(percentile(ordered, 0.50) * 1000, 2),
+		'p95_ms': round(percentile(ordered, 0.95) * 1000, 2),
+		'p99_ms': round(percentile(ordered, 0.99) * 1000, 2),
+		'max_ms': round(ordered[-1] * 1000, 2) if ordered else 0.0,
+		'throughput_rps': round(len(latencies) / wall_time, 2) if wall_time else 0.0
+	}
+
+
+def build_upload_files(org, rows: int) -> List[bytes]:
+	"""Duas planilhas que se alternam: cada upload de fato altera `rows` funcionários"""
+	import openpyxl
+	from seed import ROOT_EMAIL
+
+	emails = [email for level in sorted(org.levels) for email in org.levels[level]][:rows]
+	files = []
+	for variant in ('A', 'B'):
+		workbook = openpyxl.Workbook()
+		sheet = workbook.active
+		sheet.append(['Employee ID', 'Employee Name', 'Employee Email', 'Hire Date', 'Manager Name', 'Manager Email'])
+		for email in emails:
+			number = int(email[1:7])
+			sheet.append([number, f'FUNCIONARIO {number:06d} {variant}', email, '2015-06-01', 'CEO BENCH', ROOT_EMAIL])
+		buffer = io.BytesIO()
+		workbook.save(buffer)
+		files.append(buffer.getvalue())
+	return files
+
+
+def build_scenarios(org, args) -> List[Scenario]:
+	from seed import ADMIN_EMAIL, PASSWORD
+	from routers.auth import create_access_token
+	from datetime import timedelta
+
+	rng = random.Random(args.seed)
+
+	def cookie_for(email: str, role: str = 'USER') -> dict:
+		token = create_access_token(email, 0, role, True, timedelta(days=1))
+		return {'Cookie': f'access_token={token}'}
+
+	tree_managers = org.managers_with_login.get(args.tree_level) or org.managers_with_login[min(org.managers_with_login)]
+	manager_headers = [cookie_for(email) for email in tree_managers]
+	admin_headers = cookie_for(ADMIN_EMAIL, 'ADMIN')
+	login_emails = org.user_emails
+	upload_files = build_upload_files(org, args.upload_rows)
+
+	# as escolhas aleatórias são sorteadas antes: mesma semente = mesma sequência de requisições
+	tree_picks = [rng.randrange(len(manager_headers)) for _ in range(args.requests + args.warmup)]
+	login_picks = [rng.randrange(len(login_emails)) for _ in range(args.login_requests + args.warmup)]
+	calendar_picks = [rng.randrange(len(manager_headers)) for _ in range(args.requests + args.warmup)]
+
+	return [
+		Scenario(
+			'GET /employees/',
+			lambda i: {'method': 'GET', 'url': '/employees/', 'headers': manager_headers[tree_picks[i]]},
+			args.requests, args.concurrency, args.warmup
+		),
+		Scenario(
+			'POST /auth/token',
+			lambda i: {'method': 'POST', 'url': '/auth/token', 'data': {'username': login_emails[login_picks[i]], 'password': PASSWORD}},
+			args.login_requests, args.concurrency, args.warmup
+		),
+		Scenario(
+			'POST /email/send-calendar',
+			lambda i: {'method': 'POST', 'url': '/email/send-calendar', 'headers': manager_headers[calendar_picks[i]], 'json': {'destinatario': 'bench@example.com'}},
+			args.requests, args.concurrency, args.warmup
+		),
+		Scenario(
+			'POST /admin/upload-excel',
+			lambda i: {
+				'method': 'POST', 'url': '/admin/upload-excel', 'headers': admin_headers,
+				'files': {'file': ('funcionarios.xlsx', upload_files[i % 2])}
+			},
+			# uploads são escritas grandes: um de cada vez, como no uso real
+			args.upload_requests, 1, 0
+		)
+	]
+
+
+async def run_scenario(client, scenario: Scenario) -> dict:
+	for i in range(scenario.warmup):
+		await client.request(**scenario.build_request(i))
+
+	latencies: List[float] = []
+	statuses: Counter = Counter()
+	next_index = iter(range(scenario.warmup, scenario.warmup + scenario.requests))
+
+	async def worker():
+		for i in next_index:
+			start = time.perf_counter()
+			response = await client.request(**scenario.build_request(i))
+			latencies.append(time.perf_counter() - start)
+			statuses[response.status_code] += 1
+
+	started = time.perf_counter()
+	await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+	return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+async def run_all(client, scenarios: List[Scenario]) -> Dict[str, dict]:
+	results = {}
+	for scenario in scenarios:
+		print(f'  {scenario.name} ({scenario.requests} requisições, concorrência {scenario.concurrency})...', flush=True)
+		results[scenario.name] = await run_scenario(client, scenario)
+	return results
+
+
+async def run_inprocess(scenarios: List[Scenario]) -> Dict[str, dict]:
+	import httpx
+	import main
+
+	# o ASGITransport não dispara o lifespan: inicia dispatcher e agendador manualmente
+	async with main.app.router.lifespan_context(main.app):
+		transport = httpx.ASGITransport(app=main.app)
+		async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=None) as client:
+			return await run_all(client, scenarios)
+
+
+async def run_uvicorn(scenarios: List[Scenario], port: int) -> Dict[str, dict]:
+	import httpx
+
+	limits = httpx.Limits(max_connections=max(s.concurrency for s in scenarios))
+	async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', timeout=None, limits=limits) as client:
+		return await run_all(client, scenarios)
+
+
+def start_process(args: List[str], env: dict) -> subprocess.Popen:
+	return subprocess.Popen([sys.executable, *args], cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_for_port(port: int, timeout: float = 30):
+	deadline = time.monotonic() + timeout
+	while time.monotonic() < deadline:
+		try:
+			with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+				return
+		except OSError:
+			time.sleep(0.1)
+	raise RuntimeError(f'Nada escutando na porta {port} após {timeout}s')
+
+
+def print_report(report: dict, baseline: Optional[dict] = None):
+	for mode, results in report['results'].items():
+		print(f'\n[{mode}]')
+		print(f'{"endpoint":<28} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"req/s":>9}  status')
+		for name, stats in results.items():
+			line = f'{name:<28} {stats["p50_ms"]:>9} {stats["p95_ms"]:>9} {stats["p99_ms"]:>9} {stats["throughput_rps"]:>9}  {stats["statuses"]}'
+			previous = (baseline or {}).get('results', {}).get(mode, {}).get(name)
+			if previous and previous['p50_ms']:
+				delta = 100 * (stats['p50_ms'] - previous['p50_ms']) / previous['p50_ms']
+				line += f'  (p50 {delta:+.1f}% vs {baseline["git"]["commit"]})'
+			print(line)
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark dos endpoints da API')
+	parser.add_argument('--mode', choices=['inprocess', 'uvicorn', 'both'], default='both')
+	parser.add_argument('--employees', type=int, default=100000)
+	parser.add_argument('--depth', type=int, default=6)
+	parser.add_argument('--fanout', type=int, default=8)
+	parser.add_argument('--users', type=int, default=3000)
+	parser.add_argument('--seed', type=int, default=42)
+	parser.add_argument('--tree-level', type=int, default=3, help='nível dos gestores usados em /employees/ e /email/send-calendar')
+	parser.add_argument('--requests', type=int, default=200)
+	parser.add_argument('--login-requests', type=int, default=50)
+	parser.add_argument('--upload-requests', type=int, default=4)
+	parser.add_argument('--upload-rows', type=int, default=2000)
+	parser.add_argument('--concurrency', type=int, default=16)
+	parser.add_argument('--warmup', type=int, default=5)
+	parser.add_argument('--uvicorn-workers', type=int, default=1)
+	parser.add_argument('--output', help='Arquivo JSON do resultado (padrão: benchmarks/results/)')
+	parser.add_argument('--compare', help='Resultado anterior para comparar')
+	args = parser.parse_args()
+
+	tmp = tempfile.TemporaryDirectory()
+	mail_e_port = free_port()
+
+	# precisa estar no ambiente antes de importar qualquer módulo da aplicação
+	env = dict(
+		os.environ,
+		DATABASE_URL=f'sqlite:///{os.path.join(tmp.name, "bench.db")}',
+		DB_INIT_ON_STARTUP='false',
+		MAIL_E_HOST='127.0.0.1',
+		MAIL_E_PORT=str(mail_e_port),
+		LOGIN_ACCOUNT_BURST='1000000',
+		LOGIN_IP_BURST='1000000'
+	)
+	os.environ.update(env)
+	sys.path.insert(0, APP_DIR)
+
+	# benchmarks/ já está no sys.path (pasta do script)
+	import seed
+
+	print('Populando o banco...', flush=True)
+	started = time.perf_counter()
+	org = seed.seed_org(args.employees, args.depth, args.fanout, args.users, args.seed)
+	print(f'  {org.to_dict()} em {time.perf_counter() - started:.1f}s')
+
+	scenarios = build_scenarios(org, args)
+	mail_e = start_process(['-m', 'utils.mail_e_server', '--port', str(mail_e_port)], env)
+	results = {}
+	try:
+		wait_for_port(mail_e_port)
+
+		if args.mode in ('inprocess', 'both'):
+			print('Em processo (ASGITransport):', flush=True)
+			results['inprocess'] = asyncio.run(run_inprocess(scenarios))
+
+		if args.mode in ('uvicorn', 'both'):
+			port = free_port()
+			print(f'uvicorn ({args.uvicorn_workers} worker(s)):', flush=True)
+			server = start_process(
+				['-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port),
+				 '--workers', str(args.uvicorn_workers), '--log-level', 'warning'],
+				env
+			)
+			try:
+				wait_for_port(port)
+				results['uvicorn'] = asyncio.run(run_uvicorn(scenarios, port))
+			finally:
+				server.terminate()
+				server.wait(timeout=30)
+	finally:
+		mail_e.terminate()
+		mail_e.wait(timeout=10)
+		tmp.cleanup()
+
+	report = {
+		'git': git_revision(),
+		'timestamp': datetime.now().isoformat(timespec='seconds'),
+		'python': sys.version.split()[0],
+		'platform': platform.platform(),
+		'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+		'org': org.to_dict(),
+		'results': results
+	}
+
+	output = args.output
+	if not output:
+		os.makedirs(RESULTS_DIR, exist_ok=True)
+		suffix = report['git']['commit'] or 'sem-git'
+		if report['git']['dirty']:
+			suffix += '-dirty'
+		output = os.path.join(RESULTS_DIR, f'{datetime.now():%Y%m%d-%H%M%S}-{suffix}.json')
+	with open(output, 'w') as f:
+		json.dump(report, f, indent=2)
+
+	baseline = None
+	if args.compare:
+		with open(args.compare) as f:
+			baseline = json.load(f)
+
+	print_report(report, baseline)
+	print(f'\nResultado salvo em {output}')
+
+
+if __name__ == '__main__':
+	main()
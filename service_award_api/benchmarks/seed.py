@@ -0,0 +1,154 @@
+'''
+Popula um banco vazio com uma organização sintética e reproduzível para os benchmarks.
+
+Uso (na pasta service_award_api):
+	python benchmarks/seed.py --database-url sqlite:////tmp/bench.db --employees 100000 --depth 6 --fanout 8
+'''
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+from typing import Dict, List
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+	sys.path.insert(0, APP_DIR)
+
+ROOT_EMAIL = 'CEO@BENCH.LOCAL'
+ADMIN_EMAIL = 'ADMIN@BENCH.LOCAL'
+PASSWORD = 'bench-password'
+BATCH_SIZE = 5000
+
+
+class SyntheticOrg:
+	"""Resultado do seed: quem existe em cada nível e quais e-mails têm login"""
+
+	def __init__(self):
+		self.total_employees = 0
+		self.depth = 0
+		self.levels: Dict[int, List[str]] = {}  # nível (1 = diretos do CEO) -> e-mails
+		self.user_emails: List[str] = []  # e-mails com conta de usuário (login)
+		self.managers_with_login: Dict[int, List[str]] = {}  # nível -> gestores com conta
+
+	def to_dict(self) -> dict:
+		return {
+			'total_employees': self.total_employees,
+			'depth': self.depth,
+			'employees_per_level': {level: len(emails) for level, emails in sorted(self.levels.items())},
+			'users': len(self.user_emails) + 2
+		}
+
+
+def generate_org(total: int, depth: int, fanout: int, seed: int = 42):
+	"""
+	Gera a árvore em largura (nível a nível) até `total` funcionários ou `depth` níveis
+
+	Returns:
+		(linhas de funcionários, SyntheticOrg)
+	"""
+	rng = random.Random(seed)
+	org = SyntheticOrg()
+	rows = []
+	first_hire = date(2000, 1, 1)
+	hire_span = (date(2024, 12, 31) - first_hire).days
+
+	current_level = [(ROOT_EMAIL, 'CEO BENCH')]
+	level = 1
+	while current_level and level <= depth and len(rows) < total:
+		next_level = []
+		for manager_email, manager_name in current_level:
+			for _ in range(fanout):
+				if len(rows) >= total:
+					break
+				number = len(rows) + 1
+				email = f'E{number:06d}@BENCH.LOCAL'
+				name = f'FUNCIONARIO {number:06d}'
+				rows.append({
+					'employee_id': number,
+					'employee_name': name,
+					'employee_email': email,
+					'hire_date': first_hire + timedelta(days=rng.randrange(hire_span)),
+					'manager_name': manager_name,
+					'manager_email': manager_email
+				})
+				next_level.append((email, name))
+		org.levels[level] = [email for email, _ in next_level]
+		current_level = next_level
+		level += 1
+
+	org.total_employees = len(rows)
+	org.depth = len(org.levels)
+	return rows, org
+
+
+def seed_org(total: int = 100000, depth: int = 6, fanout: int = 8, users: int = 3000, seed: int = 42) -> SyntheticOrg:
+	"""
+	Cria o schema e insere a organização sintética no banco de DATABASE_URL
+
+	Args:
+		total: Quantidade de funcionários
+		depth: Níveis máximos abaixo do CEO
+		fanout: Subordinados diretos por gestor
+		users: Contas de usuário (gestores primeiro, nível a nível)
+		seed: Semente do gerador (mesmos parâmetros = mesmo banco)
+
+	Returns:
+		SyntheticOrg com os níveis e os e-mails com login
+	"""
+	# importados aqui: database.py lê DATABASE_URL no import
+	from sqlalchemy import insert
+	from database import SessionLocal
+	from init_db import init_db
+	from models import Employees, User
+	from security import bcrypt_context
+
+	rows, org = generate_org(total, depth, fanout, seed)
+
+	# gestores (quem tem subordinados) ganham login primeiro, depois os demais funcionários
+	managers = {row['manager_email'] for row in rows}
+	ordered = [email for level in sorted(org.levels) for email in org.levels[level]]
+	with_login = [email for email in ordered if email in managers] + [email for email in ordered if email not in managers]
+	org.user_emails = with_login[:max(users - 2, 0)]
+	login_set = set(org.user_emails)
+	for level, emails in org.levels.items():
+		org.managers_with_login[level] = [email for email in emails if email in managers and email in login_set]
+
+	init_db()
+
+	# um único hash para todas as contas: o seed não precisa pagar o bcrypt milhares de vezes
+	hashed_password = bcrypt_context.hash(PASSWORD)
+	user_rows = [
+		{'email': ROOT_EMAIL, 'name': 'CEO', 'surname': 'BENCH', 'hashed_password': hashed_password, 'is_active': True, 'role': 'USER'},
+		{'email': ADMIN_EMAIL, 'name': 'ADMIN', 'surname': 'BENCH', 'hashed_password': hashed_password, 'is_active': True, 'role': 'ADMIN'}
+	] + [
+		{'email': email, 'name': 'GESTOR', 'surname': email.split('@')[0], 'hashed_password': hashed_password, 'is_active': True, 'role': 'USER'}
+		for email in org.user_emails
+	]
+
+	db = SessionLocal()
+	try:
+		for start in range(0, len(rows), BATCH_SIZE):
+			db.execute(insert(Employees), rows[start:start + BATCH_SIZE])
+		for start in range(0, len(user_rows), BATCH_SIZE):
+			db.execute(insert(User), user_rows[start:start + BATCH_SIZE])
+		db.commit()
+	finally:
+		db.close()
+
+	return org
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Popula um banco com uma organização sintética')
+	parser.add_argument('--database-url', required=True)
+	parser.add_argument('--employees', type=int, default=100000)
+	parser.add_argument('--depth', type=int, default=6)
+	parser.add_argument('--fanout', type=int, default=8)
+	parser.add_argument('--users', type=int, default=3000)
+	parser.add_argument('--seed', type=int, default=42)
+	args = parser.parse_args()
+
+	os.environ['DATABASE_URL'] = args.database_url
+	result = seed_org(args.employees, args.depth, args.fanout, args.users, args.seed)
+	print(result.to_dict())
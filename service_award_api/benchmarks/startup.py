@@ -0,0 +1,88 @@
+'''
+Mede o custo de subir um worker: import do main.py (em processos novos, a frio) e a
+criação/verificação do schema (init_db) em um banco vazio e em um banco já existente.
+
+Uso (na pasta service_award_api):
+	python benchmarks/startup.py --runs 10
+'''
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# módulos pesados que não devem ser carregados só por importar a aplicação
+HEAVY_MODULES = ['openpyxl', 'numpy']
+
+IMPORT_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'loaded': [name for name in %r if name in sys.modules]}))
+''' % (HEAVY_MODULES,)
+
+INIT_DB_SCRIPT = '''
+import json, time
+from init_db import init_db
+start = time.perf_counter()
+init_db()
+print(json.dumps({'seconds': time.perf_counter() - start}))
+'''
+
+
+def run_script(script: str, database_url: str) -> dict:
+	env = dict(os.environ, DATABASE_URL=database_url)
+	result = subprocess.run(
+		[sys.executable, '-c', script],
+		cwd=APP_DIR, env=env, capture_output=True, text=True, check=True
+	)
+	# a última linha é o JSON (avisos de import podem vir antes)
+	return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list) -> dict:
+	return {
+		'runs': len(samples),
+		'min_ms': round(min(samples) * 1000, 1),
+		'median_ms': round(statistics.median(samples) * 1000, 1),
+		'max_ms': round(max(samples) * 1000, 1)
+	}
+
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark de startup da API')
+	parser.add_argument('--runs', type=int, default=5)
+	parser.add_argument('--output', help='Arquivo JSON para salvar o resultado')
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as tmp:
+		database_url = f'sqlite:///{os.path.join(tmp, "startup.db")}'
+
+		# primeiro import só aquece o cache de bytecode (.pyc)
+		run_script(IMPORT_SCRIPT, database_url)
+		imports = [run_script(IMPORT_SCRIPT, database_url) for _ in range(args.runs)]
+
+		init_empty = run_script(INIT_DB_SCRIPT, database_url)
+		init_existing = [run_script(INIT_DB_SCRIPT, database_url)['seconds'] for _ in range(args.runs)]
+
+	report = {
+		'python': sys.version.split()[0],
+		'import_main': summarize([sample['seconds'] for sample in imports]),
+		'heavy_modules_loaded_on_import': imports[-1]['loaded'],
+		'init_db_empty_database_ms': round(init_empty['seconds'] * 1000, 1),
+		'init_db_existing_database': summarize(init_existing)
+	}
+
+	print(json.dumps(report, indent=2))
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+	main()
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { employeeService } from '../services/employeeService';
 import { authService } from '../services/authService';
 import { MdEdit } from 'react-icons/md';
@@ -10,6 +10,8 @@ import AlertModal from './AlertModal';
 function AllEmployeesTable() {
 	// ========== ESTADOS ==========
 	const [data, setData] = useState([]);  // Array vazio (lista simples)
+	const [nextCursor, setNextCursor] = useState(null);  // cursor da próxima página (null = última)
+	const [loadingMore, setLoadingMore] = useState(false);
 	const [loading, setLoading] = useState(true);
 	const [error, setError] = useState('');
 
@@ -45,16 +47,64 @@ function AllEmployeesTable() {
 	});
 
 	// ========== NOVOS ESTADOS PARA BUSCA E ORDENAÇÃO ==========
+	// busca e ordenação rodam no servidor (sobre a tabela inteira, não só as páginas carregadas)
 	const [searchTerm, setSearchTerm] = useState('');
+	const [debouncedSearch, setDebouncedSearch] = useState('');
 	const [sortConfig, setSortConfig] = useState({ key: null, direction: 'asc' });
+	const requestId = useRef(0);  // descarta respostas de buscas/ordenações já substituídas
 
-	// ========== BUSCAR TODOS OS EMPLOYEES ==========
+	// Parâmetros da consulta atual (o cursor só vale para esta combinação de busca e ordenação)
+	const queryParams = () => {
+		const params = {};
+		if (sortConfig.key) {
+			params.sort = (sortConfig.direction === 'desc' ? '-' : '') + sortConfig.key;
+		}
+		if (debouncedSearch.trim()) {
+			params.q = debouncedSearch.trim();
+		}
+		return params;
+	};
+
+	// ========== PAGINAÇÃO ==========
+	// Recarrega a partir da primeira página
+	const loadFirstPage = async () => {
+		const current = ++requestId.current;
+		const result = await employeeService.getAllEmployees(queryParams());
+		if (current !== requestId.current) return;
+		setData(result.items);
+		setNextCursor(result.nextCursor);
+	};
+
+	// Busca a próxima página e adiciona ao final da lista
+	const handleLoadMore = async () => {
+		const current = requestId.current;
+		setLoadingMore(true);
+		try {
+			const result = await employeeService.getAllEmployees({ ...queryParams(), cursor: nextCursor });
+			if (current !== requestId.current) return;
+			setData((loaded) => [...loaded, ...result.items]);
+			setNextCursor(result.nextCursor);
+		} catch (err) {
+			setError(err.response?.data?.detail || 'Erro ao buscar os dados');
+		} finally {
+			setLoadingMore(false);
+		}
+	};
+
+	// espera uma pausa na digitação antes de consultar o servidor
+	useEffect(() => {
+		const timer = setTimeout(() => setDebouncedSearch(searchTerm), 300);
+		return () => clearTimeout(timer);
+	}, [searchTerm]);
+
+	// ========== BUSCAR OS EMPLOYEES ==========
+	// primeira carga e a cada nova busca ou ordenação: volta para a primeira página (cursor novo)
 	useEffect(() => {
 		const fetchData = async() => {
 		try{
 			// Chama a função getAllEmployees (não getHierarchy)
-			const result = await employeeService.getAllEmployees();
-			setData(result);  // result já é array simples
+			await loadFirstPage();
+			setError('');
 		} catch(err){
 			setError(err.response?.data?.detail || 'Erro ao buscar os dados');
 		} finally{
@@ -62,7 +112,7 @@ function AllEmployeesTable() {
 		}
 		};
 		fetchData();
-	}, [])
+	}, [debouncedSearch, sortConfig])
 
 	// ========== NOVO useEffect ==========
 	useEffect(() => {
@@ -128,8 +178,7 @@ function AllEmployeesTable() {
 						onConfirm: null
 					});
 					
-					const result = await employeeService.getAllEmployees();
-					setData(result);
+					await loadFirstPage();
 					
 				} catch (err) {
 					setAlert({
@@ -184,8 +233,7 @@ function AllEmployeesTable() {
 				onConfirm: null
 			});
 			
-			const result = await employeeService.getAllEmployees();
-			setData(result);
+			await loadFirstPage();
 			handleCloseModal();
 			
 		} catch (err) {
@@ -260,8 +308,7 @@ const handleCloseCreateModal = () => {
 			});
 
 			// Recarrega TODOS os employees
-			const result = await employeeService.getAllEmployees();
-			setData(result);
+			await loadFirstPage();
 
 			handleCloseCreateModal();
 
@@ -285,53 +332,6 @@ const handleCloseCreateModal = () => {
 	setSortConfig({ key, direction });
 	};
 
-	const getFilteredAndSortedData = () => {
-	if (!data || data.length === 0) return [];
-	
-	let employees = [...data];  // Cópia do array
-	
-	// 1. Filtra por termo de busca
-	if (searchTerm) {
-		const term = searchTerm.toLowerCase();
-		employees = employees.filter(emp => 
-		emp.employee_name?.toLowerCase().includes(term) ||
-		emp.employee_email?.toLowerCase().includes(term) ||
-		emp.employee_id?.toString().includes(term) ||
-		emp.manager_name?.toLowerCase().includes(term)
-		);
-	}
-	
-	// 2. Ordena
-	if (sortConfig.key) {
-		employees.sort((a, b) => {
-		let aValue = a[sortConfig.key];
-		let bValue = b[sortConfig.key];
-		
-		// Tratamento especial para datas
-		if (sortConfig.key === 'hire_date') {
-			aValue = new Date(aValue);
-			bValue = new Date(bValue);
-		}
-		
-		// Tratamento especial para números
-		if (sortConfig.key === 'employee_id' || sortConfig.key === 'id') {
-			aValue = Number(aValue);
-			bValue = Number(bValue);
-		}
-		
-		if (aValue < bValue) {
-			return sortConfig.direction === 'asc' ? -1 : 1;
-		}
-		if (aValue > bValue) {
-			return sortConfig.direction === 'asc' ? 1 : -1;
-		}
-		return 0;
-		});
-	}
-	
-	return employees;
-	};
-
 	const getSortIcon = (key) => {
 	if (sortConfig.key !== key) {
 		return ' ↕️';
@@ -350,7 +350,7 @@ const handleCloseCreateModal = () => {
 		)}
 
 		{/* ========== BOTÃO ADICIONAR (NOVO) ========== */}
-		{data.length > 0 && (
+		{!loading && (
 			<div className="table-header">
 			<button className="btn-add" onClick={handleOpenCreateModal}>
 				+ Adicionar Funcionário
@@ -358,13 +358,13 @@ const handleCloseCreateModal = () => {
 			</div>
 		)}
 
-		{/* Campo de busca */}
-		{data.length > 0 && (
+		{/* Campo de busca (no servidor: nome, email, gestor ou ID) */}
+		{!loading && (
 		<div className="search-container">
 			<input
 			type="text"
 			className="search-input"
-			placeholder="🔍 Buscar por nome, email, ID..."
+			placeholder="🔍 Buscar por nome, email, gestor ou ID..."
 			value={searchTerm}
 			onChange={(e) => setSearchTerm(e.target.value)}
 			/>
@@ -375,6 +375,10 @@ const handleCloseCreateModal = () => {
 			)}
 		</div>
 		)}
+
+		{!loading && data.length === 0 && (
+			<p className="loading-text">Nenhum funcionário encontrado</p>
+		)}
 		
 		{data.length > 0 && (
 			<div className="table-container">
@@ -406,7 +410,7 @@ const handleCloseCreateModal = () => {
 				</thead>
 				<tbody>
 				{/* Não precisa de flattenHierarchy - data já é array simples */}
-				{getFilteredAndSortedData().map((employee) => (
+				{data.map((employee) => (
 					<tr key={employee.id}>
 					<td>{employee.id}</td>
 					<td>{employee.employee_id}</td>
@@ -436,6 +440,13 @@ const handleCloseCreateModal = () => {
 				))}
 				</tbody>
 			</table>
+			{nextCursor && (
+				<div className="load-more">
+					<button className="btn-load-more" onClick={handleLoadMore} disabled={loadingMore}>
+						{loadingMore ? 'Carregando...' : 'Carregar mais'}
+					</button>
+				</div>
+			)}
 			</div>
 		)}
 
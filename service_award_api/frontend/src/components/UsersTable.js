@@ -11,6 +11,8 @@ import AlertModal from './AlertModal'
 function UsersTable() {
 	// ========== ESTADOS ==========
 	const [data, setData] = useState([]);
+	const [nextCursor, setNextCursor] = useState(null);  // cursor da próxima página (null = última)
+	const [loadingMore, setLoadingMore] = useState(false);
 	const [loading, setLoading] = useState(true);
 	const [error, setError] = useState('');
 	const [editingUserId, setEditingUserId] = useState(null);
@@ -25,12 +27,33 @@ function UsersTable() {
 		onConfirm: null
 	});
 
+	// ========== PAGINAÇÃO ==========
+	// Recarrega a partir da primeira página
+	const loadFirstPage = async () => {
+		const result = await adminService.getAllUsers();
+		setData(result.items);
+		setNextCursor(result.nextCursor);
+	};
+
+	// Busca a próxima página e adiciona ao final da lista
+	const handleLoadMore = async () => {
+		setLoadingMore(true);
+		try {
+			const result = await adminService.getAllUsers({ cursor: nextCursor });
+			setData((current) => [...current, ...result.items]);
+			setNextCursor(result.nextCursor);
+		} catch (err) {
+			setError(err.response?.data?.detail || 'Erro ao buscar usuários');
+		} finally {
+			setLoadingMore(false);
+		}
+	};
+
 	// ========== BUSCAR USUÁRIOS ==========
 	useEffect(() => {
 	const fetchData = async() => {
 		try{
-		const result = await adminService.getAllUsers();
-		setData(result);
+		await loadFirstPage();
 		} catch(err){
 		setError(err.response?.data?.detail || 'Erro ao buscar usuários');
 		} finally{
@@ -62,8 +85,7 @@ function UsersTable() {
 						onConfirm: null
 					});
 					
-					const newData = await adminService.getAllUsers();
-					setData(newData);
+					await loadFirstPage();
 					
 				} catch (err) {
 					setAlert({
@@ -99,8 +121,7 @@ function UsersTable() {
 					});
 					
 					// Recarrega os dados
-					const newData = await adminService.getAllUsers();
-					setData(newData);
+					await loadFirstPage();
 				} catch (err){
 					setAlert({
 						isOpen: true,
@@ -227,6 +248,13 @@ function UsersTable() {
 				))}
 			</tbody>
 			</table>
+			{nextCursor && (
+				<div className="load-more">
+					<button className="btn-load-more" onClick={handleLoadMore} disabled={loadingMore}>
+						{loadingMore ? 'Carregando...' : 'Carregar mais'}
+					</button>
+				</div>
+			)}
 		</div>
 		)}
 		{/* ========== ALERT MODAL (REUTILIZÁVEL) ========== */}
@@ -1,11 +1,15 @@
 import api from './api';
 
 export const adminService = {
-	// ========== LISTAR TODOS OS USUÁRIOS ==========
-	getAllUsers: async () => {
-		// Chama GET /admin/
-		const response = await api.get('/admin/');
-		return response.data;
+	// ========== LISTAR USUÁRIOS (UMA PÁGINA POR VEZ) ==========
+	// params: { limit, cursor, sort, role, is_active }
+	getAllUsers: async (params = {}) => {
+		// Chama GET /admin/ - o cursor da próxima página vem no header X-Next-Cursor
+		const response = await api.get('/admin/', { params });
+		return {
+			items: response.data,
+			nextCursor: response.headers['x-next-cursor'] || null
+		};
 	},
 
 	// ========== RESETAR SENHA DO USUÁRIO ==========
@@ -8,10 +8,14 @@ export const employeeService ={
 		return response.data;
 	},
 
-	// === busca todos os funcionarios ===
-	getAllEmployees: async () => {
-		const response = await api.get('/employees/all');
-		return response.data;
+	// === busca uma página de funcionarios (paginação por cursor) ===
+	// params: { limit, cursor, sort, q, manager_email, hire_date_from, hire_date_to }
+	getAllEmployees: async (params = {}) => {
+		const response = await api.get('/employees/all', { params });
+		return {
+			items: response.data,
+			nextCursor: response.headers['x-next-cursor'] || null
+		};
 	},
 
 	// cadastra um employee
@@ -0,0 +1,40 @@
+'''
+Cria/atualiza o schema do banco (tabelas, índices, busca FTS5 e versões dos ETags).
+
+Em produção rode uma vez por deploy, antes de subir os workers:
+	python init_db.py
+e inicie o uvicorn com DB_INIT_ON_STARTUP=false para que cada worker suba sem tocar no schema.
+'''
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+import models
+from database import engine
+from utils.search_utils import SearchIndex
+from utils.http_cache import DataVersions
+
+
+def init_db():
+	# cria tabelas do banco
+	models.Base.metadata.create_all(bind=engine)
+
+	# create_all só cria índices junto com tabelas novas - garante os índices novos nas tabelas existentes
+	# (IF NOT EXISTS em vez de checkfirst: a reflexão não enxerga índices de expressão)
+	with engine.begin() as connection:
+		for table in models.Base.metadata.sorted_tables:
+			for index in table.indexes:
+				connection.execute(CreateIndex(index, if_not_exists=True))
+
+		# substituído por ix_employees_sort_employee_name (a ordenação usa coalesce e não aproveitava este)
+		connection.execute(text('DROP INDEX IF EXISTS ix_employees_employee_name_id'))
+
+	# índices de busca (FTS5) mantidos por triggers a cada INSERT/UPDATE/DELETE
+	SearchIndex.setup(engine)
+
+	# versões dos dados usadas nos ETags - incrementadas na mesma transação de cada escrita
+	DataVersions.setup(engine)
+
+
+if __name__ == '__main__':
+	init_db()
+	print('Banco de dados inicializado')
@@ -1,18 +1,41 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-import os
+from fastapi.middleware.gzip import GZipMiddleware
+from contextlib import asynccontextmanager
 
-import models
-from database import engine
+from database import DB_INIT_ON_STARTUP, engine
+from init_db import init_db
 
-from routers import auth, employees, admin, email
+from routers import auth, employees, admin, email, schedules, search, calendar
+from utils.http_cache import DataVersions
+from utils.change_feed import ChangeFeed
+from utils.static_manifest import StaticManifest
+from utils.metrics import REGISTRY, MetricsMiddleware, instrument_engine
+from utils.sql_profiler import SqlProfiler, SqlProfilerMiddleware
+from security import SQL_PROFILER_ENABLED, SQL_PROFILER_REPEAT_THRESHOLD, SQL_PROFILER_KEEP_SLOWEST, SQL_PROFILER_LOG
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # o schema é criado no startup (e não no import do módulo); em produção pode ser feito no deploy
+    if DB_INIT_ON_STARTUP:
+        init_db()
 
-# cria tabelas do banco 
-models.Base.metadata.create_all(bind=engine)
+    # inicia o envio dos e-mails da outbox e o agendador de resumos em background
+    email.outbox_dispatcher.start()
+    schedules.digest_scheduler.start()
+    yield
+    await schedules.digest_scheduler.stop()
+    await email.outbox_dispatcher.stop()
+
+app = FastAPI(lifespan=lifespan)
+
+# incrementa as versões dos ETags e grava o log de alterações na mesma transação de cada escrita
+DataVersions.install_events()
+ChangeFeed.install_events()
+
+# conta e cronometra as consultas ao banco (total e por requisição) para o /metrics
+instrument_engine(engine)
 
 #CORS para desenvolvimento (quando React roda em localhost:3000) - DEV
 # app.add_middleware(
@@ -38,36 +61,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # cursor da paginação lido pelo frontend
 )
 
+# comprime respostas grandes (árvore da hierarquia, listas) quando o navegador aceita gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# profiler SQL de depuração (SQL_PROFILER=true): headers X-DB-Queries/X-DB-Time, alerta de N+1 e log das mais lentas
+if SQL_PROFILER_ENABLED:
+    sql_profiler = SqlProfiler(
+        engine,
+        repeat_threshold=SQL_PROFILER_REPEAT_THRESHOLD,
+        keep_slowest=SQL_PROFILER_KEEP_SLOWEST,
+        log_path=SQL_PROFILER_LOG
+    )
+    sql_profiler.install()
+    app.add_middleware(SqlProfilerMiddleware, profiler=sql_profiler)
+
+# latência por rota, requisições em andamento e consultas ao banco por requisição (mais externo: mede tudo)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth.router)
 app.include_router(employees.router)
 app.include_router(admin.router)
 app.include_router(email.router)
+app.include_router(schedules.router)
+app.include_router(search.router)
+app.include_router(calendar.router)
+
+# métricas em memória do worker, no formato texto do Prometheus
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 # ========== SERVIR FRONTEND REACT (PRODUÇÃO) ==========
 build_path = "frontend/build"
 
-if os.path.exists(build_path):
-    # Servir arquivos estáticos do React (CSS, JS, etc)
-    app.mount("/static", StaticFiles(directory=f"{build_path}/static"), name="static")
-    
-    # Servir favicon e manifest
-    @app.get("/favicon.ico")
-    async def favicon():
-        return FileResponse(f"{build_path}/favicon.ico")
-    
-    @app.get("/manifest.json")
-    async def manifest():
-        return FileResponse(f"{build_path}/manifest.json")
-    
-    # Rota catch-all para React Router (DEVE SER A ÚLTIMA ROTA!)
+# o build é indexado uma vez aqui: as requisições não consultam o disco para achar o arquivo
+static_manifest = StaticManifest(build_path)
+
+if static_manifest.has_index:
+    # Rota catch-all para arquivos do build (JS, CSS, favicon, manifest...) e React Router (DEVE SER A ÚLTIMA ROTA!)
+    # arquivos com hash no nome recebem cache imutável; os demais (index.html) são revalidados por ETag
     @app.get("/{full_path:path}")
-    async def serve_react(full_path: str):
-        # Verifica se é arquivo físico (CSS, JS, imagens, etc)
-        file_path = f"{build_path}/{full_path}"
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            return FileResponse(file_path)
-        
-        # Para qualquer outra rota (incluindo rotas do React Router), serve o index.html
-        return FileResponse(f"{build_path}/index.html")
\ No newline at end of file
+    async def serve_react(full_path: str, request: Request):
+        return static_manifest.response(full_path, request)
@@ -1,5 +1,5 @@
 from database import Base
-from sqlalchemy import Column, Integer, String, Date, Boolean, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime, Boolean, Enum, Text, Index, LargeBinary, func, literal_column
 import enum
 
 class UserRole(str, enum.Enum):
@@ -8,6 +8,24 @@ class UserRole(str, enum.Enum):
 	user = "USER"
 
 
+class OutboxStatus(str, enum.Enum):
+	pending = "PENDING"
+	sending = "SENDING"
+	sent = "SENT"
+	dead = "DEAD"
+
+
+class JobStatus(str, enum.Enum):
+	running = "RUNNING"
+	done = "DONE"
+	failed = "FAILED"
+
+
+class ScheduleFrequency(str, enum.Enum):
+	daily = "DAILY"
+	weekly = "WEEKLY"
+
+
 class User(Base):
 	__tablename__ = 'users'
 	id = Column(Integer, primary_key=True, index=True)
@@ -27,4 +45,99 @@ class Employees(Base):
 	employee_email = Column(String(255), unique=True, nullable=False)
 	hire_date = Column(Date, nullable=False)
 	manager_name = Column(String, nullable=False)
-	manager_email = Column(String(255), nullable=False)
\ No newline at end of file
+	manager_email = Column(String(255), nullable=False, index=True)
+
+	# índices (coluna, id) para a paginação por cursor nas ordenações mais usadas
+	__table_args__ = (
+		Index('ix_employees_hire_date_id', 'hire_date', 'id'),
+		Index('ix_employees_manager_name_id', 'manager_name', 'id'),
+	)
+
+
+# employee_id e employee_name aceitam nulo e a paginação ordena por coalesce(coluna, padrão): o índice precisa
+# ser da mesma expressão, com o padrão literal (um parâmetro '?' na consulta não casa com o índice no SQLite)
+EMPLOYEE_ID_SORT = func.coalesce(Employees.employee_id, literal_column('0'))
+EMPLOYEE_NAME_SORT = func.coalesce(Employees.employee_name, literal_column("''"))
+Index('ix_employees_sort_employee_id', EMPLOYEE_ID_SORT, Employees.id)
+Index('ix_employees_sort_employee_name', EMPLOYEE_NAME_SORT, Employees.id)
+
+
+class EmailOutbox(Base):
+	__tablename__ = 'email_outbox'
+	id = Column(Integer, primary_key=True, index=True)
+	content = Column(String, nullable=False)
+	destinatario = Column(String(255), nullable=False)
+	payload = Column(Text, nullable=False)
+	total_employees = Column(Integer)
+	requested_by = Column(String(255))
+	status = Column(String, nullable=False, default=OutboxStatus.pending.value, index=True)
+	attempts = Column(Integer, nullable=False, default=0)
+	next_attempt_at = Column(DateTime, nullable=False, index=True)
+	claim_token = Column(String(36), index=True)
+	last_error = Column(String)
+	mail_e_response = Column(Text)
+	created_at = Column(DateTime, nullable=False)
+	sent_at = Column(DateTime)
+
+
+class CalendarFanoutJob(Base):
+	__tablename__ = 'calendar_fanout_jobs'
+	id = Column(Integer, primary_key=True, index=True)
+	status = Column(String, nullable=False, default=JobStatus.running.value)
+	started_by = Column(String(255))
+	total_managers = Column(Integer, nullable=False, default=0)
+	processed = Column(Integer, nullable=False, default=0)
+	sent = Column(Integer, nullable=False, default=0)
+	queued_for_retry = Column(Integer, nullable=False, default=0)
+	total_employees = Column(Integer, nullable=False, default=0)
+	last_error = Column(String)
+	started_at = Column(DateTime, nullable=False)
+	finished_at = Column(DateTime)
+
+
+class DigestSchedule(Base):
+	__tablename__ = 'digest_schedules'
+	id = Column(Integer, primary_key=True, index=True)
+	name = Column(String, unique=True, nullable=False)
+	frequency = Column(String, nullable=False)
+	hour = Column(Integer, nullable=False)
+	minute = Column(Integer, nullable=False, default=0)
+	weekday = Column(Integer)
+	days_ahead = Column(Integer, nullable=False)
+	destinatario = Column(String(255), nullable=False)
+	manager_email = Column(String(255))
+	is_active = Column(Boolean, nullable=False, default=True)
+	next_run_at = Column(DateTime, nullable=False, index=True)
+	last_run_at = Column(DateTime)
+	last_result = Column(String)
+	created_by = Column(String(255))
+
+
+class DataVersion(Base):
+	__tablename__ = 'data_versions'
+	name = Column(String(50), primary_key=True)  # nome da tabela acompanhada (ex.: employees)
+	version = Column(BigInteger, nullable=False, default=0)  # incrementado a cada escrita na tabela
+
+
+class EmployeeChange(Base):
+	__tablename__ = 'employee_changes'
+	# sqlite_autoincrement: o seq nunca é reaproveitado, então "since" é sempre um ponto seguro para retomar
+	__table_args__ = {'sqlite_autoincrement': True}
+	seq = Column(Integer, primary_key=True)
+	operation = Column(String(10), nullable=False)  # INSERT, UPDATE ou DELETE
+	employee_pk = Column(Integer, nullable=False, index=True)  # employees.id do registro alterado
+	employee_email = Column(String(255))  # e-mail no momento da alteração (o registro pode não existir mais)
+	changed_at = Column(DateTime, nullable=False)
+
+
+class EmployeeSnapshot(Base):
+	__tablename__ = 'employee_snapshots'
+	id = Column(Integer, primary_key=True, index=True)
+	# sha256 do conteúdo: estados idênticos da tabela compartilham o mesmo snapshot
+	content_hash = Column(String(64), unique=True, nullable=False)
+	reason = Column(String(20), nullable=False)  # upload, clear_all, rollback ou manual
+	employee_count = Column(Integer, nullable=False)
+	size_bytes = Column(Integer, nullable=False)
+	payload = Column(LargeBinary, nullable=False)  # JSON (linhas ordenadas por e-mail) comprimido com zlib
+	created_at = Column(DateTime, nullable=False)
+	created_by = Column(String(255))
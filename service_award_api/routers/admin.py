@@ -1,17 +1,24 @@
-from typing import Annotated
-from pydantic import BaseModel, EmailStr, field_validator
+from typing import Annotated, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, field_validator
+from datetime import datetime
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Path, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Path, UploadFile, File, Query, Request, Response
 from starlette import status
 
-import openpyxl
 from io import BytesIO
+import time
 
-from models import User, Employees
+from models import User, Employees, EmployeeSnapshot
 from database import SessionLocal
 from security import bcrypt_context, DEFAULT_PASSWORD
-from .auth import get_current_user
+from .auth import get_current_user, MessageResponse, UserResponse
 from utils.excel_utils import ExcelProcessor
+from utils.pagination import KeysetPaginator
+from utils.http_cache import DataVersions, HttpCache
+from utils.metrics import UPLOAD_ROWS, UPLOAD_ROWS_PER_SECOND
+from utils.hierarchy_check import HierarchyCheck
+from utils.snapshots import EmployeeSnapshots
 
 
 router = APIRouter(
@@ -19,15 +26,71 @@ router = APIRouter(
 	tags=['admin']
 )
 
-class UserResponse(BaseModel):
+class UserUpdateResponse(MessageResponse):
+	user: UserResponse
+
+class ClearAllResponse(MessageResponse):
+	total_deleted: int
+	snapshot_id: Optional[int] = None  # estado anterior, para rollback
+
+class HierarchyRootResponse(BaseModel):
+	manager_email: str
+	employees: int
+
+class HierarchyCheckResponse(BaseModel):
+	valid: bool  # sem ciclos, sem autogestão e com um único topo
+	total_employees: int
+	max_depth: int
+	root_count: int
+	roots: List[HierarchyRootResponse]
+	orphan_count: int  # gestor não cadastrado como funcionário (fora do topo principal)
+	orphans: List[str]
+	self_managed_count: int
+	self_managed: List[str]
+	cycle_count: int
+	cycles: List[List[str]]
+	unreachable_count: int  # em ciclos ou abaixo de um ciclo
+
+class UploadExcelResponse(MessageResponse):
+	header_found_at_row: int
+	employees_added: int
+	employees_updated: int
+	employees_skipped: int
+	total_errors: int
+	errors: Optional[List[str]] = None
+	hierarchy_check: HierarchyCheckResponse
+	snapshot_id: int  # estado da tabela após o upload
+
+class SnapshotResponse(BaseModel):
 	id: int
-	email: EmailStr
-	name: str
-	surname: str
-	role: str
-	is_active: bool
-	class Config:
-		from_attributes = True
+	content_hash: str
+	reason: str
+	employee_count: int
+	size_bytes: int
+	created_at: datetime
+	created_by: Optional[str] = None
+	model_config = ConfigDict(from_attributes=True)
+
+class SnapshotChangeResponse(BaseModel):
+	employee_email: str
+	changes: Dict[str, list]  # campo -> [valor na origem, valor no destino]
+
+class SnapshotDiffResponse(BaseModel):
+	from_snapshot_id: int
+	to_snapshot_id: int
+	added_count: int
+	removed_count: int
+	changed_count: int
+	added: List[dict]
+	removed: List[dict]
+	changed: List[SnapshotChangeResponse]
+
+class SnapshotRollbackResponse(MessageResponse):
+	snapshot_id: int
+	previous_state_snapshot_id: int  # estado antes do rollback (permite desfazer)
+	inserted: int
+	updated: int
+	deleted: int
 
 class UserUpdateRequest(BaseModel):
 	role: str
@@ -51,17 +114,53 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
+# ordenações aceitas na listagem de usuários (paginação por cursor)
+users_paginator = KeysetPaginator(User.id, {
+	'email': (User.email, str),
+	'name': (func.coalesce(User.name, ''), str),
+	'surname': (func.coalesce(User.surname, ''), str),
+	'role': (func.coalesce(User.role, ''), str)
+})
+
+# lista os usuários, paginados por cursor (próxima página no header X-Next-Cursor)
 @router.get('/', response_model=list[UserResponse], status_code=status.HTTP_200_OK)
-async def read_all_users(user: user_dependency, db: db_dependency):
+async def read_all_users(
+	user: user_dependency,
+	db: db_dependency,
+	request: Request,
+	response: Response,
+	limit: int = Query(KeysetPaginator.DEFAULT_PAGE_SIZE, gt=0, le=KeysetPaginator.MAX_PAGE_SIZE),
+	cursor: Optional[str] = None,
+	sort: Optional[str] = Query(None, description='Campo de ordenação; prefixo "-" para decrescente'),
+	role: Optional[str] = None,
+	is_active: Optional[bool] = None
+):
 	if user is None:
 		raise HTTPException(status_code=401, detail='Falha na autenticação')
 	
 	if user.get('role') not in ['ADMIN', 'RH']:
 		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem listar todos os usuários.')
 	
-	return db.query(User).all()
+	etag = HttpCache.etag('users', DataVersions.current(db, 'users'), str(request.query_params))
+	not_modified = HttpCache.not_modified(request, etag)
+	if not_modified is not None:
+		return not_modified
+	
+	query = db.query(User)
+	if role:
+		query = query.filter(User.role == role.upper())
+	if is_active is not None:
+		query = query.filter(User.is_active == is_active)
+
+	users, next_cursor = users_paginator.paginate(query, sort, cursor, limit)
+
+	if next_cursor:
+		response.headers['X-Next-Cursor'] = next_cursor
+	response.headers.update(HttpCache.headers(etag))
 
-@router.put('/{user_id}', status_code=status.HTTP_200_OK)
+	return users
+
+@router.put('/{user_id}', response_model=UserUpdateResponse, status_code=status.HTTP_200_OK)
 async def update_user(
 	user: user_dependency, 
 	db: db_dependency, 
@@ -87,7 +186,7 @@ async def update_user(
 	
 	return {'message': f'Permissão atualizada para {user_update.role}', 'user': user_model}
 
-@router.put('/reset_password/{user_id}', status_code=status.HTTP_200_OK)
+@router.put('/reset_password/{user_id}', response_model=MessageResponse, status_code=status.HTTP_200_OK)
 async def reset_password(user: user_dependency, db: db_dependency, user_id: int = Path(gt=0)):
 	if user is None:
 		raise HTTPException(status_code=401, detail='Falha na autenticação')
@@ -115,7 +214,17 @@ async def reset_password(user: user_dependency, db: db_dependency, user_id: int
 	
 	return {'message': f'Senha resetada para padrão. Usuário deverá trocar senha no próximo login.'}
 
-@router.delete('/clear_all', status_code=status.HTTP_200_OK)
+# valida o grafo de gestores inteiro (ciclos, órfãos, topos e profundidade máxima)
+@router.get('/hierarchy-check', response_model=HierarchyCheckResponse, status_code=status.HTTP_200_OK)
+async def check_hierarchy(user: user_dependency, db: db_dependency):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem validar a hierarquia.')
+	
+	return HierarchyCheck.run(db)
+
+@router.delete('/clear_all', response_model=ClearAllResponse, status_code=status.HTTP_200_OK)
 async def clear_all_employees(user: user_dependency, db: db_dependency):
 	# apaga todos os funcionários da tabela employees
 	if user is None:
@@ -130,12 +239,15 @@ async def clear_all_employees(user: user_dependency, db: db_dependency):
 	
 	try:
 		total_employees = db.query(Employees).count()
+		# guarda o estado atual na mesma transação do delete: o clear_all pode ser desfeito com rollback
+		snapshot = EmployeeSnapshots.capture(db, 'clear_all', user.get('username'))[0] if total_employees else None
 		db.query(Employees).delete()
 		db.commit()
 
 		return {
 			'message': 'Todos os funcionários foram removidos com sucesso',
-			'total_deleted': total_employees
+			'total_deleted': total_employees,
+			'snapshot_id': snapshot.id if snapshot else None
 		}
 	except Exception as e:
 		db.rollback()
@@ -145,6 +257,85 @@ async def clear_all_employees(user: user_dependency, db: db_dependency):
 		)
 
 
+# snapshots da tabela employees (mais recentes primeiro)
+@router.get('/snapshots', response_model=List[SnapshotResponse], status_code=status.HTTP_200_OK)
+async def list_snapshots(user: user_dependency, db: db_dependency, limit: int = Query(50, gt=0, le=500)):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem consultar snapshots.')
+	
+	# sem o payload: só os metadados
+	return db.query(EmployeeSnapshot).with_entities(
+		EmployeeSnapshot.id, EmployeeSnapshot.content_hash, EmployeeSnapshot.reason, EmployeeSnapshot.employee_count,
+		EmployeeSnapshot.size_bytes, EmployeeSnapshot.created_at, EmployeeSnapshot.created_by
+	).order_by(EmployeeSnapshot.id.desc()).limit(limit).all()
+
+# grava o estado atual da tabela employees (se ainda não houver um snapshot idêntico)
+@router.post('/snapshots', response_model=SnapshotResponse, status_code=status.HTTP_201_CREATED)
+async def create_snapshot(user: user_dependency, db: db_dependency):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem criar snapshots.')
+	
+	snapshot, _ = EmployeeSnapshots.capture(db, 'manual', user.get('username'))
+	db.commit()
+	return snapshot
+
+# diferenças entre dois snapshots, pelo e-mail do funcionário
+@router.get('/snapshots/{snapshot_id}/diff/{other_id}', response_model=SnapshotDiffResponse, status_code=status.HTTP_200_OK)
+async def diff_snapshots(
+	user: user_dependency,
+	db: db_dependency,
+	snapshot_id: int = Path(gt=0),
+	other_id: int = Path(gt=0),
+	limit: int = Query(1000, gt=0, le=50000, description='Máximo de itens listados por categoria')
+):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem comparar snapshots.')
+	
+	snapshots = {snapshot.id: snapshot for snapshot in db.query(EmployeeSnapshot).filter(EmployeeSnapshot.id.in_([snapshot_id, other_id])).all()}
+	if snapshot_id not in snapshots or other_id not in snapshots:
+		raise HTTPException(status_code=404, detail='Snapshot não encontrado.')
+	
+	diff = EmployeeSnapshots.diff(
+		EmployeeSnapshots.load(snapshots[snapshot_id]),
+		EmployeeSnapshots.load(snapshots[other_id]),
+		limit
+	)
+	return {'from_snapshot_id': snapshot_id, 'to_snapshot_id': other_id, **diff}
+
+# restaura a tabela employees para o estado de um snapshot (o estado atual vira um snapshot antes)
+@router.post('/snapshots/{snapshot_id}/rollback', response_model=SnapshotRollbackResponse, status_code=status.HTTP_200_OK)
+async def rollback_snapshot(user: user_dependency, db: db_dependency, snapshot_id: int = Path(gt=0)):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem restaurar snapshots.')
+	
+	snapshot = db.query(EmployeeSnapshot).filter(EmployeeSnapshot.id == snapshot_id).first()
+	if snapshot is None:
+		raise HTTPException(status_code=404, detail='Snapshot não encontrado.')
+	
+	try:
+		previous_state, _ = EmployeeSnapshots.capture(db, 'rollback', user.get('username'))
+		counts = EmployeeSnapshots.restore(db, snapshot)
+		db.commit()
+	except Exception as e:
+		db.rollback()
+		raise HTTPException(status_code=500, detail=f'Erro ao restaurar o snapshot: {str(e)}')
+	
+	return {
+		'message': f'Tabela restaurada para o snapshot {snapshot_id}',
+		'snapshot_id': snapshot_id,
+		'previous_state_snapshot_id': previous_state.id,
+		**counts
+	}
+
+
 @router.delete('/{user_id}', status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(user: user_dependency, db: db_dependency, user_id: int = Path(gt=0)):
 	if user is None:
@@ -230,11 +421,12 @@ def process_employee_row(row_data: dict, row_index: int, db: Session) -> tuple:
 		return ('added', None)
 
 
-@router.post('/upload-excel', status_code=status.HTTP_201_CREATED)
+@router.post('/upload-excel', response_model=UploadExcelResponse, status_code=status.HTTP_201_CREATED)
 async def upload_employees_excel(
 	user: user_dependency, 
 	db: db_dependency, 
-	file: UploadFile = File(...)
+	file: UploadFile = File(...),
+	strict: bool = Query(False, description='Rejeita o upload inteiro (nada é gravado) se a hierarquia resultante for inválida')
 ):
 	if user is None:
 		raise HTTPException(status_code=401, detail='Falha na autenticação')
@@ -247,6 +439,9 @@ async def upload_employees_excel(
 		raise HTTPException(status_code=400, detail='O arquivo deve ser do tipo Excel (.xlsx ou .xls)')
 	
 	try:
+		# openpyxl é pesado (~130 ms de import): carregado só no primeiro upload, não no startup dos workers
+		import openpyxl
+
 		# Lê o arquivo Excel
 		contents = await file.read()
 		workbook = openpyxl.load_workbook(BytesIO(contents))
@@ -275,6 +470,7 @@ async def upload_employees_excel(
 		errors = []
 		
 		# Processa cada linha
+		rows_started_at = time.perf_counter()
 		for index, row in enumerate(sheet.iter_rows(min_row=header_row_idx + 1, values_only=True), start=header_row_idx + 1):
 			try:
 				# Pula linhas completamente vazias
@@ -301,8 +497,28 @@ async def upload_employees_excel(
 				employees_skipped += 1
 				continue
 		
-		# Commit de todas as alterações
+		# valida a hierarquia inteira com os dados novos ainda na transação (flush, sem commit):
+		# ciclos e órfãos aparecem aqui, antes de ficarem visíveis para qualquer leitura da árvore
+		db.flush()
+		hierarchy_check = HierarchyCheck.run(db)
+		if strict and not hierarchy_check['valid']:
+			db.rollback()
+			raise HTTPException(status_code=400, detail={
+				'message': 'Hierarquia inválida após o upload - nenhuma alteração foi gravada',
+				'hierarchy_check': hierarchy_check
+			})
+		
+		# snapshot do resultado do upload (permite comparar importações e voltar a uma delas),
+		# gravado no mesmo commit das linhas
+		snapshot, _ = EmployeeSnapshots.capture(db, 'upload', user.get('username'))
 		db.commit()
+
+		# vazão do upload (inclui o commit) para o /metrics
+		rows_processed = employees_added + employees_updated + employees_skipped
+		UPLOAD_ROWS.inc(employees_added, result='added')
+		UPLOAD_ROWS.inc(employees_updated, result='updated')
+		UPLOAD_ROWS.inc(employees_skipped, result='skipped')
+		UPLOAD_ROWS_PER_SECOND.observe(rows_processed / max(time.perf_counter() - rows_started_at, 1e-6))
 		
 		return {
 			'message': 'Upload processado com sucesso',
@@ -311,7 +527,9 @@ async def upload_employees_excel(
 			'employees_updated': employees_updated,
 			'employees_skipped': employees_skipped,
 			'total_errors': len(errors),
-			'errors': errors if errors else None
+			'errors': errors if errors else None,
+			'hierarchy_check': hierarchy_check,
+			'snapshot_id': snapshot.id
 		}
 		
 	except HTTPException:
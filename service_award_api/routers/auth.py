@@ -1,9 +1,10 @@
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, Response, Request
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from pydantic import BaseModel, field_validator, EmailStr
+from pydantic import BaseModel, ConfigDict, field_validator, EmailStr
 import enum
+import time
 
 from starlette import status
 from sqlalchemy.orm import Session
@@ -11,7 +12,13 @@ from jose import jwt, JWTError
 
 from models import User
 from database import SessionLocal
-from security import SECRET_KEY, ALGORITHM, bcrypt_context
+from security import (
+	SECRET_KEY, ALGORITHM, bcrypt_context,
+	LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_REFILL_PER_SECOND,
+	LOGIN_IP_BURST, LOGIN_IP_REFILL_PER_SECOND
+)
+from utils.rate_limit import TokenBucketLimiter
+from utils.metrics import BCRYPT_VERIFY_SECONDS
 
 router = APIRouter(
 	prefix='/auth',
@@ -20,6 +27,10 @@ router = APIRouter(
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl='auth/token')
 
+# limitadores de tentativas de login (por conta e por IP)
+account_limiter = TokenBucketLimiter(LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_REFILL_PER_SECOND)
+ip_limiter = TokenBucketLimiter(LOGIN_IP_BURST, LOGIN_IP_REFILL_PER_SECOND)
+
 class UserRole(str, enum.Enum):
 	admin = "ADMIN"
 	rh = "RH"
@@ -43,6 +54,41 @@ class Token(BaseModel):
 	token_type: str
 	is_active: bool
 
+# === Schemas de resposta ===
+
+class MessageResponse(BaseModel):
+	message: str
+
+class CreateUserResponse(MessageResponse):
+	id: int
+
+class UserResponse(BaseModel):
+	id: int
+	email: str  # str e não EmailStr: EmailStr passaria o domínio gravado para minúsculas
+	# colunas que aceitam nulo no banco (usuários antigos ou criados direto na tabela)
+	name: Optional[str] = None
+	surname: Optional[str] = None
+	role: Optional[str] = None
+	is_active: Optional[bool] = None
+	model_config = ConfigDict(from_attributes=True)
+
+class LoginResponse(BaseModel):
+	token_type: str
+	is_active: bool
+	role: Optional[str] = None
+	access_token: Optional[str] = None  # só na resposta de conta inativa (sempre None)
+	message: Optional[str] = None
+
+class CurrentUser(BaseModel):
+	username: str
+	id: int
+	role: Optional[str] = None
+	is_active: bool
+
+class VerifyResponse(BaseModel):
+	authenticated: bool
+	user: CurrentUser
+
 def get_db():
 	db = SessionLocal()
 	try:
@@ -59,11 +105,32 @@ def authenticate_user(email: EmailStr, password: str, db):
 	if not user:
 		return False
 	#se encontrar o e-mail do usuario, verifica a senha
-	if not bcrypt_context.verify(password, user.hashed_password):
+	start = time.perf_counter()
+	password_ok = bcrypt_context.verify(password, user.hashed_password)
+	BCRYPT_VERIFY_SECONDS.observe(time.perf_counter() - start)
+	if not password_ok:
 		return False
 	
 	return user
 
+# verifica o limite de tentativas antes de qualquer verificação de senha (bcrypt é caro)
+def check_login_rate_limit(email: str, request: Request):
+	client_ip = request.client.host if request.client else 'unknown'
+
+	retry_after = ip_limiter.try_acquire(client_ip)
+	if not retry_after:
+		retry_after = account_limiter.try_acquire(email.upper())
+		if retry_after:
+			# barrada pelo limite da conta: a tentativa não chegou ao bcrypt e não gasta o limite do IP
+			ip_limiter.refund(client_ip)
+
+	if retry_after:
+		raise HTTPException(
+			status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+			detail='Muitas tentativas de login. Aguarde alguns instantes e tente novamente.',
+			headers={'Retry-After': str(int(retry_after) + 1)}
+		)
+
 # cria chave de acesso
 def create_access_token(username: str, user_id: str, role: str, is_active: bool, expires_delta: timedelta):
 	encode = {'sub': username, 'id': user_id, 'role': role, 'is_active': is_active}
@@ -109,7 +176,7 @@ class ChangePasswordRequest(BaseModel):
 
 ## ENDPOINTS
 # cria um novo usuário - aberto para todos
-@router.post("/", status_code = status.HTTP_201_CREATED)
+@router.post("/", response_model=CreateUserResponse, status_code = status.HTTP_201_CREATED)
 async def create_user(db: db_dependency, create_user_request: CreateUserRequest):
 	existing_email = db.query(User).filter(User.email == create_user_request.email.upper()).first()
 	if existing_email is not None:
@@ -129,8 +196,11 @@ async def create_user(db: db_dependency, create_user_request: CreateUserRequest)
 	return {'message': 'Usuário criado com sucesso', 'id': create_user_model.id}
 
 #cria o access token no login - é a função de login
-@router.post("/token")
-async def login_for_access_token(response: Response, form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: db_dependency):
+# exclude_unset: cada resposta mantém apenas os campos que retorna hoje
+@router.post("/token", response_model=LoginResponse, response_model_exclude_unset=True)
+async def login_for_access_token(request: Request, response: Response, form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: db_dependency):
+	check_login_rate_limit(form_data.username, request)
+
 	user = authenticate_user(form_data.username.upper(), form_data.password, db)
 	
 	if not user:
@@ -148,6 +218,9 @@ async def login_for_access_token(response: Response, form_data: Annotated[OAuth2
 			'message': 'Sua conta está inativa. Troque a senha para ativá-la.'
 		}
 	
+	# login bem-sucedido libera novamente as tentativas da conta
+	account_limiter.reset(user.email)
+
 	token = create_access_token(user.email, user.id, user.role, user.is_active, timedelta(days=1))
 
 	#salva o token no cookie
@@ -162,8 +235,10 @@ async def login_for_access_token(response: Response, form_data: Annotated[OAuth2
 
 	return {'token_type': 'bearer', 'is_active': user.is_active, 'role': user.role} # retorna a role
 
-@router.post("/change-password", status_code=status.HTTP_200_OK)
-async def change_password(db: db_dependency, change_request: ChangePasswordRequest):
+@router.post("/change-password", response_model=MessageResponse, status_code=status.HTTP_200_OK)
+async def change_password(request: Request, db: db_dependency, change_request: ChangePasswordRequest):
+	check_login_rate_limit(change_request.email, request)
+
 	user = authenticate_user(change_request.email, change_request.current_password, db)
 
 	if not user:
@@ -185,7 +260,7 @@ async def change_password(db: db_dependency, change_request: ChangePasswordReque
 	return {'message': 'Senha alterada com sucesso. Faça login com sua nova senha.'}
 
 # Endpoint para verificar se o usuário está autenticado
-@router.get("/verify", status_code=status.HTTP_200_OK)
+@router.get("/verify", response_model=VerifyResponse, status_code=status.HTTP_200_OK)
 async def verify_token(user: user_dependency):
     # Se chegou aqui, o token é válido (get_current_user já validou)
     return {
@@ -194,7 +269,7 @@ async def verify_token(user: user_dependency):
     }
 
 # Endpoint para buscar dados completos do usuário logado
-@router.get("/me", status_code=status.HTTP_200_OK)
+@router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def get_logged_user_data(user: user_dependency, db: db_dependency):
 	if user is None:
 		raise HTTPException(status_code=401, detail='Falha na autenticação')
@@ -205,11 +280,4 @@ async def get_logged_user_data(user: user_dependency, db: db_dependency):
 	if user_data is None:
 		raise HTTPException(status_code=404, detail='Usuário não encontrado')
 	
-	return {
-		'id': user_data.id,
-		'email': user_data.email,
-		'name': user_data.name,
-		'surname': user_data.surname,
-		'role': user_data.role,
-		'is_active': user_data.is_active
-	}
\ No newline at end of file
+	return user_data
\ No newline at end of file
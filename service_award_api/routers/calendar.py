@@ -0,0 +1,112 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Annotated, Optional
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from jose import jwt, JWTError
+from starlette import status
+
+from models import User
+from database import SessionLocal
+from security import SECRET_KEY, ALGORITHM, MILESTONE_YEARS, CALENDAR_FEED_TOKEN_DAYS, CALENDAR_FEED_DEFAULT_DAYS
+from .auth import get_current_user
+from utils.employee_utils import EmployeeHierarchy
+from utils.calendar_utils import AnniversaryICS
+from utils.http_cache import DataVersions, HttpCache
+
+router = APIRouter(
+	prefix='/calendar',
+	tags=['calendar']
+)
+
+def get_db():
+	db = SessionLocal()
+	try:
+		yield db
+	finally:
+		db.close()
+
+db_dependency = Annotated[Session, Depends(get_db)]
+user_dependency = Annotated[dict, Depends(get_current_user)]
+
+# escopo gravado no token do feed: ele só abre o .ics, nunca as outras rotas (que leem o cookie)
+FEED_TOKEN_SCOPE = 'calendar-feed'
+
+# === Schemas de resposta ===
+
+class FeedTokenResponse(BaseModel):
+	token: str
+	url: str  # endereço para assinar no cliente de calendário
+	expires_at: datetime
+
+## Funções
+def create_feed_token(username: str, expires_delta: timedelta):
+	expires = datetime.now(timezone.utc) + expires_delta
+	return jwt.encode({'sub': username, 'scope': FEED_TOKEN_SCOPE, 'exp': expires}, SECRET_KEY, algorithm=ALGORITHM), expires
+
+# dono do feed: o token do feed na URL (clientes de calendário) ou, sem ele, o cookie de login (navegador)
+async def get_feed_user(request: Request, db: Session, token: Optional[str]) -> str:
+	if not token:
+		user = await get_current_user(request)
+		return user.get('username')
+
+	try:
+		payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+	except JWTError:
+		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token do calendário inválido ou expirado')
+
+	email = payload.get('sub')
+	if payload.get('scope') != FEED_TOKEN_SCOPE or not email:
+		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Token do calendário inválido ou expirado')
+
+	# o token vale meses: usuário removido ou desativado perde o acesso na hora
+	active = db.query(User.is_active).filter(User.email == email).scalar()
+	if not active:
+		raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Usuário inativo ou não encontrado')
+	return email
+
+# lê a equipe em uma sessão própria: o corpo é gerado depois que a rota já retornou
+def iter_team_ics(manager_email: str, start: date, days: int, milestones_only: bool):
+	db = SessionLocal()
+	try:
+		rows = EmployeeHierarchy.iter_subtree_rows(manager_email, db)
+		yield from AnniversaryICS.iter_ics(manager_email, rows, start, days, MILESTONE_YEARS if milestones_only else None)
+	finally:
+		db.close()
+
+## ENDPOINTS
+# gera o endereço do feed .ics do usuário logado (para assinar no Outlook/Google Agenda)
+@router.post('/feed-token', response_model=FeedTokenResponse, status_code=status.HTTP_201_CREATED)
+async def create_calendar_feed_token(user: user_dependency, request: Request):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+
+	token, expires = create_feed_token(user.get('username'), timedelta(days=CALENDAR_FEED_TOKEN_DAYS))
+	url = str(request.url_for('get_anniversaries_ics').include_query_params(token=token))
+	return {'token': token, 'url': url, 'expires_at': expires}
+
+# próximos aniversários de empresa de toda a equipe do usuário (todos os níveis) em formato iCalendar
+# o arquivo é gerado em pedaços; clientes que consultam de hora em hora recebem 304 enquanto nada mudar
+@router.get('/anniversaries.ics', status_code=status.HTTP_200_OK, response_class=StreamingResponse)
+async def get_anniversaries_ics(
+	db: db_dependency,
+	request: Request,
+	token: Optional[str] = None,
+	days: int = Query(CALENDAR_FEED_DEFAULT_DAYS, ge=1, le=366, description='Janela de aniversários a partir de hoje, em dias'),
+	milestones_only: bool = Query(False, description='Apenas os marcos (5, 10, 15... anos de empresa)')
+):
+	manager_email = await get_feed_user(request, db, token)
+
+	# a janela começa hoje: o ETag muda à meia-noite junto com o conteúdo
+	start = date.today()
+	etag = HttpCache.etag('anniversaries.ics', DataVersions.current(db, 'employees'), manager_email, start, days, milestones_only)
+	not_modified = HttpCache.not_modified(request, etag)
+	if not_modified is not None:
+		return not_modified
+
+	return StreamingResponse(
+		iter_team_ics(manager_email, start, days, milestones_only),
+		media_type='text/calendar; charset=utf-8',
+		headers={**HttpCache.headers(etag), 'Content-Disposition': 'inline; filename="aniversarios.ics"'}
+	)
@@ -1,17 +1,23 @@
-from typing import Annotated
+from typing import Annotated, Optional
+from datetime import datetime
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi.concurrency import run_in_threadpool
 from starlette import status
-import socket
-import json
-from datetime import datetime, date
 
-from models import User
+from models import User, EmailOutbox, OutboxStatus, CalendarFanoutJob
 from database import SessionLocal
-from security import MAIL_E_HOST, MAIL_E_PORT
+from security import (
+	MAIL_E_HOST, MAIL_E_PORT, MAIL_E_CONNECT_TIMEOUT, MAIL_E_TIMEOUT, MAIL_E_POOL_SIZE,
+	OUTBOX_BATCH_SIZE, OUTBOX_POLL_INTERVAL, OUTBOX_MAX_ATTEMPTS, OUTBOX_BACKOFF_BASE, OUTBOX_BACKOFF_MAX,
+	FANOUT_CONCURRENCY
+)
 from .auth import get_current_user
 from utils.employee_utils import EmployeeHierarchy
+from utils.mail_e_client import MailEClient
+from utils.email_outbox import EmailOutboxDispatcher
+from utils.calendar_fanout import CalendarFanout
 
 router = APIRouter(
 	prefix='/email',
@@ -28,12 +34,73 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
+# cliente do Mail-E compartilhado pelo worker (mantém as conexões abertas entre requisições)
+mail_e_client = MailEClient(
+	MAIL_E_HOST,
+	MAIL_E_PORT,
+	pool_size=MAIL_E_POOL_SIZE,
+	connect_timeout=MAIL_E_CONNECT_TIMEOUT,
+	write_timeout=MAIL_E_TIMEOUT,
+	read_timeout=MAIL_E_TIMEOUT
+)
+
+# drena a outbox para o Mail-E em background (iniciado no startup da aplicação)
+outbox_dispatcher = EmailOutboxDispatcher(
+	SessionLocal,
+	mail_e_client,
+	batch_size=OUTBOX_BATCH_SIZE,
+	poll_interval=OUTBOX_POLL_INTERVAL,
+	max_attempts=OUTBOX_MAX_ATTEMPTS,
+	backoff_base=OUTBOX_BACKOFF_BASE,
+	backoff_max=OUTBOX_BACKOFF_MAX
+)
+
+# envio do calendário para todos os gestores (job disparado por ADMIN/RH)
+calendar_fanout = CalendarFanout(SessionLocal, mail_e_client, concurrency=FANOUT_CONCURRENCY)
+
 
 class EmailRequest(BaseModel):
 	destinatario: EmailStr
 
+# === Schemas de resposta ===
 
-@router.post('/send-calendar', status_code=status.HTTP_200_OK)
+class SendCalendarResponse(BaseModel):
+	success: bool
+	message: str
+	outbox_id: int
+	status: str
+	total_employees: int
+
+class OutboxStatusResponse(BaseModel):
+	id: int
+	content: str
+	destinatario: str
+	status: str
+	attempts: int
+	next_attempt_at: Optional[datetime] = None
+	last_error: Optional[str] = None
+	total_employees: Optional[int] = None
+	created_at: datetime
+	sent_at: Optional[datetime] = None
+
+class CalendarFanoutProgressResponse(BaseModel):
+	job_id: int
+	status: str
+	total_managers: int
+	processed: int
+	sent: int
+	queued_for_retry: int
+	total_employees: int
+	percent: float
+	elapsed_seconds: float
+	managers_per_second: float
+	eta_seconds: Optional[float] = None
+	last_error: Optional[str] = None
+	started_at: datetime
+	finished_at: Optional[datetime] = None
+
+
+@router.post('/send-calendar', response_model=SendCalendarResponse, status_code=status.HTTP_202_ACCEPTED)
 async def send_calendar_email(
 	user: user_dependency,
 	db: db_dependency,
@@ -42,115 +109,86 @@ async def send_calendar_email(
 	if user is None:
 		raise HTTPException(status_code=401, detail='Falha na autenticação')
 	
-	# Busca a hierarquia do usuário
-	hierarchy_data = EmployeeHierarchy.get_hierarchy_tree(user.get('username'), db)
-	
-	if not hierarchy_data or not hierarchy_data.get('hierarchy'):
+	manager_email = user.get('username')
+
+	# lê a equipe e serializa o payload em uma thread: o event loop segue atendendo enquanto o banco é lido
+	message = await run_in_threadpool(
+		EmailOutboxDispatcher.enqueue_calendar,
+		db,
+		email_request.destinatario,
+		EmployeeHierarchy.iter_subtree_rows(manager_email, db),
+		requested_by=manager_email
+	)
+
+	if message is None:
 		raise HTTPException(status_code=404, detail='Nenhum funcionário encontrado')
 	
-	# Função recursiva para achatar a hierarquia
-	def flatten_hierarchy(employees):
-		flat_list = []
-		for emp in employees:
-			flat_list.append(emp)
-			if emp.get('subordinates'):
-				flat_list.extend(flatten_hierarchy(emp['subordinates']))
-		return flat_list
-	
-	# Achata a hierarquia
-	all_employees = flatten_hierarchy(hierarchy_data['hierarchy'])
-	
-	# Formata os dados para o Mail-E
-	aniversarios = []
-	for emp in all_employees:
-		# Converte data para DD/MM/YYYY
-		hire_date = emp.get('hire_date', '')
-		if hire_date:
-			# Se já é objeto date/datetime, converte direto
-			if isinstance(hire_date, (datetime, date)):
-				formatted_date = hire_date.strftime('%d/%m/%Y')
-			# Se é string, faz parse primeiro
-			elif isinstance(hire_date, str):
-				date_obj = datetime.strptime(hire_date, '%Y-%m-%d')
-				formatted_date = date_obj.strftime('%d/%m/%Y')
-			else:
-				formatted_date = ''
-		else:
-			formatted_date = ''
-	
-		aniversarios.append({
-			"NOME": emp.get('employee_name', ''),
-			"EMAIL": emp.get('employee_email', ''),
-			"DATA": formatted_date
-		})
-	
-	if not aniversarios:
-		raise HTTPException(status_code=404, detail='Nenhum aniversário para enviar')
-	
-	# Monta o payload para o Mail-E
-	payload = {
-		"CONTENT": "ServiceAwardCalendar",
-		"DESTINATARIO": email_request.destinatario,
-		"ANIVERSARIOS": aniversarios
+	# Grava na outbox e retorna - o envio ao Mail-E acontece em background
+	db.commit()
+	outbox_dispatcher.wake()
+
+	return {
+		'success': True,
+		'message': 'Email adicionado à fila de envio!',
+		'outbox_id': message.id,
+		'status': message.status,
+		'total_employees': message.total_employees
 	}
-	
-	# Conecta no Mail-E via socket
-	try:
-		# IP e porta do Mail-E
-		mail_e_host = MAIL_E_HOST
-		mail_e_port = MAIL_E_PORT
-		
-		# Cria socket
-		client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-		client_socket.settimeout(10)  # Timeout de 10 segundos
-		
-		# Conecta
-		client_socket.connect((mail_e_host, mail_e_port))
-		
-		# Envia dados (JSON + \n)
-		message = json.dumps(payload) + "\n"
-		client_socket.sendall(message.encode('utf-8'))
-		
-		# Recebe resposta
-		response_data = b''
-		while True:
-			chunk = client_socket.recv(4096)
-			if not chunk:
-				break
-			response_data += chunk
-			if response_data.endswith(b'\n'):
-				break
-		
-		client_socket.close()
-		
-		# Parse da resposta
-		if response_data:
-			response = json.loads(response_data.decode('utf-8').strip())
-			return {
-				'success': True,
-				'message': 'Email enviado com sucesso!',
-				'mail_e_response': response,
-				'total_employees': len(aniversarios)
-			}
-		else:
-			return {
-				'success': True,
-				'message': 'Email enviado (sem resposta do Mail-E)',
-				'total_employees': len(aniversarios)
-			}
-		
-	except socket.timeout:
-		raise HTTPException(
-			status_code=504,
-			detail='Não foi possível conectar ao servidor de email (timeout). Por favor, entre em contato com bianca.rodrigues@disney.com para reportar o problema.'
-		)
-	except socket.error as e:
-		raise HTTPException(
-			status_code=503,
-			detail=f'Erro ao conectar ao servidor de email: {str(e)}. Por favor, entre em contato com bianca.rodrigues@disney.com para reportar o problema.'
-		)
-	except Exception as e:
-		raise HTTPException(
-			status_code=500,
-			detail=f'Erro ao enviar email: {str(e)}. Por favor, entre em contato com bianca.rodrigues@disney.com para reportar o problema.'
-		)
\ No newline at end of file
+
+
+# consulta o status de um e-mail da outbox
+@router.get('/outbox/{message_id}', response_model=OutboxStatusResponse, status_code=status.HTTP_200_OK)
+async def get_outbox_status(user: user_dependency, db: db_dependency, message_id: int = Path(gt=0)):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+
+	message = db.query(EmailOutbox).filter(EmailOutbox.id == message_id).first()
+	if message is None:
+		raise HTTPException(status_code=404, detail='Mensagem não encontrada')
+
+	# apenas quem pediu o envio ou usuários ADMIN/RH podem consultar
+	if message.requested_by != user.get('username') and user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Acesso negado')
+
+	return {
+		'id': message.id,
+		'content': message.content,
+		'destinatario': message.destinatario,
+		'status': message.status,
+		'attempts': message.attempts,
+		'next_attempt_at': message.next_attempt_at if message.status == OutboxStatus.pending.value else None,
+		'last_error': message.last_error,
+		'total_employees': message.total_employees,
+		'created_at': message.created_at,
+		'sent_at': message.sent_at
+	}
+
+
+# envia o calendário da equipe para todos os gestores - usuarios ADMIN ou RH apenas
+@router.post('/send-calendar-all', response_model=CalendarFanoutProgressResponse, status_code=status.HTTP_202_ACCEPTED)
+async def send_calendar_all_managers(user: user_dependency, db: db_dependency):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem enviar o calendário para todos os gestores.')
+
+	job = calendar_fanout.start(db, started_by=user.get('username'))
+
+	return CalendarFanout.progress(job)
+
+
+# consulta o progresso do envio para todos os gestores
+@router.get('/send-calendar-all/{job_id}', response_model=CalendarFanoutProgressResponse, status_code=status.HTTP_200_OK)
+async def get_calendar_all_progress(user: user_dependency, db: db_dependency, job_id: int = Path(gt=0)):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Acesso negado. Apenas usuários ADMIN ou RH podem acessar esta rota.')
+
+	job = db.query(CalendarFanoutJob).filter(CalendarFanoutJob.id == job_id).first()
+	if job is None:
+		raise HTTPException(status_code=404, detail='Job não encontrado')
+
+	return CalendarFanout.progress(job)
@@ -1,16 +1,26 @@
-from typing import Annotated, Optional
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Annotated, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from sqlalchemy import String, cast, literal, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Path
-from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from datetime import date, datetime
+import orjson
 
 
 from starlette import status
 
-from models import Employees, User
+from models import EMPLOYEE_ID_SORT, EMPLOYEE_NAME_SORT, Employees, User
 from database import SessionLocal
-from .auth import get_current_user
+from security import MILESTONE_YEARS
+from .auth import get_current_user, MessageResponse
 from utils.employee_utils import EmployeeHierarchy
+from utils.pagination import KeysetPaginator
+from utils.http_cache import DataVersions, HttpCache
+from utils.change_feed import ChangeFeed
+from utils.org_analytics import OrgAnalytics
+from utils.milestone_report import MilestoneReport
+from utils.search_utils import SearchIndex
 
 router = APIRouter(
 	prefix='/employees',
@@ -27,6 +37,27 @@ def get_db():
 db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
+# limite de itens por requisição nos endpoints em lote
+BATCH_MAX_SIZE = 5000
+
+# indicadores por gestor, recalculados só depois de alguma escrita em employees
+org_analytics = OrgAnalytics(MILESTONE_YEARS)
+
+# marcos de tempo de empresa por mês e por equipe (NumPy sobre o EmployeeStore compartilhado)
+milestone_report = MilestoneReport(MILESTONE_YEARS)
+
+# ordenações aceitas em /employees/all (paginação por cursor)
+employees_paginator = KeysetPaginator(Employees.id, {
+	# employee_id e employee_name aceitam nulo: ordenam pelas expressões indexadas em models.py
+	# e o cursor guarda '' no lugar de None
+	'employee_id': (EMPLOYEE_ID_SORT, lambda value: int(value or 0)),
+	'employee_name': (EMPLOYEE_NAME_SORT, str),
+	'employee_email': (Employees.employee_email, str),
+	'hire_date': (Employees.hire_date, date.fromisoformat),
+	'manager_name': (Employees.manager_name, str),
+	'manager_email': (Employees.manager_email, str)
+})
+
 # === Schemas ===
 
 class EmployeesRequest(BaseModel):
@@ -83,22 +114,157 @@ class EmployeesRequestWithManager(BaseModel):
 	def normalize_manager_name(cls, v):
 		return v.upper() if isinstance(v, str) else v
 
+# Schemas das operações em lote (ADMIN/RH)
+class EmployeesBatchUpdateItem(EmployeesUpdateRequest):
+	id: int = Field(gt=0)
+
+class EmployeesBatchUpdateRequest(BaseModel):
+	updates: List[EmployeesBatchUpdateItem] = Field(min_length=1, max_length=BATCH_MAX_SIZE)
+
+class EmployeesBatchDeleteRequest(BaseModel):
+	ids: List[int] = Field(min_length=1, max_length=BATCH_MAX_SIZE)
+
+class ReassignReportsRequest(BaseModel):
+	from_manager_email: EmailStr
+	to_manager_email: EmailStr
+	to_manager_name: Optional[str] = None  # obrigatório só se o novo gestor não for funcionário nem usuário
+
+	# 'after': o EmailStr devolve o domínio em minúsculas, então a caixa alta vem depois da validação
+	@field_validator('from_manager_email', 'to_manager_email')
+	def normalize_email(cls, v):
+		return v.upper()
+
+	@field_validator('to_manager_name', mode='before')
+	def normalize_name(cls, v):
+		return v.upper() if v and isinstance(v, str) else v
+
+# === Schemas de resposta ===
+
+class EmployeeResponse(BaseModel):
+	id: int
+	employee_id: Optional[int] = None
+	employee_name: Optional[str] = None
+	employee_email: str
+	hire_date: date
+	manager_name: str
+	manager_email: str
+	model_config = ConfigDict(from_attributes=True)
+
+class EmployeeNode(EmployeeResponse):
+	subordinates: List['EmployeeNode']
+
+class HierarchyTreeResponse(BaseModel):
+	manager_email: str
+	hierarchy: List[EmployeeNode]
+
+class EmployeesBatchUpdateResponse(MessageResponse):
+	updated: int
+	employees: List[EmployeeResponse]
+
+class EmployeesBatchDeleteResponse(MessageResponse):
+	deleted: int
+
+class ReassignReportsResponse(MessageResponse):
+	reassigned: int
+
+class ManagerAnalyticsResponse(BaseModel):
+	manager_email: str
+	manager_name: Optional[str] = None
+	level: int  # 0 = topo da organização
+	direct_reports: int
+	total_descendants: int
+	max_depth: int  # níveis abaixo do gestor
+	milestones: Dict[str, int]  # anos de empresa -> quantos da equipe completam no ano
+
+class OrgAnalyticsSummary(BaseModel):
+	year: int
+	total_employees: int
+	total_managers: int
+	top_level_managers: int
+	max_depth: int
+	average_span_of_control: float
+	unreachable_employees: int  # presos em ciclos de gestores
+
+class OrgAnalyticsResponse(BaseModel):
+	summary: OrgAnalyticsSummary
+	managers: List[ManagerAnalyticsResponse]
+
+class MilestoneMonthResponse(BaseModel):
+	month: int  # 1 = janeiro
+	total: int
+	by_milestone: Dict[str, int]  # anos de empresa -> quantos completam no mês
+
+class ManagerMilestonesResponse(BaseModel):
+	manager_email: str
+	manager_name: Optional[str] = None
+	total: int
+	by_month: List[int]  # 12 posições, janeiro primeiro
+
+class MilestoneEmployeeResponse(BaseModel):
+	employee_email: str
+	employee_name: Optional[str] = None
+	hire_date: date
+	years: int
+	anniversary_date: date
+
+class MilestoneReportResponse(BaseModel):
+	year: int
+	total: int
+	months: List[MilestoneMonthResponse]
+	managers: Optional[List[ManagerMilestonesResponse]] = None  # visão da empresa inteira
+	manager_email: Optional[str] = None  # detalhamento de uma equipe
+	employees: Optional[List[MilestoneEmployeeResponse]] = None
+
+class EmployeeChangeResponse(BaseModel):
+	seq: int
+	operation: str
+	employee_pk: int
+	employee_email: Optional[str] = None
+	changed_at: datetime
+	employee: Optional[EmployeeResponse] = None  # estado atual; None se o registro não existe mais
+
+class EmployeeChangesResponse(BaseModel):
+	changes: List[EmployeeChangeResponse]
+	next_since: int  # usar como "since" na próxima chamada
+	latest_seq: int
+	has_more: bool
+
 # === ENDPOINTS ===
 
 # retorna todos os funcionários do usuário logado
-@router.get('/', status_code=status.HTTP_200_OK)
-async def get_hierarchy_tree(user: user_dependency, db: db_dependency):
+# a árvore já sai em bytes (orjson); o response_model serve só para a documentação
+@router.get('/', response_model=HierarchyTreeResponse, status_code=status.HTTP_200_OK)
+async def get_hierarchy_tree(user: user_dependency, db: db_dependency, request: Request):
 	# retorna a hierarquia aninhada
 	if user is None:
 		raise HTTPException(status_code=401, detail='Falha na autenticação')
 	
-	tree = EmployeeHierarchy.get_hierarchy_tree(user.get('username'), db)
+	# se os funcionários não mudaram desde a última visita, responde 304 sem montar a árvore
+	etag = HttpCache.etag('tree', DataVersions.current(db, 'employees'), user.get('username'))
+	not_modified = HttpCache.not_modified(request, etag)
+	if not_modified is not None:
+		return not_modified
+	
+	tree_json = EmployeeHierarchy.get_hierarchy_tree_json(user.get('username'), db)
 	
-	return tree
+	return Response(content=tree_json, media_type='application/json', headers=HttpCache.headers(etag))
 
-# retorna todos os funcionarios - usuarios ADMIN ou RH apenas
-@router.get('/all', status_code=status.HTTP_200_OK)
-async def get_all_employees(user: user_dependency, db: db_dependency):
+# retorna todos os funcionarios, paginados por cursor - usuarios ADMIN ou RH apenas
+# o cursor da próxima página volta no header X-Next-Cursor (ausente na última página)
+@router.get('/all', response_model=List[EmployeeResponse], status_code=status.HTTP_200_OK)
+async def get_all_employees(
+	user: user_dependency,
+	db: db_dependency,
+	request: Request,
+	response: Response,
+	limit: int = Query(KeysetPaginator.DEFAULT_PAGE_SIZE, gt=0, le=KeysetPaginator.MAX_PAGE_SIZE),
+	cursor: Optional[str] = None,
+	sort: Optional[str] = Query(None, description='Campo de ordenação; prefixo "-" para decrescente'),
+	manager_email: Optional[str] = None,
+	hire_date_from: Optional[date] = None,
+	hire_date_to: Optional[date] = None,
+	q: Optional[str] = Query(None, max_length=100, description='Busca por nome, e-mail, gestor ou ID do funcionário')
+):
 	if user is None:
 		raise HTTPException(status_code=401, detail='Falha na autenticação')
 	
@@ -106,13 +272,137 @@ async def get_all_employees(user: user_dependency, db: db_dependency):
 	if user.get('role') not in ['ADMIN', 'RH']:
 		raise HTTPException(status_code=403, detail='Acesso negado. Apenas usuários ADMIN ou RH podem acessar esta rota.')
 	
-	# busca todos os funcionários
-	all_employees = db.query(Employees).all()
+	# a página depende só da versão dos dados e dos parâmetros da consulta
+	etag = HttpCache.etag('all', DataVersions.current(db, 'employees'), str(request.query_params))
+	not_modified = HttpCache.not_modified(request, etag)
+	if not_modified is not None:
+		return not_modified
+	
+	# filtros aplicados no banco
+	query = db.query(Employees)
+	if manager_email:
+		query = query.filter(Employees.manager_email == manager_email.upper())
+	if hire_date_from:
+		query = query.filter(Employees.hire_date >= hire_date_from)
+	if hire_date_to:
+		query = query.filter(Employees.hire_date <= hire_date_to)
+	if q:
+		# mesma busca do /search (FTS5), mas combinada com a ordenação e o cursor: cobre a tabela inteira
+		matches = SearchIndex.employees_filter(db, q)
+		if matches is not None:
+			query = query.filter(matches)
+
+	all_employees, next_cursor = employees_paginator.paginate(query, sort, cursor, limit)
+
+	if next_cursor:
+		response.headers['X-Next-Cursor'] = next_cursor
+	response.headers.update(HttpCache.headers(etag))
 
 	return all_employees
 
+# indicadores por gestor (equipe, profundidade, marcos de tempo de empresa) - usuarios ADMIN ou RH apenas
+# o resultado já sai em bytes (orjson); o response_model serve só para a documentação
+@router.get('/analytics', response_model=OrgAnalyticsResponse, status_code=status.HTTP_200_OK)
+async def get_org_analytics(
+	user: user_dependency,
+	db: db_dependency,
+	request: Request,
+	year: Optional[int] = Query(None, ge=1900, le=2200, description='Ano de referência dos marcos (padrão: ano atual)'),
+	manager_email: Optional[str] = None,
+	limit: Optional[int] = Query(None, gt=0, description='Apenas os N gestores com as maiores equipes')
+):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Acesso negado. Apenas usuários ADMIN ou RH podem acessar esta rota.')
+	
+	year = year or date.today().year
+	etag = HttpCache.etag('analytics', DataVersions.current(db, 'employees'), year, str(request.query_params))
+	not_modified = HttpCache.not_modified(request, etag)
+	if not_modified is not None:
+		return not_modified
+	
+	analytics = org_analytics.get(db, year)
+	
+	managers = analytics['managers']
+	if manager_email:
+		managers = [manager for manager in managers if manager['manager_email'] == manager_email.upper()]
+		if not managers:
+			raise HTTPException(status_code=404, detail='Gestor não encontrado.')
+	if limit:
+		managers = managers[:limit]
+	
+	content = orjson.dumps({'summary': analytics['summary'], 'managers': managers})
+	return Response(content=content, media_type='application/json', headers=HttpCache.headers(etag))
+
+# quantos completam cada marco de tempo de empresa em cada mês do ano, no total e por equipe - usuarios ADMIN ou RH apenas
+# com manager_email, detalha a equipe inteira daquele gestor (todos os níveis) e lista as pessoas
+@router.get('/milestone-report', response_model=MilestoneReportResponse, status_code=status.HTTP_200_OK)
+async def get_milestone_report(
+	user: user_dependency,
+	db: db_dependency,
+	request: Request,
+	year: Optional[int] = Query(None, ge=1900, le=2200, description='Ano do relatório (padrão: ano atual)'),
+	manager_email: Optional[str] = None,
+	limit: Optional[int] = Query(None, gt=0, description='Apenas os N gestores com mais marcos no ano')
+):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Acesso negado. Apenas usuários ADMIN ou RH podem acessar esta rota.')
+	
+	year = year or date.today().year
+	etag = HttpCache.etag('milestone-report', DataVersions.current(db, 'employees'), year, str(request.query_params))
+	not_modified = HttpCache.not_modified(request, etag)
+	if not_modified is not None:
+		return not_modified
+	
+	report = milestone_report.report(db, year, manager_email.upper() if manager_email else None, limit)
+	if report is None:
+		raise HTTPException(status_code=404, detail='Gestor não encontrado.')
+	
+	return Response(content=orjson.dumps(report), media_type='application/json', headers=HttpCache.headers(etag))
+
+# alterações nos funcionários desde o seq informado - usuarios ADMIN ou RH apenas
+# para sincronizar do zero: buscar /employees/all, guardar o latest_seq e acompanhar a partir dele
+@router.get('/changes', response_model=EmployeeChangesResponse, status_code=status.HTTP_200_OK)
+async def get_employee_changes(
+	user: user_dependency,
+	db: db_dependency,
+	since: int = Query(0, ge=0),
+	limit: int = Query(ChangeFeed.DEFAULT_PAGE_SIZE, gt=0, le=ChangeFeed.MAX_PAGE_SIZE)
+):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Acesso negado. Apenas usuários ADMIN ou RH podem acessar esta rota.')
+	
+	rows, has_more = ChangeFeed.changes_since(db, since, limit)
+	
+	changes = [
+		{
+			'seq': change.seq,
+			'operation': change.operation,
+			'employee_pk': change.employee_pk,
+			'employee_email': change.employee_email,
+			'changed_at': change.changed_at,
+			'employee': employee
+		}
+		for change, employee in rows
+	]
+	
+	return {
+		'changes': changes,
+		'next_since': rows[-1][0].seq if rows else since,
+		'latest_seq': ChangeFeed.last_seq(db),
+		'has_more': has_more
+	}
+
 # cria um employee para o usuário logado
-@router.post('/employee', status_code=status.HTTP_201_CREATED)
+@router.post('/employee', response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
 async def create_employee(user: user_dependency, db: db_dependency, employee_request: EmployeesRequest):
 	if user is None:
 		raise HTTPException(status_code=401, detail='Falha na autenticação')
@@ -149,7 +439,7 @@ async def create_employee(user: user_dependency, db: db_dependency, employee_req
 	return employee_model
 
 # cria um employee com manager customizado (ADMIN/RH)
-@router.post('/employee-with-manager', status_code=status.HTTP_201_CREATED)
+@router.post('/employee-with-manager', response_model=EmployeeResponse, status_code=status.HTTP_201_CREATED)
 async def create_employee_with_manager(
 	user: user_dependency, 
 	db: db_dependency, 
@@ -195,6 +485,142 @@ async def create_employee_with_manager(
 	
 	return employee_model
 
+# atualiza vários funcionários em uma transação - usuarios ADMIN ou RH apenas
+# (declarado antes de /{employee_id} para que "batch" não seja lido como id)
+@router.put('/batch', response_model=EmployeesBatchUpdateResponse, status_code=status.HTTP_200_OK)
+async def update_employees_batch(user: user_dependency, db: db_dependency, batch_request: EmployeesBatchUpdateRequest):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem atualizar funcionários em lote')
+	
+	ids = [item.id for item in batch_request.updates]
+	if len(set(ids)) != len(ids):
+		raise HTTPException(status_code=400, detail='O lote tem o mesmo colaborador mais de uma vez')
+	
+	# todos os registros do lote em uma consulta
+	employees = {employee.id: employee for employee in db.query(Employees).filter(Employees.id.in_(ids)).all()}
+	missing = [employee_id for employee_id in ids if employee_id not in employees]
+	if missing:
+		raise HTTPException(status_code=404, detail=f'Colaboradores não encontrados: {missing[:20]}')
+	
+	update_data = {item.id: item.model_dump(exclude_unset=True, exclude={'id'}) for item in batch_request.updates}
+	for data in update_data.values():
+		# o EmailStr devolve o domínio em minúsculas; os e-mails são gravados inteiros em caixa alta
+		if data.get('employee_email'):
+			data['employee_email'] = data['employee_email'].upper()
+	
+	# estado final do lote: IDs de funcionário e e-mails não podem se repetir dentro dele...
+	final_employee_ids = [update_data[i].get('employee_id', employees[i].employee_id) for i in ids]
+	final_emails = [update_data[i].get('employee_email', employees[i].employee_email) for i in ids]
+	if len(set(final_employee_ids)) != len(final_employee_ids):
+		raise HTTPException(status_code=400, detail='ID de funcionário repetido dentro do lote')
+	if len(set(final_emails)) != len(final_emails):
+		raise HTTPException(status_code=400, detail='E-mail repetido dentro do lote')
+	
+	# ...nem colidir com registros de fora do lote (uma consulta para o lote inteiro)
+	new_employee_ids = {data['employee_id'] for data in update_data.values() if 'employee_id' in data}
+	new_emails = {data['employee_email'] for data in update_data.values() if 'employee_email' in data}
+	if new_employee_ids or new_emails:
+		conflict = db.query(Employees.employee_id, Employees.employee_email).filter(
+			Employees.id.notin_(ids),
+			or_(Employees.employee_id.in_(new_employee_ids), Employees.employee_email.in_(new_emails))
+		).first()
+		if conflict is not None:
+			if conflict.employee_id in new_employee_ids:
+				raise HTTPException(status_code=400, detail=f'ID de funcionário {conflict.employee_id} já cadastrado em outro registro')
+			raise HTTPException(status_code=400, detail=f'E-mail {conflict.employee_email} já cadastrado em outro registro')
+	
+	# o UNIQUE é verificado linha a linha: quem troca de ID ou e-mail (ex.: dois registros trocando entre si)
+	# libera o valor antigo antes - ID vai para NULL (pode repetir) e e-mail para um marcador único pelo id
+	releasing_ids = [i for i in ids if update_data[i].get('employee_id', employees[i].employee_id) != employees[i].employee_id]
+	releasing_emails = [i for i in ids if update_data[i].get('employee_email', employees[i].employee_email) != employees[i].employee_email]
+	if releasing_ids:
+		db.query(Employees).filter(Employees.id.in_(releasing_ids)).update(
+			{Employees.employee_id: None}, synchronize_session=False
+		)
+	if releasing_emails:
+		db.query(Employees).filter(Employees.id.in_(releasing_emails)).update(
+			{Employees.employee_email: literal('~batch~') + cast(Employees.id, String)}, synchronize_session=False
+		)
+	
+	for employee_id, data in update_data.items():
+		for field, value in data.items():
+			setattr(employees[employee_id], field, value)
+	
+	try:
+		db.commit()
+	except IntegrityError:
+		db.rollback()
+		raise HTTPException(status_code=400, detail='O lote viola a unicidade de ID ou e-mail; nenhuma alteração foi aplicada')
+	
+	# recarrega o lote em uma consulta (em vez de um refresh por registro)
+	updated = db.query(Employees).filter(Employees.id.in_(ids)).order_by(Employees.id).all()
+	
+	return {'message': f'{len(updated)} colaborador(es) atualizado(s)', 'updated': len(updated), 'employees': updated}
+
+# apaga vários funcionários em uma transação - usuarios ADMIN ou RH apenas
+@router.post('/batch-delete', response_model=EmployeesBatchDeleteResponse, status_code=status.HTTP_200_OK)
+async def delete_employees_batch(user: user_dependency, db: db_dependency, batch_request: EmployeesBatchDeleteRequest):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem remover funcionários em lote')
+	
+	ids = set(batch_request.ids)
+	existing = set(db.execute(select(Employees.id).where(Employees.id.in_(ids))).scalars())
+	missing = sorted(ids - existing)
+	if missing:
+		raise HTTPException(status_code=404, detail=f'Colaboradores não encontrados: {missing[:20]}')
+	
+	deleted = db.query(Employees).filter(Employees.id.in_(ids)).delete(synchronize_session=False)
+	db.commit()
+	
+	return {'message': f'{deleted} colaborador(es) removido(s)', 'deleted': deleted}
+
+# transfere todos os subordinados diretos de um gestor para outro com um único UPDATE - usuarios ADMIN ou RH apenas
+@router.put('/reassign', response_model=ReassignReportsResponse, status_code=status.HTTP_200_OK)
+async def reassign_reports(user: user_dependency, db: db_dependency, reassign_request: ReassignReportsRequest):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+	
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem transferir equipes')
+	
+	from_email = reassign_request.from_manager_email
+	to_email = reassign_request.to_manager_email
+	if from_email == to_email:
+		raise HTTPException(status_code=400, detail='O novo gestor deve ser diferente do atual')
+	
+	# o novo gestor não pode estar abaixo do antigo: a equipe passaria a responder a um dos seus membros (ciclo)
+	subtree = EmployeeHierarchy.subtree_query(from_email).subquery()
+	if db.execute(select(subtree.c.employee_email).where(subtree.c.employee_email == to_email).limit(1)).first():
+		raise HTTPException(status_code=400, detail='O novo gestor faz parte da equipe do gestor atual')
+	
+	# nome do novo gestor: cadastro de funcionário, depois de usuário, depois o informado
+	to_name = db.execute(select(Employees.employee_name).where(Employees.employee_email == to_email)).scalar()
+	if to_name is None:
+		to_user = db.query(User).filter(User.email == to_email).first()
+		# usuário sem nome ou sobrenome cadastrado não serve de fonte (evita gravar "NONE NONE")
+		if to_user is not None and to_user.name and to_user.surname:
+			to_name = f'{to_user.name} {to_user.surname}'.upper()
+	to_name = to_name or reassign_request.to_manager_name
+	if not to_name:
+		raise HTTPException(status_code=400, detail='Novo gestor não cadastrado: informe to_manager_name')
+	
+	reassigned = db.query(Employees).filter(Employees.manager_email == from_email).update(
+		{Employees.manager_email: to_email, Employees.manager_name: to_name},
+		synchronize_session=False
+	)
+	if reassigned == 0:
+		db.rollback()
+		raise HTTPException(status_code=404, detail='O gestor informado não tem subordinados diretos')
+	db.commit()
+	
+	return {'message': f'{reassigned} colaborador(es) transferido(s) para {to_email}', 'reassigned': reassigned}
+
 # apaga um funcionário
 @router.delete("/{employee_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_employee(user: user_dependency, db: db_dependency, employee_id: int = Path(gt=0)):
@@ -203,9 +629,6 @@ async def delete_employee(user: user_dependency, db: db_dependency, employee_id:
 	
 	employee_model = db.query(Employees).filter(Employees.id == employee_id).first()
 
-	print('employee_model: ')
-	print(employee_model)
-
 	if employee_model is None:
 		raise HTTPException(status_code=404, detail='Usuário não encontrado.')
 
@@ -214,7 +637,7 @@ async def delete_employee(user: user_dependency, db: db_dependency, employee_id:
 
 
 # atualizar dados employee
-@router.put('/{employee_id}', status_code=status.HTTP_200_OK)
+@router.put('/{employee_id}', response_model=EmployeeResponse, status_code=status.HTTP_200_OK)
 async def update_employee(
 	user: user_dependency, 
 	db: db_dependency, 
@@ -0,0 +1,157 @@
+from typing import Annotated, List, Optional
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, model_validator
+from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Path
+from starlette import status
+
+from models import DigestSchedule, ScheduleFrequency
+from database import SessionLocal
+from security import SCHEDULER_MAX_SLEEP
+from .auth import get_current_user, MessageResponse
+from .email import outbox_dispatcher
+from utils.digest_scheduler import DigestScheduler
+from utils.email_outbox import utcnow
+
+router = APIRouter(
+	prefix='/schedules',
+	tags=['schedules']
+)
+
+def get_db():
+	db = SessionLocal()
+	try:
+		yield db
+	finally:
+		db.close()
+
+db_dependency = Annotated[Session, Depends(get_db)]
+user_dependency = Annotated[dict, Depends(get_current_user)]
+
+# agendador dos resumos de aniversários (iniciado no startup da aplicação)
+digest_scheduler = DigestScheduler(SessionLocal, on_enqueue=outbox_dispatcher.wake, max_sleep=SCHEDULER_MAX_SLEEP)
+
+# === Schemas ===
+
+class DigestScheduleRequest(BaseModel):
+	name: str
+	frequency: ScheduleFrequency
+	hour: int = Field(ge=0, le=23, description='Hora local do servidor')
+	minute: int = Field(0, ge=0, le=59)
+	weekday: Optional[int] = Field(None, ge=0, le=6, description='0 = segunda-feira (apenas para WEEKLY)')
+	days_ahead: Optional[int] = Field(None, gt=0, le=31, description='Dias de aniversários incluídos no resumo')
+	destinatario: EmailStr
+	manager_email: Optional[EmailStr] = None  # vazio = empresa inteira
+
+	@field_validator('frequency', mode='before')
+	def normalize_frequency(cls, v):
+		return v.upper() if isinstance(v, str) else v
+
+	@field_validator('manager_email', mode='before')
+	def normalize_manager_email(cls, v):
+		return v.upper() if v and isinstance(v, str) else v
+
+	@model_validator(mode='after')
+	def validate_weekday(self):
+		if self.frequency == ScheduleFrequency.weekly and self.weekday is None:
+			raise ValueError('Informe o dia da semana (weekday) para agendas semanais')
+		return self
+
+
+# === Schemas de resposta ===
+
+class DigestScheduleResponse(BaseModel):
+	id: int
+	name: str
+	frequency: str
+	hour: int
+	minute: int
+	weekday: Optional[int] = None
+	days_ahead: int
+	destinatario: str
+	manager_email: Optional[str] = None
+	is_active: bool
+	next_run_at: datetime
+	last_run_at: Optional[datetime] = None
+	last_result: Optional[str] = None
+	model_config = ConfigDict(from_attributes=True)
+
+
+def check_admin(user: dict):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem gerenciar agendas de resumos.')
+
+# === ENDPOINTS ===
+
+# lista as agendas de resumos
+@router.get('/', response_model=List[DigestScheduleResponse], status_code=status.HTTP_200_OK)
+async def list_schedules(user: user_dependency, db: db_dependency):
+	check_admin(user)
+
+	return db.query(DigestSchedule).order_by(DigestSchedule.id).all()
+
+# cria uma agenda de resumo diário ou semanal
+@router.post('/', response_model=DigestScheduleResponse, status_code=status.HTTP_201_CREATED)
+async def create_schedule(user: user_dependency, db: db_dependency, schedule_request: DigestScheduleRequest):
+	check_admin(user)
+
+	existing_name = db.query(DigestSchedule).filter(DigestSchedule.name == schedule_request.name).first()
+	if existing_name is not None:
+		raise HTTPException(status_code=400, detail='Já existe uma agenda com este nome')
+
+	days_ahead = schedule_request.days_ahead
+	if days_ahead is None:
+		# padrão: o dia de hoje no resumo diário, a semana inteira no semanal
+		days_ahead = 7 if schedule_request.frequency == ScheduleFrequency.weekly else 1
+
+	schedule_model = DigestSchedule(
+		name=schedule_request.name,
+		frequency=schedule_request.frequency.value,
+		hour=schedule_request.hour,
+		minute=schedule_request.minute,
+		weekday=schedule_request.weekday,
+		days_ahead=days_ahead,
+		destinatario=schedule_request.destinatario,
+		manager_email=schedule_request.manager_email,
+		is_active=True,
+		created_by=user.get('username')
+	)
+	schedule_model.next_run_at = DigestScheduler.compute_next_run(schedule_model, utcnow())
+
+	db.add(schedule_model)
+	db.commit()
+	db.refresh(schedule_model)
+	digest_scheduler.wake()
+
+	return schedule_model
+
+# dispara uma agenda agora (sem alterar o horário das próximas execuções)
+@router.post('/{schedule_id}/run', response_model=MessageResponse, status_code=status.HTTP_202_ACCEPTED)
+async def run_schedule_now(user: user_dependency, db: db_dependency, schedule_id: int = Path(gt=0)):
+	check_admin(user)
+
+	schedule_model = db.query(DigestSchedule).filter(DigestSchedule.id == schedule_id).first()
+	if schedule_model is None:
+		raise HTTPException(status_code=404, detail='Agenda não encontrada')
+
+	schedule_model.next_run_at = utcnow()
+	schedule_model.is_active = True
+	db.commit()
+	digest_scheduler.wake()
+
+	return {'message': 'Resumo agendado para envio imediato'}
+
+# apaga uma agenda
+@router.delete('/{schedule_id}', status_code=status.HTTP_204_NO_CONTENT)
+async def delete_schedule(user: user_dependency, db: db_dependency, schedule_id: int = Path(gt=0)):
+	check_admin(user)
+
+	schedule_model = db.query(DigestSchedule).filter(DigestSchedule.id == schedule_id).first()
+	if schedule_model is None:
+		raise HTTPException(status_code=404, detail='Agenda não encontrada')
+
+	db.query(DigestSchedule).filter(DigestSchedule.id == schedule_id).delete()
+	db.commit()
@@ -0,0 +1,52 @@
+from typing import Annotated, List
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette import status
+
+from database import SessionLocal
+from .auth import get_current_user, UserResponse
+from .employees import EmployeeResponse
+from utils.search_utils import SearchIndex
+
+router = APIRouter(
+	prefix='/search',
+	tags=['search']
+)
+
+def get_db():
+	db = SessionLocal()
+	try:
+		yield db
+	finally:
+		db.close()
+
+db_dependency = Annotated[Session, Depends(get_db)]
+user_dependency = Annotated[dict, Depends(get_current_user)]
+
+# === Schemas de resposta ===
+
+class SearchResponse(BaseModel):
+	employees: List[EmployeeResponse]
+	users: List[UserResponse]  # sem o hash da senha
+
+# === ENDPOINTS ===
+
+# busca por prefixo (typeahead) em funcionários e usuários - apenas ADMIN ou RH
+@router.get('/', response_model=SearchResponse, status_code=status.HTTP_200_OK)
+async def search(
+	user: user_dependency,
+	db: db_dependency,
+	q: str = Query(min_length=1, max_length=100, description='Texto digitado (nome, e-mail ou gestor)'),
+	limit: int = Query(20, gt=0, le=100)
+):
+	if user is None:
+		raise HTTPException(status_code=401, detail='Falha na autenticação')
+
+	if user.get('role') not in ['ADMIN', 'RH']:
+		raise HTTPException(status_code=403, detail='Apenas usuários ADMIN ou RH podem pesquisar funcionários e usuários.')
+
+	return {
+		'employees': SearchIndex.search_employees(db, q, limit),
+		'users': SearchIndex.search_users(db, q, limit)
+	}
@@ -1,3 +1,5 @@
+import os
+
 from passlib.context import CryptContext
 
 SECRET_KEY = "CauseMauiCanDoAnythingButFloat"
@@ -10,5 +12,49 @@ DEFAULT_PASSWORD = 'Espn123'
 
 
 # ========== CONFIGURAÇÕES DO MAIL-E ==========
-MAIL_E_HOST = '10.77.39.109' 
-MAIL_E_PORT = 5555
\ No newline at end of file
+# podem ser trocados por variável de ambiente (ex.: Mail-E local do benchmark - utils/mail_e_server.py)
+MAIL_E_HOST = os.getenv('MAIL_E_HOST', '10.77.39.109')
+MAIL_E_PORT = int(os.getenv('MAIL_E_PORT', '5555'))
+MAIL_E_CONNECT_TIMEOUT = 5  # segundos para abrir a conexão
+MAIL_E_TIMEOUT = 10  # segundos para enviar o payload e para receber a resposta
+MAIL_E_POOL_SIZE = 4  # conexões persistentes mantidas abertas por worker
+
+# ========== OUTBOX DE E-MAILS ==========
+OUTBOX_BATCH_SIZE = 20  # mensagens enviadas por lote
+OUTBOX_POLL_INTERVAL = 2  # segundos entre verificações com a fila vazia
+OUTBOX_MAX_ATTEMPTS = 6  # tentativas até a mensagem ir para DEAD
+OUTBOX_BACKOFF_BASE = 30  # segundos de espera após a 1ª falha (dobra a cada falha)
+OUTBOX_BACKOFF_MAX = 3600  # espera máxima entre tentativas
+
+# ========== ENVIO DO CALENDÁRIO PARA TODOS OS GESTORES ==========
+FANOUT_CONCURRENCY = 8  # envios simultâneos ao Mail-E durante o job
+
+# ========== AGENDADOR DE RESUMOS DE ANIVERSÁRIOS ==========
+SCHEDULER_MAX_SLEEP = 60  # segundos máximos entre verificações (pega agendas criadas em outros workers)
+
+# ========== INDICADORES DA ORGANIZAÇÃO ==========
+MILESTONE_YEARS = (5, 10, 15, 20, 25, 30, 35, 40)  # anos de empresa contados como marco nos indicadores
+
+# ========== CALENDÁRIO (.ics) DE ANIVERSÁRIOS ==========
+# clientes de calendário (Outlook, Google) não enviam o cookie de login: assinam o feed com um token próprio na URL
+CALENDAR_FEED_TOKEN_DAYS = int(os.getenv('CALENDAR_FEED_TOKEN_DAYS', '180'))  # validade do token do feed
+CALENDAR_FEED_DEFAULT_DAYS = 90  # janela padrão de aniversários (a partir de hoje)
+
+# ========== CACHE DA HIERARQUIA EM MEMÓRIA ==========
+# cada worker mantém a organização inteira em memória (utils/employee_store.py) e remonta após escritas
+EMPLOYEE_CACHE_ENABLED = os.getenv('EMPLOYEE_CACHE', 'false').lower() in ('1', 'true', 'yes')
+
+# ========== LIMITE DE TENTATIVAS DE LOGIN ==========
+# Por conta: rajada de 5 tentativas, depois 1 nova tentativa por minuto
+LOGIN_ACCOUNT_BURST = int(os.getenv('LOGIN_ACCOUNT_BURST', '5'))
+LOGIN_ACCOUNT_REFILL_PER_SECOND = float(os.getenv('LOGIN_ACCOUNT_REFILL_PER_SECOND', str(1 / 60)))
+# Por IP: rajada de 20 tentativas, depois 1 nova tentativa a cada 6 segundos
+# (o benchmark aumenta os limites: todos os logins dele saem do mesmo IP)
+LOGIN_IP_BURST = int(os.getenv('LOGIN_IP_BURST', '20'))
+LOGIN_IP_REFILL_PER_SECOND = float(os.getenv('LOGIN_IP_REFILL_PER_SECOND', str(1 / 6)))
+
+# ========== PROFILER SQL (depuração, desligado por padrão) ==========
+SQL_PROFILER_ENABLED = os.getenv('SQL_PROFILER', 'false').lower() in ('1', 'true', 'yes')
+SQL_PROFILER_REPEAT_THRESHOLD = int(os.getenv('SQL_PROFILER_REPEAT_THRESHOLD', '10'))  # mesma consulta N+ vezes = suspeita de N+1
+SQL_PROFILER_KEEP_SLOWEST = int(os.getenv('SQL_PROFILER_KEEP_SLOWEST', '50'))  # requisições mais lentas registradas no log
+SQL_PROFILER_LOG = os.getenv('SQL_PROFILER_LOG', 'sql_profile.jsonl')
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+# os módulos da API importam uns aos outros a partir desta pasta (como no uvicorn)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# nunca abrir o banco de verdade: database.py lê a URL na importação
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from database import Base  # noqa: E402
+import models  # noqa: E402,F401 - registra as tabelas no Base
+
+
+@pytest.fixture
+def db(tmp_path):
+	"""Sessão em um banco SQLite novo por teste"""
+	engine = create_engine(f'sqlite:///{tmp_path / "test.db"}')
+	Base.metadata.create_all(engine)
+	session = sessionmaker(bind=engine, autoflush=False)()
+	try:
+		yield session
+	finally:
+		session.close()
+		engine.dispose()
+
+
+@pytest.fixture
+def change_feed():
+	"""Eventos do ChangeFeed registrados só durante o teste (são globais, na classe Session)"""
+	from utils.change_feed import ChangeFeed
+
+	ChangeFeed.install_events()
+	try:
+		yield ChangeFeed
+	finally:
+		event.remove(Session, 'after_flush', ChangeFeed._after_flush)
+		event.remove(Session, 'do_orm_execute', ChangeFeed._do_orm_execute)
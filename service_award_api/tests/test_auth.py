@@ -0,0 +1,13 @@
+from models import User
+from routers.auth import UserResponse
+
+
+def test_user_response_accepts_null_columns(db):
+	user = User(email='SEM.NOME@X.COM', hashed_password='x')
+	db.add(user)
+	db.commit()
+
+	response = UserResponse.model_validate(user)
+
+	assert response.email == 'SEM.NOME@X.COM'
+	assert response.name is None and response.surname is None and response.role is None
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import CalendarFanoutJob, EmailOutbox, Employees, JobStatus
+from utils.calendar_fanout import CalendarFanout
+
+
+class FakeMailE:
+	"""Responde ERRO para os gestores da lista failing e OK para os demais"""
+
+	def __init__(self, failing):
+		self.failing = failing
+		self.sent = []
+
+	async def send(self, payload):
+		await asyncio.sleep(0)
+		self.sent.append(payload['DESTINATARIO'])
+		return {'STATUS': 'ERRO' if payload['DESTINATARIO'] in self.failing else 'OK'}
+
+
+def test_fanout_counts_and_queues_with_its_own_sessions(db, monkeypatch):
+	for email, manager in [('DIR@X.COM', 'CEO@X.COM'), ('ANA@X.COM', 'DIR@X.COM'), ('BIA@X.COM', 'DIR@X.COM')]:
+		db.add(Employees(employee_name=email.split('@')[0], employee_email=email, hire_date=date(2015, 1, 1),
+						 manager_name='M', manager_email=manager))
+	db.commit()
+
+	# cada thread abre a própria conexão com o mesmo arquivo do teste
+	engine = create_engine(db.get_bind().url, connect_args={'check_same_thread': False})
+	session_factory = sessionmaker(bind=engine, autoflush=False)
+	session_threads = []
+
+	def tracked_session():
+		session_threads.append(threading.current_thread())
+		return session_factory()
+
+	fanout = CalendarFanout(tracked_session, FakeMailE({'DIR@X.COM'}), concurrency=2, progress_interval=0)
+
+	async def main():
+		job = fanout.start(session_factory(), started_by='RH@X.COM')
+		while fanout._tasks:
+			await asyncio.sleep(0.01)
+		return job.id
+
+	job_id = asyncio.run(main())
+	engine.dispose()
+
+	db.expire_all()
+	job = db.query(CalendarFanoutJob).filter(CalendarFanoutJob.id == job_id).one()
+	assert (job.status, job.total_managers, job.processed, job.sent, job.queued_for_retry) == (JobStatus.done.value, 2, 2, 1, 1)
+	assert job.total_employees == 5  # CEO: DIR, ANA e BIA; DIR: ANA e BIA
+	assert job.last_error.startswith('DIR@X.COM: MailEError')
+
+	retry = db.query(EmailOutbox).one()
+	assert (retry.destinatario, retry.total_employees, retry.requested_by) == ('DIR@X.COM', 2, 'RH@X.COM')
+	# nenhuma sessão do job é aberta no event loop
+	assert session_threads and threading.main_thread() not in session_threads
@@ -0,0 +1,31 @@
+from datetime import date
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from models import Employees
+from utils.change_feed import ChangeFeed
+
+
+def test_bulk_insert_records_returned_ids(db, change_feed):
+	db.add(Employees(employee_email='ANTES@X.COM', hire_date=date(2020, 1, 1), manager_name='BOSS', manager_email='BOSS@X.COM'))
+	db.commit()
+
+	db.execute(insert(Employees), [
+		{'employee_email': f'E{number}@X.COM', 'hire_date': date(2020, 1, 1), 'manager_name': 'BOSS', 'manager_email': 'BOSS@X.COM'}
+		for number in range(3)
+	])
+	db.commit()
+
+	changes, has_more = ChangeFeed.changes_since(db, 1)
+	created = {employee.employee_email: employee.id for employee in db.query(Employees).filter(Employees.employee_email != 'ANTES@X.COM')}
+	assert not has_more
+	assert [(change.operation, change.employee_email, change.employee_pk) for change, _ in changes] == [
+		(ChangeFeed.INSERT, email, created[email]) for email in ('E0@X.COM', 'E1@X.COM', 'E2@X.COM')
+	]
+
+
+def test_events_are_removed_after_each_test():
+	# o teste anterior registrou os eventos pela fixture, que os remove na saída
+	assert not event.contains(Session, 'after_flush', ChangeFeed._after_flush)
+	assert not event.contains(Session, 'do_orm_execute', ChangeFeed._do_orm_execute)
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from datetime import date
+
+from models import Employees
+from utils.digest_scheduler import AnniversaryDigest, DigestScheduler
+
+
+def add_employee(db, email, hire_date, manager_email='BOSS@X.COM'):
+	db.add(Employees(
+		employee_name=email.split('@')[0],
+		employee_email=email,
+		hire_date=hire_date,
+		manager_name='BOSS',
+		manager_email=manager_email
+	))
+
+
+def test_upcoming_across_year_boundary(db):
+	add_employee(db, 'DEZ@X.COM', date(2020, 12, 30))
+	add_employee(db, 'JAN@X.COM', date(2019, 1, 2))
+	add_employee(db, 'NOVO@X.COM', date(2026, 12, 30))  # completa 0 anos na janela
+	add_employee(db, 'FORA@X.COM', date(2018, 1, 5))
+	db.commit()
+
+	rows = AnniversaryDigest.upcoming(db, date(2026, 12, 28), 7)
+
+	# dezembro antes de janeiro: ordem pela data real do aniversário
+	assert [row[1] for row in rows] == ['DEZ@X.COM', 'JAN@X.COM']
+
+
+def test_upcoming_hired_in_january_of_window_end_year(db):
+	# admissão em 02/01/2027 só completa 1 ano em 2028
+	add_employee(db, 'RECENTE@X.COM', date(2027, 1, 2))
+	add_employee(db, 'ANTIGO@X.COM', date(2026, 1, 2))
+	db.commit()
+
+	rows = AnniversaryDigest.upcoming(db, date(2026, 12, 28), 7)
+
+	assert [row[1] for row in rows] == ['ANTIGO@X.COM']
+
+
+def test_upcoming_leap_day_in_non_leap_year(db):
+	add_employee(db, 'LEAP@X.COM', date(2020, 2, 29))
+	db.commit()
+
+	assert [row[1] for row in AnniversaryDigest.upcoming(db, date(2027, 2, 28), 1)] == ['LEAP@X.COM']
+	assert AnniversaryDigest.upcoming(db, date(2027, 3, 1), 7) == []
+
+
+def test_run_fires_off_the_event_loop():
+	threads = {}
+
+	def run_due():
+		threads['run_due'] = threading.current_thread()
+		return None, True
+
+	async def main():
+		woken = asyncio.Event()
+
+		def on_enqueue():
+			threads['on_enqueue'] = threading.current_thread()
+			woken.set()
+
+		scheduler = DigestScheduler(None, on_enqueue=on_enqueue, max_sleep=60)
+		scheduler.run_due = run_due
+		scheduler.start()
+		try:
+			await asyncio.wait_for(woken.wait(), timeout=5)
+		finally:
+			await scheduler.stop()
+
+	asyncio.run(main())
+
+	# a consulta e os commits rodam em outra thread; on_enqueue volta para o event loop
+	assert threads['run_due'] is not threading.main_thread()
+	assert threads['on_enqueue'] is threading.main_thread()
@@ -0,0 +1,154 @@
+import asyncio
+import json
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from models import EmailOutbox, OutboxStatus
+from utils import email_outbox
+from utils.calendar_utils import CalendarPayload
+from utils.email_outbox import EmailOutboxDispatcher
+
+
+class FakeMailE:
+	"""Cliente no lugar do Mail-E: guarda os pedaços recebidos e responde com a próxima resposta da lista"""
+
+	def __init__(self, *responses):
+		self.responses = list(responses)
+		self.sent = []
+
+	async def send_stream(self, make_chunks):
+		self.sent.append(list(make_chunks()))
+		response = self.responses.pop(0) if self.responses else {'STATUS': 'OK'}
+		if isinstance(response, BaseException):
+			raise response
+		return response
+
+	def close(self):
+		pass
+
+
+TEAM = [
+	('ANA', 'ANA@X.COM', date(2015, 3, 1)),
+	('JOÃO', 'JOAO@X.COM', date(2010, 7, 20)),
+	(None, 'SEM.NOME@X.COM', date(2010, 7, 20))
+]
+
+
+def test_enqueue_calendar_stores_the_same_json_as_build(db):
+	message = EmailOutboxDispatcher.enqueue_calendar(db, 'BOSS@X.COM', iter(TEAM), 'RH@X.COM')
+	db.commit()
+
+	expected = CalendarPayload.build('BOSS@X.COM', [CalendarPayload.aniversario(*row) for row in TEAM])
+	assert message.payload == json.dumps(expected)
+	assert message.total_employees == 3
+
+
+def test_enqueue_calendar_skips_empty_team(db):
+	assert EmailOutboxDispatcher.enqueue_calendar(db, 'BOSS@X.COM', iter([])) is None
+	assert db.query(EmailOutbox).count() == 0
+
+
+def test_send_streams_the_payload_in_chunks(db, monkeypatch):
+	monkeypatch.setattr(email_outbox, 'SEND_CHUNK_CHARS', 16)
+	message = EmailOutboxDispatcher.enqueue_calendar(db, 'BOSS@X.COM', iter(TEAM))
+	db.commit()
+	client = FakeMailE()
+	dispatcher = EmailOutboxDispatcher(None, client)
+
+	asyncio.run(dispatcher._send(message))
+
+	chunks = client.sent[0]
+	assert len(chunks) > 2
+	assert all(len(chunk.decode('utf-8')) <= 16 for chunk in chunks)
+	assert b''.join(chunks) == (message.payload + '\n').encode('utf-8')
+
+
+@pytest.fixture
+def session_factory(db):
+	return sessionmaker(bind=db.get_bind(), autoflush=False)
+
+
+def queue(db, count=1):
+	for number in range(count):
+		EmailOutboxDispatcher.enqueue(db, {'CONTENT': 'ServiceAwardCalendar', 'DESTINATARIO': f'M{number}@X.COM', 'ANIVERSARIOS': []})
+	db.commit()
+
+
+def make_due(db):
+	db.query(EmailOutbox).update({EmailOutbox.next_attempt_at: datetime(2000, 1, 1)})
+	db.commit()
+
+
+def test_claim_is_exclusive_until_the_lease_expires(db, session_factory):
+	queue(db, 3)
+	first = EmailOutboxDispatcher(session_factory, FakeMailE(), batch_size=2)
+	second = EmailOutboxDispatcher(session_factory, FakeMailE(), batch_size=2)
+
+	claimed = first._claim_batch(session_factory())
+	others = second._claim_batch(session_factory())
+
+	assert len(claimed) == 2 and len(others) == 1
+	assert {message.id for message in claimed}.isdisjoint(message.id for message in others)
+	assert second._claim_batch(session_factory()) == []
+
+	# worker caiu no meio do envio: com a reserva vencida, as mensagens SENDING voltam para a fila
+	make_due(db)
+	reclaimed = second._claim_batch(session_factory())
+	assert [(message.status, message.attempts) for message in reclaimed] == [(OutboxStatus.sending.value, 2)] * 2
+
+
+def test_drain_marks_sent(db, session_factory):
+	queue(db)
+	client = FakeMailE({'STATUS': 'OK', 'ID': 7})
+
+	assert asyncio.run(EmailOutboxDispatcher(session_factory, client).drain_once()) == 1
+
+	db.expire_all()
+	message = db.query(EmailOutbox).one()
+	assert (message.status, message.attempts, message.claim_token, message.last_error) == (OutboxStatus.sent.value, 1, None, None)
+	assert message.sent_at is not None
+	assert json.loads(message.mail_e_response) == {'STATUS': 'OK', 'ID': 7}
+
+
+def test_failures_back_off_then_go_dead(db, session_factory, monkeypatch):
+	monkeypatch.setattr(email_outbox.random, 'uniform', lambda low, high: 1)
+	queue(db)
+	client = FakeMailE({'STATUS': 'ERRO'}, ConnectionResetError('caiu'), None)
+	dispatcher = EmailOutboxDispatcher(session_factory, client, max_attempts=3, backoff_base=30, backoff_max=3600)
+
+	delays = []
+	for _ in range(3):
+		before = email_outbox.utcnow()
+		assert asyncio.run(dispatcher.drain_once()) == 1
+		db.expire_all()
+		message = db.query(EmailOutbox).one()
+		delays.append((message.status, round((message.next_attempt_at - before).total_seconds() / 30)))
+		assert asyncio.run(dispatcher.drain_once()) == 0  # ainda não venceu
+		make_due(db)
+
+	# 30 s, 60 s e, na terceira tentativa, DEAD (next_attempt_at não é mais alterado)
+	assert delays[:2] == [(OutboxStatus.pending.value, 1), (OutboxStatus.pending.value, 2)]
+	assert message.status == OutboxStatus.dead.value
+	assert message.attempts == 3
+	assert message.last_error.startswith('MailEError')
+	assert len(client.sent) == 3
+
+
+def test_lost_lease_does_not_overwrite_the_new_owner(db, session_factory):
+	queue(db)
+	dispatcher = EmailOutboxDispatcher(session_factory, FakeMailE())
+
+	async def send_while_another_worker_reclaims(message):
+		# a reserva venceu no meio do envio e outro worker pegou a mensagem
+		db.query(EmailOutbox).update({EmailOutbox.claim_token: 'outro-worker'})
+		db.commit()
+		return {'STATUS': 'OK'}
+
+	dispatcher._send = send_while_another_worker_reclaims
+	asyncio.run(dispatcher.drain_once())
+
+	db.expire_all()
+	message = db.query(EmailOutbox).one()
+	assert (message.status, message.claim_token) == (OutboxStatus.sending.value, 'outro-worker')
@@ -0,0 +1,112 @@
+from datetime import date
+
+import pytest
+
+from models import Employees
+from utils import employee_utils
+from utils.employee_store import EmployeeStore, EmployeeStoreCache
+from utils.employee_utils import EmployeeHierarchy
+from utils.http_cache import DataVersions
+
+ORG = [
+	# BOSS@X.COM não está na tabela: vira um nó de gestor externo
+	('E1@X.COM', 'BOSS@X.COM'),
+	('E2@X.COM', 'E1@X.COM'),
+	('E3@X.COM', 'E1@X.COM'),
+	('E4@X.COM', 'E2@X.COM'),
+	('E5@X.COM', 'BOSS@X.COM'),
+	('C1@X.COM', 'C2@X.COM'),
+	('C2@X.COM', 'C1@X.COM'),
+	('S@X.COM', 'S@X.COM')
+]
+
+
+@pytest.fixture
+def org(db):
+	for number, (email, manager) in enumerate(ORG, start=1):
+		db.add(Employees(id=number, employee_id=100 + number if number != 3 else None, employee_name=f'N{number}',
+						 employee_email=email, hire_date=date(2015, 1, 1 + number % 2), manager_name=f'M-{manager}',
+						 manager_email=manager))
+	db.commit()
+	return db
+
+
+def emails(store, nodes):
+	return [store.emails[node] for node in nodes]
+
+
+def test_iter_subtree_is_preorder_in_id_order(org):
+	store = EmployeeStore.load(org)
+
+	assert emails(store, store.iter_subtree('BOSS@X.COM')) == ['E1@X.COM', 'E2@X.COM', 'E4@X.COM', 'E3@X.COM', 'E5@X.COM']
+	assert emails(store, store.iter_subtree('E2@X.COM')) == ['E4@X.COM']
+	assert list(store.iter_subtree('E4@X.COM')) == []
+	assert list(store.iter_subtree('NINGUEM@X.COM')) == []
+
+
+def test_iter_subtree_ignores_cycles_and_the_manager_itself(org):
+	store = EmployeeStore.load(org)
+
+	assert emails(store, store.iter_subtree('C1@X.COM')) == ['C2@X.COM']
+	assert emails(store, store.iter_subtree('C2@X.COM')) == ['C1@X.COM']
+	assert list(store.iter_subtree('S@X.COM')) == []
+
+
+def test_external_managers_are_extra_nodes(org):
+	store = EmployeeStore.load(org)
+	boss = store.index['BOSS@X.COM']
+
+	assert store.size == len(ORG)
+	assert boss >= store.size
+	assert store.names[boss] is None
+	assert emails(store, store.children[store.child_start[boss]:store.child_start[boss + 1]]) == ['E1@X.COM', 'E5@X.COM']
+
+
+def test_record_matches_the_table(org):
+	store = EmployeeStore.load(org)
+
+	for employee in org.query(Employees):
+		record = store.record(store.index[employee.employee_email])
+		assert {field: getattr(record, field) for field in record.__slots__} == {
+			field: getattr(employee, field) for field in record.__slots__
+		}
+
+
+def test_hire_dates_share_one_object_per_day(org):
+	store = EmployeeStore.load(org)
+	first, third = store.index['E1@X.COM'], store.index['E3@X.COM']
+
+	assert store.hire_date(first) == date(2015, 1, 2)
+	assert store.hire_date(first) is store.hire_date(third)
+
+
+def test_tree_matches_the_database_version(org, monkeypatch):
+	monkeypatch.setattr(employee_utils, 'EMPLOYEE_CACHE_ENABLED', False)
+
+	for manager in ('BOSS@X.COM', 'E1@X.COM', 'E4@X.COM'):
+		expected = EmployeeHierarchy.get_hierarchy_tree(manager, org)['hierarchy']
+		assert EmployeeStore.load(org).tree(manager) == expected
+
+
+def test_tree_stops_at_cycles(org):
+	tree = EmployeeStore.load(org).tree('C1@X.COM')
+
+	assert [node['employee_email'] for node in tree] == ['C2@X.COM']
+	assert tree[0]['subordinates'] == []
+
+
+def test_cache_rebuilds_only_when_the_version_changes(org):
+	DataVersions.setup(org.get_bind())
+	cache = EmployeeStoreCache()
+
+	store = cache.get(org)
+	assert cache.get(org) is store
+
+	org.query(Employees).filter(Employees.employee_email == 'E5@X.COM').update({Employees.manager_email: 'E4@X.COM'})
+	assert cache.get(org) is store  # versão não mudou: continua a árvore antiga
+
+	DataVersions.bump(org.connection(), ['employees'])
+	org.commit()
+	rebuilt = cache.get(org)
+	assert rebuilt is not store
+	assert emails(rebuilt, rebuilt.iter_subtree('E2@X.COM')) == ['E4@X.COM', 'E5@X.COM']
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from models import Employees, User
+from routers.employees import (
+	EmployeesBatchUpdateRequest, ReassignReportsRequest, reassign_reports, update_employees_batch
+)
+
+RH = {'username': 'RH@X.COM', 'role': 'RH'}
+
+
+@pytest.fixture
+def team(db):
+	for number, manager in [(1, 'BOSS@X.COM'), (2, 'E1@X.COM'), (3, 'E1@X.COM'), (4, 'OUTRO@X.COM')]:
+		db.add(Employees(id=number, employee_id=100 + number, employee_name=f'N{number}', employee_email=f'E{number}@X.COM',
+						 hire_date=date(2015, 1, number), manager_name='M', manager_email=manager))
+	db.commit()
+	return db
+
+
+def batch(db, *updates):
+	request = EmployeesBatchUpdateRequest(updates=list(updates))
+	return asyncio.run(update_employees_batch(RH, db, request))
+
+
+def snapshot(db):
+	db.expire_all()
+	return {employee.id: (employee.employee_id, employee.employee_email) for employee in db.query(Employees)}
+
+
+def test_swap_ids_and_emails_between_two_records(team):
+	result = batch(
+		team,
+		{'id': 1, 'employee_id': 102, 'employee_email': 'e2@x.com'},
+		{'id': 2, 'employee_id': 101, 'employee_email': 'E1@X.COM'}
+	)
+
+	assert result['updated'] == 2
+	assert snapshot(team) == {1: (102, 'E2@X.COM'), 2: (101, 'E1@X.COM'), 3: (103, 'E3@X.COM'), 4: (104, 'E4@X.COM')}
+
+
+def test_rotate_emails_across_three_records(team):
+	batch(
+		team,
+		{'id': 1, 'employee_email': 'E2@X.COM'},
+		{'id': 2, 'employee_email': 'E3@X.COM'},
+		{'id': 3, 'employee_email': 'E1@X.COM', 'employee_name': 'novo'}
+	)
+
+	state = snapshot(team)
+	assert [state[i][1] for i in (1, 2, 3)] == ['E2@X.COM', 'E3@X.COM', 'E1@X.COM']
+	# nenhum marcador temporário sobra na tabela
+	assert not any(email.startswith('~batch~') for _, email in state.values())
+	assert team.get(Employees, 3).employee_name == 'NOVO'
+
+
+@pytest.mark.parametrize('updates, detail', [
+	([{'id': 1, 'employee_email': 'E4@X.COM'}], 'E-mail E4@X.COM já cadastrado em outro registro'),
+	([{'id': 1, 'employee_id': 104}], 'ID de funcionário 104 já cadastrado em outro registro'),
+	([{'id': 1, 'employee_id': 200}, {'id': 2, 'employee_id': 200}], 'ID de funcionário repetido dentro do lote'),
+	([{'id': 1, 'employee_email': 'E2@X.COM'}], 'E-mail E2@X.COM já cadastrado em outro registro')
+])
+def test_conflicts_reject_the_whole_batch(team, updates, detail):
+	before = snapshot(team)
+
+	with pytest.raises(HTTPException) as error:
+		batch(team, *updates)
+
+	assert (error.value.status_code, error.value.detail) == (400, detail)
+	assert snapshot(team) == before
+
+
+def reassign(db, **request):
+	return asyncio.run(reassign_reports(RH, db, ReassignReportsRequest(**request)))
+
+
+def test_reassign_skips_users_without_name(team):
+	team.add(User(email='NOVO@X.COM', hashed_password='-', name=None, surname='S'))
+	team.commit()
+
+	with pytest.raises(HTTPException) as error:
+		reassign(team, from_manager_email='E1@X.COM', to_manager_email='NOVO@X.COM')
+	assert error.value.detail == 'Novo gestor não cadastrado: informe to_manager_name'
+
+	assert reassign(team, from_manager_email='E1@X.COM', to_manager_email='novo@x.com', to_manager_name='Ana')['reassigned'] == 2
+	team.expire_all()
+	assert {(e.manager_email, e.manager_name) for e in team.query(Employees).filter(Employees.id.in_([2, 3]))} == {('NOVO@X.COM', 'ANA')}
+
+
+def test_reassign_rejects_moving_a_team_under_its_own_member(team):
+	with pytest.raises(HTTPException) as error:
+		reassign(team, from_manager_email='E1@X.COM', to_manager_email='E2@X.COM')
+
+	assert error.value.detail == 'O novo gestor faz parte da equipe do gestor atual'
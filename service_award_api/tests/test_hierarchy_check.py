@@ -0,0 +1,91 @@
+import asyncio
+from datetime import date
+from io import BytesIO
+
+import openpyxl
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from models import Employees, User
+from routers.admin import upload_employees_excel
+from utils.hierarchy_check import HierarchyCheck
+
+
+def test_valid_tree():
+	report = HierarchyCheck.check([
+		('DIR@X.COM', 'CEO@X.COM'),
+		('ANA@X.COM', 'DIR@X.COM'),
+		('BIA@X.COM', 'DIR@X.COM')
+	])
+
+	assert report['valid']
+	assert report['max_depth'] == 2
+	assert report['roots'] == [{'manager_email': 'CEO@X.COM', 'employees': 3}]
+	assert report['unreachable_count'] == 0
+
+
+def test_cycles_self_managed_and_orphans():
+	report = HierarchyCheck.check([
+		('DIR@X.COM', 'CEO@X.COM'),
+		('ANA@X.COM', 'DIR@X.COM'),
+		('BIA@X.COM', 'BIA@X.COM'),
+		('CIC1@X.COM', 'CIC2@X.COM'),
+		('CIC2@X.COM', 'CIC1@X.COM'),
+		('ABAIXO@X.COM', 'CIC1@X.COM'),
+		('ORFAO@X.COM', 'SUMIU@X.COM')
+	])
+
+	assert not report['valid']
+	assert report['self_managed'] == ['BIA@X.COM']
+	assert report['cycle_count'] == 2  # CIC1 <-> CIC2 e BIA -> BIA
+	assert sorted(map(sorted, report['cycles'])) == [['BIA@X.COM'], ['CIC1@X.COM', 'CIC2@X.COM']]
+	assert report['orphans'] == ['ORFAO@X.COM']
+	assert report['root_count'] == 2
+	assert report['unreachable_count'] == 4  # BIA, CIC1, CIC2 e ABAIXO
+
+
+def spreadsheet(rows):
+	workbook = openpyxl.Workbook()
+	sheet = workbook.active
+	sheet.append(['Employee ID', 'Employee', 'Email', 'Adjusted Service Date', 'Manager', 'Manager Email'])
+	for row in rows:
+		sheet.append(row)
+	content = BytesIO()
+	workbook.save(content)
+	content.seek(0)
+	return UploadFile(file=content, filename='employees.xlsx')
+
+
+@pytest.fixture
+def org(db):
+	db.add(User(email='RH@X.COM', hashed_password='-', is_active=True, role='RH'))
+	db.add(Employees(employee_id=1, employee_name='DIR', employee_email='DIR@X.COM', hire_date=date(2015, 1, 1),
+					 manager_name='CEO', manager_email='CEO@X.COM'))
+	db.commit()
+	return db
+
+
+# a planilha faz DIR responder a ANA, que responde a DIR: um ciclo
+CYCLE = [
+	[1, 'DIR', 'DIR@X.COM', date(2015, 1, 1), 'ANA', 'ANA@X.COM'],
+	[2, 'ANA', 'ANA@X.COM', date(2018, 1, 1), 'DIR', 'DIR@X.COM']
+]
+
+
+def test_strict_upload_rejects_invalid_hierarchy_without_writing(org):
+	with pytest.raises(HTTPException) as error:
+		asyncio.run(upload_employees_excel({'username': 'RH@X.COM'}, org, spreadsheet(CYCLE), strict=True))
+
+	assert error.value.status_code == 400
+	assert error.value.detail['hierarchy_check']['cycle_count'] == 1
+	org.expire_all()
+	assert [(row.employee_email, row.manager_email) for row in org.query(Employees)] == [('DIR@X.COM', 'CEO@X.COM')]
+
+
+def test_upload_reports_hierarchy_before_commit(org):
+	result = asyncio.run(upload_employees_excel({'username': 'RH@X.COM'}, org, spreadsheet(CYCLE), strict=False))
+
+	assert result['employees_added'] == 1 and result['employees_updated'] == 1
+	assert not result['hierarchy_check']['valid']
+	org.expire_all()
+	assert org.query(Employees).count() == 2
@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+from utils import milestone_report
+from utils.employee_store import EmployeeStore
+from utils.milestone_report import MilestoneReport
+
+
+def row(pk, email, hire_date, manager_email):
+	name = email.split('@')[0]
+	return (pk, pk, name, email, hire_date, manager_email.split('@')[0], manager_email)
+
+
+@pytest.fixture
+def report(monkeypatch):
+	store = EmployeeStore([
+		row(1, 'CEO@X.COM', date(2016, 3, 10), 'CEO@X.COM'),  # gestor de si mesmo
+		row(2, 'DIR@X.COM', date(2021, 5, 1), 'CEO@X.COM'),
+		row(3, 'ANA@X.COM', date(2016, 5, 20), 'DIR@X.COM'),
+		row(4, 'BIA@X.COM', date(2025, 1, 1), 'DIR@X.COM'),
+		row(5, 'EXT@X.COM', date(2011, 5, 2), 'FORA@X.COM'),  # gestor que não está na tabela
+		row(6, 'CIC1@X.COM', date(2021, 8, 1), 'CIC2@X.COM'),  # ciclo
+		row(7, 'CIC2@X.COM', date(2006, 8, 1), 'CIC1@X.COM')
+	])
+	monkeypatch.setattr(milestone_report.employee_store_cache, 'get', lambda db: store)
+	return MilestoneReport((5, 10, 15, 20))
+
+
+def test_company_totals_include_self_managed_and_cycles(report):
+	result = report.report(None, 2026)
+
+	# CEO (10), DIR (5), ANA (10), EXT (15), CIC1 (5), CIC2 (20)
+	assert result['total'] == 6
+	may = result['months'][4]
+	assert may['total'] == 3
+	assert may['by_milestone'] == {'5': 1, '10': 1, '15': 1, '20': 0}
+	assert result['months'][7]['by_milestone'] == {'5': 1, '10': 0, '15': 0, '20': 1}
+
+
+def test_teams_under_a_self_managed_ceo(report):
+	managers = {manager['manager_email']: manager for manager in report.report(None, 2026)['managers']}
+
+	assert managers['CEO@X.COM']['total'] == 2  # DIR e ANA, sem contar o próprio CEO
+	assert managers['DIR@X.COM']['total'] == 1
+	assert managers['FORA@X.COM']['total'] == 1
+	assert managers['FORA@X.COM']['manager_name'] == 'FORA'
+	# quem está preso em ciclo não forma equipe
+	assert 'CIC1@X.COM' not in managers and 'CIC2@X.COM' not in managers
+
+
+def test_drill_down(report):
+	result = report.report(None, 2026, 'CEO@X.COM')
+
+	assert result['total'] == 2
+	assert [(employee['employee_email'], employee['years'], employee['anniversary_date']) for employee in result['employees']] == [
+		('DIR@X.COM', 5, date(2026, 5, 1)),
+		('ANA@X.COM', 10, date(2026, 5, 20))
+	]
+	assert report.report(None, 2026, 'BIA@X.COM') is None
+	assert report.report(None, 2026, 'CIC1@X.COM') is None
@@ -0,0 +1,97 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import event, text
+
+from models import Employees
+from routers.employees import employees_paginator
+from utils.search_utils import SearchIndex
+
+
+@pytest.fixture
+def employees(db):
+	for number in range(1, 13):
+		db.add(Employees(
+			employee_id=number,
+			employee_name=f'N{number:02d}',
+			employee_email=f'E{number:02d}@X.COM',
+			hire_date=date(2015, 1, number),
+			manager_name='BOSS',
+			manager_email='BOSS@X.COM'
+		))
+	db.add(Employees(
+		employee_id=None,
+		employee_name=None,
+		employee_email='SEM.DADOS@X.COM',
+		hire_date=date(2015, 2, 1),
+		manager_name='BOSS',
+		manager_email='BOSS@X.COM'
+	))
+	db.commit()
+	return db
+
+
+def read_all_pages(db, sort):
+	ids, cursor = [], None
+	while True:
+		items, cursor = employees_paginator.paginate(db.query(Employees), sort, cursor, 1)
+		ids.extend(item.id for item in items)
+		if cursor is None:
+			return ids
+
+
+@pytest.mark.parametrize('sort', ['employee_id', '-employee_id', 'employee_name', '-employee_name'])
+def test_pages_through_null_sort_values(employees, sort):
+	ids = read_all_pages(employees, sort)
+
+	# página de 1 item: o cursor cai na linha com nulo e a paginação continua sem perder nem repetir linhas
+	expected = [row.id for row in employees_paginator.paginate(employees.query(Employees), sort, None, 100)[0]]
+	assert ids == expected
+	assert len(ids) == 13
+
+
+@pytest.mark.parametrize('sort, index', [
+	('employee_id', 'ix_employees_sort_employee_id'),
+	('-employee_name', 'ix_employees_sort_employee_name'),
+	('hire_date', 'ix_employees_hire_date_id')
+])
+def test_next_page_seeks_the_sort_index(employees, sort, index):
+	_, cursor = employees_paginator.paginate(employees.query(Employees), sort, None, 5)
+	statements = []
+
+	def capture(connection, cursor_, statement, parameters, context, executemany):
+		statements.append((statement, parameters))
+
+	engine = employees.get_bind()
+	event.listen(engine, 'before_cursor_execute', capture)
+	try:
+		employees_paginator.paginate(employees.query(Employees), sort, cursor, 5)
+	finally:
+		event.remove(engine, 'before_cursor_execute', capture)
+
+	statement, parameters = statements[-1]
+	plan = ' '.join(row[3] for row in employees.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters))
+	# busca direto na posição do cursor: sem varrer a tabela nem ordenar em memória
+	assert f'SEARCH employees USING INDEX {index}' in plan
+	assert 'TEMP B-TREE' not in plan
+
+
+@pytest.mark.parametrize('fts', [True, False])
+def test_search_filter_pages_through_the_whole_table(employees, monkeypatch, fts):
+	if fts:
+		SearchIndex.setup(employees.get_bind())
+		employees.execute(text("INSERT INTO employees_fts(employees_fts) VALUES('rebuild')"))
+	monkeypatch.setattr(SearchIndex, 'fts_enabled', fts)
+
+	query = employees.query(Employees).filter(SearchIndex.employees_filter(employees, 'n1'))
+	names, cursor = [], None
+	while True:
+		items, cursor = employees_paginator.paginate(query, '-employee_name', cursor, 2)
+		names.extend(item.employee_name for item in items)
+		if cursor is None:
+			break
+
+	# só dígitos também casa com o employee_id
+	by_id = employees.query(Employees).filter(SearchIndex.employees_filter(employees, '7')).all()
+	assert [item.employee_id for item in by_id] == [7]
+	assert names == ['N12', 'N11', 'N10']
@@ -0,0 +1,77 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from routers import auth
+from utils import rate_limit
+from utils.rate_limit import TokenBucketLimiter
+
+
+class Clock:
+	def __init__(self):
+		self.now = 1000.0
+
+	def __call__(self):
+		return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+	clock = Clock()
+	monkeypatch.setattr(rate_limit.time, 'monotonic', clock)
+	return clock
+
+
+def test_burst_then_refill(clock):
+	limiter = TokenBucketLimiter(capacity=3, refill_per_second=0.5)
+
+	assert [limiter.try_acquire('A') for _ in range(3)] == [0, 0, 0]
+	assert limiter.try_acquire('A') == pytest.approx(2)  # 1 token a cada 2 s
+	assert limiter.try_acquire('B') == 0  # cada chave tem o seu bucket
+
+	clock.now += 2
+	assert limiter.try_acquire('A') == 0
+	assert limiter.try_acquire('A') > 0
+
+
+def test_refund_and_reset(clock):
+	limiter = TokenBucketLimiter(capacity=1, refill_per_second=0.1)
+
+	assert limiter.try_acquire('A') == 0
+	limiter.refund('A')
+	assert limiter.try_acquire('A') == 0
+	assert limiter.try_acquire('A') > 0
+	limiter.reset('A')
+	assert limiter.try_acquire('A') == 0
+
+
+def test_idle_buckets_are_swept(clock):
+	limiter = TokenBucketLimiter(capacity=2, refill_per_second=1, idle_ttl=10, sweep_interval=5)
+	limiter.try_acquire('OLD')
+	clock.now += 6
+	limiter.try_acquire('NEW')
+	clock.now += 6
+
+	limiter.try_acquire('NEW')
+
+	assert list(limiter._buckets) == ['NEW']
+
+
+def login_request(ip):
+	return Request({'type': 'http', 'client': (ip, 1234), 'headers': []})
+
+
+def test_account_limit_does_not_spend_the_ip_budget(clock, monkeypatch):
+	monkeypatch.setattr(auth, 'ip_limiter', TokenBucketLimiter(capacity=2, refill_per_second=0.001))
+	monkeypatch.setattr(auth, 'account_limiter', TokenBucketLimiter(capacity=1, refill_per_second=0.001))
+
+	auth.check_login_rate_limit('ana@x.com', login_request('10.0.0.1'))
+	for _ in range(5):
+		with pytest.raises(HTTPException) as error:
+			auth.check_login_rate_limit('ana@x.com', login_request('10.0.0.1'))
+		assert error.value.status_code == 429
+
+	# as tentativas barradas pela conta não consumiram o IP: ainda sobra 1 token para outra conta
+	auth.check_login_rate_limit('bia@x.com', login_request('10.0.0.1'))
+	with pytest.raises(HTTPException):
+		auth.check_login_rate_limit('caio@x.com', login_request('10.0.0.1'))
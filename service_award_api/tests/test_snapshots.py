@@ -0,0 +1,77 @@
+from datetime import date
+
+import pytest
+
+from models import Employees
+from utils.snapshots import EmployeeSnapshots
+
+
+def add(db, employee_id, email, manager_email='BOSS@X.COM', hire_date=date(2015, 1, 1)):
+	db.add(Employees(employee_id=employee_id, employee_name=email.split('@')[0], employee_email=email,
+					 hire_date=hire_date, manager_name='M', manager_email=manager_email))
+
+
+def table(db):
+	db.expire_all()
+	return {
+		employee.employee_email: (employee.id, employee.employee_id, employee.employee_name, employee.hire_date, employee.manager_email)
+		for employee in db.query(Employees)
+	}
+
+
+@pytest.fixture
+def org(db):
+	for number in range(1, 5):
+		add(db, number, f'E{number}@X.COM')
+	db.commit()
+	return db
+
+
+def test_capture_is_content_addressed(org):
+	first, created = EmployeeSnapshots.capture(org, 'manual')
+	again, created_again = EmployeeSnapshots.capture(org, 'manual')
+
+	assert created and not created_again
+	assert again.id == first.id
+	assert first.employee_count == 4
+	assert [row[EmployeeSnapshots.EMAIL] for row in EmployeeSnapshots.load(first)] == [f'E{n}@X.COM' for n in range(1, 5)]
+
+
+def test_diff(org):
+	before, _ = EmployeeSnapshots.capture(org, 'manual')
+	org.query(Employees).filter(Employees.employee_email == 'E1@X.COM').delete()
+	org.query(Employees).filter(Employees.employee_email == 'E2@X.COM').update({Employees.manager_email: 'E3@X.COM'})
+	add(org, 5, 'E5@X.COM')
+	add(org, 6, 'E6@X.COM')
+	org.flush()
+	after, _ = EmployeeSnapshots.capture(org, 'manual')
+
+	diff = EmployeeSnapshots.diff(EmployeeSnapshots.load(before), EmployeeSnapshots.load(after), limit=1)
+
+	assert (diff['added_count'], diff['removed_count'], diff['changed_count']) == (2, 1, 1)
+	assert len(diff['added']) == 1  # limitado; a contagem continua completa
+	assert diff['removed'][0]['employee_email'] == 'E1@X.COM'
+	assert diff['changed'] == [{'employee_email': 'E2@X.COM', 'changes': {'manager_email': ['BOSS@X.COM', 'E3@X.COM']}}]
+
+
+def test_restore_is_set_based_and_keeps_unchanged_ids(org):
+	snapshot, _ = EmployeeSnapshots.capture(org, 'manual')
+	original = table(org)
+
+	# remove, altera (inclusive troca de employee_id entre dois registros) e adiciona
+	org.query(Employees).filter(Employees.employee_email == 'E1@X.COM').delete()
+	org.query(Employees).filter(Employees.employee_email.in_(['E2@X.COM', 'E3@X.COM'])).update({Employees.employee_id: None})
+	org.query(Employees).filter(Employees.employee_email == 'E2@X.COM').update({Employees.employee_id: 3, Employees.hire_date: date(2020, 5, 5)})
+	org.query(Employees).filter(Employees.employee_email == 'E3@X.COM').update({Employees.employee_id: 2})
+	add(org, 9, 'E9@X.COM')
+	org.commit()
+
+	counts = EmployeeSnapshots.restore(org, snapshot)
+	org.commit()
+
+	assert counts == {'inserted': 1, 'updated': 2, 'deleted': 1}
+	restored = table(org)
+	assert {email: row[1:] for email, row in restored.items()} == {email: row[1:] for email, row in original.items()}
+	# registros que não mudaram (ou só foram atualizados) mantêm o id; só o reinserido ganha um novo
+	assert all(restored[email][0] == original[email][0] for email in ('E2@X.COM', 'E3@X.COM', 'E4@X.COM'))
+	assert EmployeeSnapshots.capture(org, 'manual')[0].id == snapshot.id
@@ -0,0 +1,210 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from models import Employees, CalendarFanoutJob, JobStatus
+from utils.calendar_utils import CalendarPayload
+from utils.email_outbox import EmailOutboxDispatcher, utcnow
+from utils.mail_e_client import MailEClient
+
+
+class CalendarFanout:
+	"""Envia o calendário de aniversários de equipe para todos os gestores da empresa"""
+
+	def __init__(self, session_factory, client: MailEClient, concurrency: int = 8, progress_interval: float = 1):
+		"""
+		Args:
+			session_factory: Fábrica de sessões do banco (SessionLocal)
+			client: Cliente do Mail-E usado para os envios
+			concurrency: Quantidade máxima de envios simultâneos ao Mail-E
+			progress_interval: Segundos entre as gravações do progresso no banco
+		"""
+		self.session_factory = session_factory
+		self.client = client
+		self.concurrency = concurrency
+		self.progress_interval = progress_interval
+		# mantém referência às tarefas em andamento (evita que sejam coletadas)
+		self._tasks = set()
+
+	def start(self, db: Session, started_by: Optional[str] = None) -> CalendarFanoutJob:
+		"""
+		Cria o registro do job e agenda a execução em background
+
+		Args:
+			db: Sessão do banco de dados
+			started_by: E-mail do usuário que disparou o job
+
+		Returns:
+			Registro do job (para consulta de progresso)
+		"""
+		job = CalendarFanoutJob(
+			status=JobStatus.running.value,
+			started_by=started_by,
+			started_at=utcnow()
+		)
+		db.add(job)
+		db.commit()
+		db.refresh(job)
+
+		task = asyncio.create_task(self.run(job.id, started_by))
+		self._tasks.add(task)
+		task.add_done_callback(self._tasks.discard)
+		return job
+
+	async def run(self, job_id: int, started_by: Optional[str] = None):
+		"""
+		Executa o job: uma leitura da tabela employees e um envio por gestor. Os workers só
+		enviam no event loop; todo trabalho no banco roda em threads, cada um com sua sessão.
+		"""
+		progress = {'processed': 0, 'sent': 0, 'queued_for_retry': 0, 'total_employees': 0, 'last_error': None}
+		save_lock = asyncio.Lock()
+
+		async def save(values: dict):
+			# uma gravação por vez: um progresso mais antigo nunca sobrescreve um mais novo
+			async with save_lock:
+				await asyncio.to_thread(self._in_session, self._update_job, job_id, values)
+
+		try:
+			# leitura e montagem dos payloads rodam em threads: o event loop continua atendendo as outras requisições
+			entries, children = await asyncio.to_thread(self._in_session, self.load_org)
+			managers = list(children.keys())
+			await save({'total_managers': len(managers)})
+
+			pending = iter(managers)
+			last_flush = time.monotonic()
+
+			async def worker():
+				nonlocal last_flush
+				for manager_email in pending:
+					aniversarios, payload = await asyncio.to_thread(self.build_payload, manager_email, entries, children)
+					try:
+						# só conta como enviado o que o Mail-E confirmou (STATUS OK)
+						MailEClient.ensure_ok(await self.client.send(payload))
+						progress['sent'] += 1
+					except Exception as e:
+						# falhas e respostas de erro vão para a outbox, que cuida das novas tentativas
+						await asyncio.to_thread(
+							self._in_session, EmailOutboxDispatcher.enqueue, payload, started_by, len(aniversarios)
+						)
+						progress['queued_for_retry'] += 1
+						progress['last_error'] = f'{manager_email}: {type(e).__name__}: {e}'[:500]
+					progress['processed'] += 1
+					progress['total_employees'] += len(aniversarios)
+
+					if time.monotonic() - last_flush >= self.progress_interval:
+						last_flush = time.monotonic()
+						await save(dict(progress))
+
+			await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+			progress['status'] = JobStatus.done.value
+		except Exception as e:
+			progress['status'] = JobStatus.failed.value
+			progress['last_error'] = f'{type(e).__name__}: {e}'[:500]
+		finally:
+			progress['finished_at'] = utcnow()
+			await save(progress)
+
+	def _in_session(self, work: Callable, *args):
+		"""Roda work(db, *args) em uma sessão própria e faz o commit - chamar via asyncio.to_thread"""
+		db = self.session_factory()
+		try:
+			result = work(db, *args)
+			db.commit()
+			return result
+		finally:
+			db.close()
+
+	@staticmethod
+	def _update_job(db: Session, job_id: int, values: dict):
+		db.query(CalendarFanoutJob).filter(CalendarFanoutJob.id == job_id).update(values, synchronize_session=False)
+
+	@staticmethod
+	def load_org(db: Session) -> tuple:
+		"""
+		Lê a tabela employees uma única vez
+
+		Returns:
+			Tupla (entradas ANIVERSARIOS por funcionário, mapa e-mail do gestor -> índices dos subordinados diretos)
+		"""
+		rows = db.query(
+			Employees.employee_name,
+			Employees.employee_email,
+			Employees.hire_date,
+			Employees.manager_email
+		).all()
+
+		entries = []
+		children: Dict[str, List[int]] = {}
+		for index, (name, email, hire_date, manager_email) in enumerate(rows):
+			# cada entrada é formatada uma vez e compartilhada entre os payloads de todos os gestores acima
+			entries.append((email, CalendarPayload.aniversario(name, email, hire_date)))
+			children.setdefault(manager_email, []).append(index)
+
+		return entries, children
+
+	@staticmethod
+	def build_payload(manager_email: str, entries: list, children: Dict[str, List[int]]) -> tuple:
+		"""Retorna (entradas ANIVERSARIOS da equipe, payload completo do Mail-E) de um gestor"""
+		aniversarios = CalendarFanout.subtree(manager_email, entries, children)
+		return aniversarios, CalendarPayload.build(manager_email, aniversarios)
+
+	@staticmethod
+	def subtree(manager_email: str, entries: list, children: Dict[str, List[int]]) -> List[dict]:
+		"""
+		Percorre (em pré-ordem, sem recursão) todos os funcionários abaixo de um gestor
+
+		Args:
+			manager_email: E-mail do gestor
+			entries: Entradas retornadas por load_org
+			children: Mapa de subordinados diretos retornado por load_org
+
+		Returns:
+			Lista de entradas ANIVERSARIOS da equipe inteira do gestor
+		"""
+		aniversarios = []
+		visited_emails = {manager_email}  # Para evitar loops infinitos
+		stack = [iter(children.get(manager_email, []))]
+
+		while stack:
+			index = next(stack[-1], None)
+			if index is None:
+				stack.pop()
+				continue
+
+			email, entry = entries[index]
+			if email in visited_emails:
+				continue
+			visited_emails.add(email)
+			aniversarios.append(entry)
+
+			if email in children:
+				stack.append(iter(children[email]))
+
+		return aniversarios
+
+	@staticmethod
+	def progress(job: CalendarFanoutJob) -> dict:
+		"""Resumo do progresso e da vazão do job"""
+		end = job.finished_at or utcnow()
+		elapsed = max((end - job.started_at).total_seconds(), 0.001)
+		rate = job.processed / elapsed
+		remaining = job.total_managers - job.processed
+
+		return {
+			'job_id': job.id,
+			'status': job.status,
+			'total_managers': job.total_managers,
+			'processed': job.processed,
+			'sent': job.sent,
+			'queued_for_retry': job.queued_for_retry,
+			'total_employees': job.total_employees,
+			'percent': round(100 * job.processed / job.total_managers, 1) if job.total_managers else 0,
+			'elapsed_seconds': round(elapsed, 1),
+			'managers_per_second': round(rate, 2),
+			'eta_seconds': round(remaining / rate, 1) if rate and job.status == JobStatus.running.value else None,
+			'last_error': job.last_error,
+			'started_at': job.started_at,
+			'finished_at': job.finished_at
+		}
@@ -0,0 +1,226 @@
+import json
+from calendar import isleap
+from datetime import datetime, date, timedelta
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+
+class CalendarPayload:
+	"""Classe para montar o payload ServiceAwardCalendar enviado ao Mail-E"""
+
+	CONTENT = 'ServiceAwardCalendar'
+
+	@staticmethod
+	def format_date(hire_date: Any) -> str:
+		"""
+		Converte a data de admissão para DD/MM/YYYY
+
+		Args:
+			hire_date: Data (date, datetime ou string YYYY-MM-DD)
+
+		Returns:
+			Data formatada ou string vazia se não houver data
+		"""
+		if not hire_date:
+			return ''
+		# Se já é objeto date/datetime, converte direto
+		if isinstance(hire_date, (datetime, date)):
+			return hire_date.strftime('%d/%m/%Y')
+		# Se é string, faz parse primeiro
+		if isinstance(hire_date, str):
+			return datetime.strptime(hire_date, '%Y-%m-%d').strftime('%d/%m/%Y')
+		return ''
+
+	@staticmethod
+	def aniversario(employee_name: str, employee_email: str, hire_date: Any) -> dict:
+		"""Monta a entrada de um funcionário na lista ANIVERSARIOS"""
+		return {
+			"NOME": employee_name or '',
+			"EMAIL": employee_email or '',
+			"DATA": CalendarPayload.format_date(hire_date)
+		}
+
+	@staticmethod
+	def build(destinatario: str, aniversarios: List[dict]) -> dict:
+		"""Monta o payload completo para o Mail-E"""
+		return {
+			"CONTENT": CalendarPayload.CONTENT,
+			"DESTINATARIO": destinatario,
+			"ANIVERSARIOS": aniversarios
+		}
+
+	@staticmethod
+	def iter_json(destinatario: str, rows: Iterable[tuple], chunk_size: int = 500) -> Iterator[str]:
+		"""
+		Serializa o payload em pedaços de texto, sem montar a lista de dicionários em memória.
+		Os pedaços concatenados são idênticos a json.dumps(CalendarPayload.build(...)).
+
+		Args:
+			destinatario: E-mail que vai receber o calendário
+			rows: Tuplas (employee_name, employee_email, hire_date)
+			chunk_size: Quantidade de funcionários por pedaço gerado
+
+		Returns:
+			Iterador de pedaços do JSON
+		"""
+		header = '{"CONTENT": %s, "DESTINATARIO": %s, "ANIVERSARIOS": [' % (
+			json.dumps(CalendarPayload.CONTENT),
+			json.dumps(destinatario)
+		)
+		yield header
+
+		# muitas pessoas compartilham a mesma data de admissão: cada data é formatada uma vez só
+		formatted_dates = {}
+		encode = json.dumps
+		parts = []
+		first = True
+		for name, email, hire_date in rows:
+			formatted = formatted_dates.get(hire_date)
+			if formatted is None:
+				formatted = formatted_dates[hire_date] = encode(CalendarPayload.format_date(hire_date))
+
+			parts.append('{"NOME": %s, "EMAIL": %s, "DATA": %s}' % (encode(name or ''), encode(email or ''), formatted))
+			if len(parts) >= chunk_size:
+				yield ('' if first else ', ') + ', '.join(parts)
+				first = False
+				parts = []
+
+		if parts:
+			yield ('' if first else ', ') + ', '.join(parts)
+
+		yield ']}'
+
+
+class AnniversaryICS:
+	"""Calendário iCalendar (RFC 5545) com os próximos aniversários de empresa de uma equipe"""
+
+	PRODID = '-//Service Award//Aniversarios de empresa//PT'
+	REFRESH = 'PT1H'  # intervalo de atualização sugerido aos clientes de calendário
+	LINE_LIMIT = 75  # octetos por linha; as maiores continuam na linha seguinte (iniciada por espaço)
+
+	@staticmethod
+	def escape(text: str) -> str:
+		"""Escapa um valor TEXT (barra invertida, ponto e vírgula, vírgula e quebras de linha)"""
+		return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+			.replace('\r\n', '\\n').replace('\n', '\\n'))
+
+	@staticmethod
+	def fold(line: str) -> str:
+		"""Quebra a linha em pedaços de até 75 octetos sem partir caracteres UTF-8, terminando em CRLF"""
+		encoded = line.encode('utf-8')
+		if len(encoded) <= AnniversaryICS.LINE_LIMIT:
+			return line + '\r\n'
+
+		parts = []
+		start = 0
+		limit = AnniversaryICS.LINE_LIMIT
+		while start < len(encoded):
+			end = min(start + limit, len(encoded))
+			# recua até o início de um caractere (bytes de continuação são 10xxxxxx)
+			while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+				end -= 1
+			parts.append(encoded[start:end].decode('utf-8'))
+			start = end
+			limit = AnniversaryICS.LINE_LIMIT - 1  # o espaço da continuação conta
+		return '\r\n '.join(parts) + '\r\n'
+
+	@staticmethod
+	def next_anniversary(hire_date: date, start: date) -> date:
+		"""
+		Próximo aniversário de empresa a partir de start (inclusive)
+
+		Args:
+			hire_date: Data de admissão
+			start: Primeiro dia considerado
+
+		Returns:
+			Data do aniversário; quem entrou em 29/02 comemora em 28/02 nos anos não bissextos
+		"""
+		def in_year(year: int) -> date:
+			if hire_date.month == 2 and hire_date.day == 29 and not isleap(year):
+				return date(year, 2, 28)
+			return hire_date.replace(year=year)
+
+		anniversary = in_year(start.year)
+		return anniversary if anniversary >= start else in_year(start.year + 1)
+
+	@staticmethod
+	def iter_ics(manager_email: str, rows: Iterable[tuple], start: date, days: int,
+				 milestone_years: Optional[Sequence[int]] = None, chunk_size: int = 500) -> Iterator[bytes]:
+		"""
+		Gera o calendário em pedaços, um VEVENT (dia inteiro) por aniversário dentro da janela,
+		sem montar a lista da equipe em memória. A saída só depende das linhas e da janela,
+		então o mesmo conteúdo sempre gera os mesmos bytes (o ETag da rota vale para o corpo).
+
+		Args:
+			manager_email: Gestor dono do calendário (entra no nome do calendário)
+			rows: Tuplas (employee_name, employee_email, hire_date)
+			start: Primeiro dia da janela
+			days: Tamanho da janela em dias (até 366: no máximo um aniversário por pessoa)
+			milestone_years: Se informado, só os aniversários com estes anos de empresa
+			chunk_size: Quantidade de eventos por pedaço gerado
+
+		Returns:
+			Iterador de pedaços (bytes) do arquivo .ics
+		"""
+		fold = AnniversaryICS.fold
+		escape = AnniversaryICS.escape
+		end = start + timedelta(days=days)
+		milestones = set(milestone_years) if milestone_years else None
+		dtstamp = start.strftime('%Y%m%dT000000Z')
+
+		header = [
+			'BEGIN:VCALENDAR',
+			'VERSION:2.0',
+			'PRODID:' + AnniversaryICS.PRODID,
+			'CALSCALE:GREGORIAN',
+			'METHOD:PUBLISH',
+			'X-WR-CALNAME:' + escape(f'Aniversários de empresa - {manager_email}'),
+			'REFRESH-INTERVAL;VALUE=DURATION:' + AnniversaryICS.REFRESH,
+			'X-PUBLISHED-TTL:' + AnniversaryICS.REFRESH
+		]
+		yield ''.join(fold(line) for line in header).encode('utf-8')
+
+		# muitas pessoas compartilham a mesma data de admissão: a parte do evento que depende só da data é montada uma vez
+		by_hire_date = {}
+		parts = []
+		for name, email, hire_date in rows:
+			if not hire_date:
+				continue
+			event_dates = by_hire_date.get(hire_date)
+			if event_dates is None:
+				anniversary = AnniversaryICS.next_anniversary(hire_date, start)
+				years = anniversary.year - hire_date.year
+				if anniversary >= end or years < 1 or (milestones is not None and years not in milestones):
+					event_dates = by_hire_date[hire_date] = ()
+				else:
+					event_dates = by_hire_date[hire_date] = (
+						years,
+						'DTSTART;VALUE=DATE:' + anniversary.strftime('%Y%m%d') + '\r\n'
+						+ 'DTEND;VALUE=DATE:' + (anniversary + timedelta(days=1)).strftime('%Y%m%d') + '\r\n',
+						anniversary.year,
+						escape('Admissão em ' + CalendarPayload.format_date(hire_date))
+					)
+			if not event_dates:
+				continue
+
+			years, dates, year, description = event_dates
+			label = name or email
+			parts.append(
+				'BEGIN:VEVENT\r\n'
+				# um UID por pessoa e ano: o cliente atualiza o evento em vez de duplicá-lo a cada consulta
+				+ fold(f'UID:{year}-{email}@service-award')
+				+ 'DTSTAMP:' + dtstamp + '\r\n'
+				+ dates
+				+ fold('SUMMARY:' + escape(f'{label} - {years} {"ano" if years == 1 else "anos"} de empresa'))
+				+ fold('DESCRIPTION:' + description)
+				+ 'TRANSP:TRANSPARENT\r\n'
+				+ 'END:VEVENT\r\n'
+			)
+			if len(parts) >= chunk_size:
+				yield ''.join(parts).encode('utf-8')
+				parts = []
+
+		if parts:
+			yield ''.join(parts).encode('utf-8')
+
+		yield b'END:VCALENDAR\r\n'
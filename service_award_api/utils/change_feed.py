@@ -0,0 +1,135 @@
+from typing import List, Tuple
+
+from sqlalchemy import event, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from models import EmployeeChange, Employees
+from utils.email_outbox import utcnow
+
+
+class ChangeFeed:
+	"""
+	Log de alterações dos funcionários (INSERT/UPDATE/DELETE) com seq crescente, gravado na mesma
+	transação de cada escrita. Consumidores guardam o último seq visto e pedem só o que mudou depois.
+	"""
+
+	INSERT = 'INSERT'
+	UPDATE = 'UPDATE'
+	DELETE = 'DELETE'
+
+	DEFAULT_PAGE_SIZE = 1000
+	MAX_PAGE_SIZE = 10000
+
+	@staticmethod
+	def install_events():
+		"""
+		Registra os eventos de sessão: after_flush cobre add/alteração/delete de objetos (endpoints e
+		upload do Excel), do_orm_execute cobre query.update(), query.delete() e inserts em massa com
+		um único INSERT ... SELECT, sem carregar os registros
+		"""
+		if event.contains(Session, 'after_flush', ChangeFeed._after_flush):
+			return
+		event.listen(Session, 'after_flush', ChangeFeed._after_flush)
+		event.listen(Session, 'do_orm_execute', ChangeFeed._do_orm_execute)
+
+	@staticmethod
+	def _after_flush(session: Session, flush_context):
+		changes = []
+		for obj in session.new:
+			if isinstance(obj, Employees):
+				changes.append((ChangeFeed.INSERT, obj))
+		for obj in session.dirty:
+			if isinstance(obj, Employees) and session.is_modified(obj):
+				changes.append((ChangeFeed.UPDATE, obj))
+		for obj in session.deleted:
+			if isinstance(obj, Employees):
+				changes.append((ChangeFeed.DELETE, obj))
+
+		if changes:
+			now = utcnow()
+			session.connection().execute(insert(EmployeeChange), [
+				{'operation': operation, 'employee_pk': obj.id, 'employee_email': obj.employee_email, 'changed_at': now}
+				for operation, obj in changes
+			])
+
+	@staticmethod
+	def _record_matching(connection, operation: str, whereclause):
+		"""Registra, em um único INSERT ... SELECT, todos os funcionários que satisfazem o filtro"""
+		source = select(literal(operation), Employees.id, Employees.employee_email, literal(utcnow()))
+		if whereclause is not None:
+			source = source.where(whereclause)
+		connection.execute(
+			insert(EmployeeChange).from_select(
+				['operation', 'employee_pk', 'employee_email', 'changed_at'], source.order_by(Employees.id)
+			)
+		)
+
+	@staticmethod
+	def _do_orm_execute(orm_execute_state):
+		if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+			return
+
+		mapper = orm_execute_state.bind_mapper
+		if mapper is None or mapper.local_table is not Employees.__table__:
+			return
+
+		connection = orm_execute_state.session.connection()
+		statement = orm_execute_state.statement
+
+		if orm_execute_state.is_insert:
+			dialect = connection.dialect
+			if not statement._returning and dialect.insert_returning and dialect.insert_executemany_returning:
+				# ids dos inserts em massa só existem depois do INSERT: o próprio INSERT devolve (RETURNING) o que criou
+				frozen = orm_execute_state.invoke_statement(
+					statement=statement.returning(Employees.id, Employees.employee_email)
+				).freeze()
+				now = utcnow()
+				created = frozen().all()
+				if created:
+					connection.execute(insert(EmployeeChange), [
+						{'operation': ChangeFeed.INSERT, 'employee_pk': pk, 'employee_email': email, 'changed_at': now}
+						for pk, email in created
+					])
+				return frozen()
+
+			# sem RETURNING: registra o que passou do maior id anterior (em bancos com escrita concorrente
+			# pode incluir linhas de outras transações - só acontece em dialetos antigos)
+			max_id_before = connection.execute(select(func.coalesce(func.max(Employees.id), 0))).scalar()
+			result = orm_execute_state.invoke_statement()
+			ChangeFeed._record_matching(connection, ChangeFeed.INSERT, Employees.id > max_id_before)
+			return result
+
+		# UPDATE/DELETE: registra antes de executar, enquanto o filtro ainda enxerga os valores antigos
+		operation = ChangeFeed.UPDATE if orm_execute_state.is_update else ChangeFeed.DELETE
+		parameters = orm_execute_state.parameters
+		if isinstance(parameters, list) and statement.whereclause is None:
+			# update em massa pela chave primária (lista de {'id': ..., campo: valor}): só os ids da lista
+			ChangeFeed._record_matching(connection, operation, Employees.id.in_([row['id'] for row in parameters]))
+		else:
+			ChangeFeed._record_matching(connection, operation, statement.whereclause)
+
+	@staticmethod
+	def changes_since(db: Session, since: int, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[tuple], bool]:
+		"""
+		Alterações com seq maior que `since`, na ordem em que aconteceram
+
+		Args:
+			db: Sessão do banco de dados
+			since: Último seq já processado pelo consumidor (0 = desde o início)
+			limit: Máximo de alterações na página
+
+		Returns:
+			([(EmployeeChange, Employees ou None)], has_more). O funcionário é o estado atual do
+			registro; None quando ele não existe mais (um DELETE aparece mais adiante no log)
+		"""
+		rows = db.query(EmployeeChange, Employees).outerjoin(
+			Employees, Employees.id == EmployeeChange.employee_pk
+		).filter(
+			EmployeeChange.seq > since
+		).order_by(EmployeeChange.seq).limit(limit + 1).all()
+
+		return rows[:limit], len(rows) > limit
+
+	@staticmethod
+	def last_seq(db: Session) -> int:
+		return db.execute(select(func.coalesce(func.max(EmployeeChange.seq), 0))).scalar()
@@ -0,0 +1,238 @@
+import asyncio
+import logging
+from calendar import isleap
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import and_, extract, func, or_, select
+from sqlalchemy.orm import Session
+
+from models import Employees, DigestSchedule, ScheduleFrequency
+from utils.calendar_utils import AnniversaryICS, CalendarPayload
+from utils.email_outbox import EmailOutboxDispatcher, utcnow
+from utils.employee_utils import EmployeeHierarchy
+
+logger = logging.getLogger(__name__)
+
+
+class AnniversaryDigest:
+	"""Classe para buscar os aniversários de empresa que estão chegando"""
+
+	@staticmethod
+	def window_days(start: date, days_ahead: int) -> List[tuple]:
+		"""
+		Lista os (mês, dia) da janela - quem entrou em 29/02 comemora em 28/02 nos anos não bissextos
+
+		Args:
+			start: Primeiro dia da janela
+			days_ahead: Quantidade de dias da janela
+
+		Returns:
+			Lista de tuplas (mês, dia)
+		"""
+		days = []
+		for offset in range(days_ahead):
+			day = start + timedelta(days=offset)
+			days.append((day.month, day.day))
+			if day.month == 2 and day.day == 28 and not isleap(day.year):
+				days.append((2, 29))
+		return days
+
+	@staticmethod
+	def upcoming(db: Session, start: date, days_ahead: int, manager_email: Optional[str] = None) -> List[tuple]:
+		"""
+		Busca quem completa anos de empresa na janela, filtrando mês/dia no próprio banco
+
+		Args:
+			db: Sessão do banco de dados
+			start: Primeiro dia da janela
+			days_ahead: Quantidade de dias da janela
+			manager_email: Se informado, considera apenas a equipe deste gestor
+
+		Returns:
+			Lista de tuplas (employee_name, employee_email, hire_date), na ordem das datas de aniversário
+		"""
+		if manager_email:
+			source = EmployeeHierarchy.subtree_query(manager_email).subquery()
+		else:
+			source = select(Employees.employee_name, Employees.employee_email, Employees.hire_date).subquery()
+
+		hire_date = source.c.hire_date
+		in_window = or_(*(
+			and_(extract('month', hire_date) == month, extract('day', hire_date) == day)
+			for month, day in AnniversaryDigest.window_days(start, days_ahead)
+		))
+
+		rows = db.execute(
+			select(source.c.employee_name, source.c.employee_email, hire_date).where(in_window)
+		).all()
+
+		# data real do aniversário dentro da janela (que pode virar o ano): quem ainda não completa 1 ano fica de fora
+		end = start + timedelta(days=days_ahead)
+		upcoming = []
+		for row in rows:
+			if row[2] is None:
+				continue
+			anniversary = AnniversaryICS.next_anniversary(row[2], start)
+			if anniversary < end and anniversary.year - row[2].year >= 1:
+				upcoming.append((anniversary, tuple(row)))
+		upcoming.sort(key=lambda item: (item[0], item[1][1]))
+		return [row for _, row in upcoming]
+
+
+class DigestScheduler:
+	"""Agendador leve, persistido no banco, dos resumos diários/semanais de aniversários"""
+
+	def __init__(self, session_factory, on_enqueue: Optional[Callable[[], None]] = None, max_sleep: float = 60):
+		"""
+		Args:
+			session_factory: Fábrica de sessões do banco (SessionLocal)
+			on_enqueue: Chamado após gravar resumos na outbox (ex.: acordar o dispatcher)
+			max_sleep: Segundos máximos entre verificações do próximo disparo
+		"""
+		self.session_factory = session_factory
+		self.on_enqueue = on_enqueue
+		self.max_sleep = max_sleep
+		self._task: Optional[asyncio.Task] = None
+		self._wakeup: Optional[asyncio.Event] = None
+
+	@staticmethod
+	def compute_next_run(schedule: DigestSchedule, after: datetime) -> datetime:
+		"""
+		Calcula o próximo disparo no horário local do servidor
+
+		Args:
+			schedule: Agenda (frequência, hora, minuto e dia da semana)
+			after: Momento de referência (UTC, sem timezone)
+
+		Returns:
+			Próximo disparo em UTC, sem timezone (formato gravado no banco)
+		"""
+		local_now = after.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+		candidate = local_now.replace(hour=schedule.hour, minute=schedule.minute, second=0, microsecond=0)
+
+		if schedule.frequency == ScheduleFrequency.weekly.value:
+			candidate += timedelta(days=(schedule.weekday - candidate.weekday()) % 7)
+			if candidate <= local_now:
+				candidate += timedelta(days=7)
+		elif candidate <= local_now:
+			candidate += timedelta(days=1)
+
+		# datetime sem timezone em .astimezone() é interpretado no horário local (respeita horário de verão)
+		return candidate.astimezone(timezone.utc).replace(tzinfo=None)
+
+	def start(self):
+		"""Inicia o agendador no event loop atual"""
+		if self._task is None:
+			self._wakeup = asyncio.Event()
+			self._task = asyncio.create_task(self.run())
+
+	async def stop(self):
+		if self._task is not None:
+			self._task.cancel()
+			try:
+				await self._task
+			except asyncio.CancelledError:
+				pass
+			self._task = None
+
+	def wake(self):
+		"""Acorda o agendador (ex.: agenda criada ou alterada neste worker)"""
+		if self._wakeup is not None:
+			self._wakeup.set()
+
+	async def run(self):
+		"""Laço principal: dorme até o próximo disparo - uma consulta indexada por ciclo"""
+		while True:
+			try:
+				# consulta da empresa inteira e commits em uma thread: o event loop segue atendendo requisições
+				next_run_at, enqueued = await asyncio.to_thread(self.run_due)
+			except Exception:
+				logger.exception('Erro no agendador de resumos')
+				next_run_at, enqueued = None, False
+
+			# de volta ao event loop: on_enqueue (ex.: acordar o dispatcher) não é seguro a partir da thread
+			if enqueued and self.on_enqueue:
+				self.on_enqueue()
+
+			sleep_for = self.max_sleep
+			if next_run_at is not None:
+				sleep_for = min(self.max_sleep, max(0, (next_run_at - utcnow()).total_seconds()))
+
+			try:
+				await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+			except asyncio.TimeoutError:
+				pass
+			self._wakeup.clear()
+
+	def run_due(self) -> Tuple[Optional[datetime], bool]:
+		"""
+		Dispara as agendas vencidas. Faz I/O no banco - chamar fora do event loop.
+
+		Returns:
+			Tupla (próximo disparo pendente em UTC ou None se não houver agendas ativas,
+			True se algum resumo foi gravado na outbox)
+		"""
+		db = self.session_factory()
+		try:
+			now = utcnow()
+			due = db.query(DigestSchedule).filter(
+				DigestSchedule.is_active == True,
+				DigestSchedule.next_run_at <= now
+			).all()
+
+			# guarda o next_run_at lido agora: depois de cada commit os objetos são recarregados do banco
+			due = [(schedule, schedule.next_run_at) for schedule in due]
+
+			enqueued = False
+			for schedule, scheduled_for in due:
+				enqueued = self._fire(db, schedule, scheduled_for, now) or enqueued
+
+			next_run_at = db.query(func.min(DigestSchedule.next_run_at)).filter(DigestSchedule.is_active == True).scalar()
+			return next_run_at, enqueued
+		finally:
+			db.close()
+
+	def _fire(self, db: Session, schedule: DigestSchedule, scheduled_for: datetime, now: datetime) -> bool:
+		"""
+		Reserva o disparo com um UPDATE condicional e grava o resumo na outbox na mesma transação:
+		se outro worker já reservou este disparo, nada é enviado (sem duplicidade)
+
+		Returns:
+			True se um e-mail foi adicionado à outbox
+		"""
+		claimed = db.query(DigestSchedule).filter(
+			DigestSchedule.id == schedule.id,
+			DigestSchedule.next_run_at == scheduled_for
+		).update({
+			DigestSchedule.next_run_at: self.compute_next_run(schedule, now),
+			DigestSchedule.last_run_at: now
+		}, synchronize_session=False)
+
+		if not claimed:
+			db.rollback()
+			return False
+
+		try:
+			today = now.replace(tzinfo=timezone.utc).astimezone().date()
+			rows = AnniversaryDigest.upcoming(db, today, schedule.days_ahead, schedule.manager_email)
+
+			if rows:
+				payload = CalendarPayload.build(
+					schedule.destinatario,
+					[CalendarPayload.aniversario(name, email, hire_date) for name, email, hire_date in rows]
+				)
+				EmailOutboxDispatcher.enqueue(db, payload, requested_by=schedule.created_by, total_employees=len(rows))
+				result = f'{len(rows)} aniversário(s) enviado(s) para a fila'
+			else:
+				result = 'Nenhum aniversário na janela'
+		except Exception as e:
+			result = f'Erro: {type(e).__name__}: {e}'[:500]
+			rows = []
+
+		db.query(DigestSchedule).filter(DigestSchedule.id == schedule.id).update(
+			{DigestSchedule.last_result: result},
+			synchronize_session=False
+		)
+		db.commit()
+		return bool(rows)
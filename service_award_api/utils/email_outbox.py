@@ -0,0 +1,285 @@
+import asyncio
+import io
+import json
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from models import EmailOutbox, OutboxStatus
+from utils.mail_e_client import MailEClient
+from utils.calendar_utils import CalendarPayload
+
+logger = logging.getLogger(__name__)
+
+# caracteres do payload codificados e escritos no socket por vez
+SEND_CHUNK_CHARS = 64 * 1024
+
+def utcnow() -> datetime:
+	"""Data/hora atual em UTC sem timezone (formato gravado no banco)"""
+	return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class EmailOutboxDispatcher:
+	"""Fila persistente (outbox) de e-mails para o Mail-E, drenada em lotes por uma tarefa em background"""
+
+	def __init__(
+		self,
+		session_factory,
+		client: MailEClient,
+		batch_size: int = 20,
+		poll_interval: float = 2,
+		max_attempts: int = 6,
+		backoff_base: float = 30,
+		backoff_max: float = 3600,
+		lease_seconds: float = 120
+	):
+		"""
+		Args:
+			session_factory: Fábrica de sessões do banco (SessionLocal)
+			client: Cliente do Mail-E usado para os envios
+			batch_size: Quantidade máxima de mensagens enviadas por lote
+			poll_interval: Segundos entre as verificações quando a fila está vazia
+			max_attempts: Tentativas até a mensagem ir para DEAD
+			backoff_base: Espera (segundos) após a primeira falha - dobra a cada nova falha
+			backoff_max: Espera máxima (segundos) entre tentativas
+			lease_seconds: Tempo que uma mensagem fica reservada para um worker durante o envio
+		"""
+		self.session_factory = session_factory
+		self.client = client
+		self.batch_size = batch_size
+		self.poll_interval = poll_interval
+		self.max_attempts = max_attempts
+		self.backoff_base = backoff_base
+		self.backoff_max = backoff_max
+		self.lease_seconds = lease_seconds
+		self._task: Optional[asyncio.Task] = None
+		self._wakeup: Optional[asyncio.Event] = None
+
+	@staticmethod
+	def enqueue(db: Session, payload: dict, requested_by: Optional[str] = None, total_employees: Optional[int] = None) -> EmailOutbox:
+		"""
+		Grava o payload na outbox (o commit fica a cargo de quem chamou)
+
+		Args:
+			db: Sessão do banco de dados
+			payload: Payload completo do Mail-E (CONTENT, DESTINATARIO, ...)
+			requested_by: E-mail do usuário que pediu o envio
+			total_employees: Quantidade de funcionários incluídos no payload
+
+		Returns:
+			Registro criado na outbox
+		"""
+		now = utcnow()
+		message = EmailOutbox(
+			content=payload.get('CONTENT'),
+			destinatario=payload.get('DESTINATARIO'),
+			payload=json.dumps(payload),
+			total_employees=total_employees,
+			requested_by=requested_by,
+			status=OutboxStatus.pending.value,
+			attempts=0,
+			next_attempt_at=now,
+			created_at=now
+		)
+		db.add(message)
+		return message
+
+	@staticmethod
+	def enqueue_calendar(db: Session, destinatario: str, rows: Iterable[tuple], requested_by: Optional[str] = None) -> Optional[EmailOutbox]:
+		"""
+		Grava na outbox o calendário de uma equipe, serializado em pedaços (CalendarPayload.iter_json)
+		direto em um buffer de texto, sem montar a lista de dicionários. A equipe fica congelada como estava no pedido: novas
+		tentativas enviam exatamente o que foi contado. Faz I/O no banco - chamar fora do event loop.
+
+		Args:
+			db: Sessão do banco de dados
+			destinatario: E-mail que vai receber o calendário
+			rows: Tuplas (employee_name, employee_email, hire_date) da equipe
+			requested_by: E-mail do usuário que pediu o envio
+
+		Returns:
+			Registro criado na outbox (o commit fica a cargo de quem chamou) ou None se a equipe estiver vazia
+		"""
+		total_employees = 0
+
+		def counted(rows):
+			nonlocal total_employees
+			for row in rows:
+				total_employees += 1
+				yield row
+
+		# um único buffer de texto cresce pedaço a pedaço: o payload fica pronto sem cópias intermediárias
+		buffer = io.StringIO()
+		for chunk in CalendarPayload.iter_json(destinatario, counted(rows)):
+			buffer.write(chunk)
+		if not total_employees:
+			return None
+
+		now = utcnow()
+		message = EmailOutbox(
+			content=CalendarPayload.CONTENT,
+			destinatario=destinatario,
+			payload=buffer.getvalue(),
+			total_employees=total_employees,
+			requested_by=requested_by,
+			status=OutboxStatus.pending.value,
+			attempts=0,
+			next_attempt_at=now,
+			created_at=now
+		)
+		db.add(message)
+		return message
+
+	def start(self):
+		"""Inicia a tarefa de envio no event loop atual"""
+		if self._task is None:
+			self._wakeup = asyncio.Event()
+			self._task = asyncio.create_task(self.run())
+
+	async def stop(self):
+		if self._task is not None:
+			self._task.cancel()
+			try:
+				await self._task
+			except asyncio.CancelledError:
+				pass
+			self._task = None
+		self.client.close()
+
+	def wake(self):
+		"""Acorda o dispatcher (ex.: logo após enfileirar uma mensagem neste worker)"""
+		if self._wakeup is not None:
+			self._wakeup.set()
+
+	async def run(self):
+		"""Laço principal: drena a outbox enquanto houver mensagens, senão espera o próximo ciclo"""
+		while True:
+			try:
+				processed = await self.drain_once()
+			except asyncio.CancelledError:
+				raise
+			except Exception:
+				logger.exception('Erro no dispatcher da outbox')
+				processed = 0
+
+			if processed:
+				continue
+
+			try:
+				await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+			except asyncio.TimeoutError:
+				pass
+			self._wakeup.clear()
+
+	async def drain_once(self) -> int:
+		"""
+		Reserva e envia um lote de mensagens vencidas
+
+		Returns:
+			Quantidade de mensagens processadas no lote
+		"""
+		db = self.session_factory()
+		try:
+			batch = self._claim_batch(db)
+			if not batch:
+				return 0
+
+			results = await asyncio.gather(
+				*(self._send(message) for message in batch),
+				return_exceptions=True
+			)
+
+			now = utcnow()
+			for message, result in zip(batch, results):
+				if isinstance(result, BaseException):
+					values = self._failure_values(message, result, now)
+				else:
+					values = {
+						EmailOutbox.status: OutboxStatus.sent.value,
+						EmailOutbox.mail_e_response: json.dumps(result),
+						EmailOutbox.sent_at: now,
+						EmailOutbox.last_error: None
+					}
+				values[EmailOutbox.claim_token] = None
+
+				# só grava se a reserva ainda é deste worker: se ela venceu no meio do envio, a mensagem já é de outro
+				db.query(EmailOutbox).filter(
+					EmailOutbox.id == message.id,
+					EmailOutbox.claim_token == message.claim_token
+				).update(values, synchronize_session=False)
+
+			db.commit()
+			return len(batch)
+		finally:
+			db.close()
+
+	async def _send(self, message: EmailOutbox) -> dict:
+		"""
+		Envia o payload gravado na outbox, como está (já é uma linha JSON), em pedaços de
+		SEND_CHUNK_CHARS caracteres - só um pedaço codificado fica em memória por vez
+
+		Raises:
+			MailEError: Sem resposta ou STATUS de erro (tratado como falha, com nova tentativa)
+		"""
+		payload = message.payload
+
+		def chunks():
+			for start in range(0, len(payload), SEND_CHUNK_CHARS):
+				yield payload[start:start + SEND_CHUNK_CHARS].encode('utf-8')
+			yield b'\n'
+
+		return MailEClient.ensure_ok(await self.client.send_stream(chunks))
+
+	def _claim_batch(self, db: Session) -> list:
+		"""
+		Reserva um lote com um único UPDATE condicional, para que dois workers nunca
+		enviem a mesma mensagem. Mensagens SENDING com reserva vencida (worker que
+		caiu no meio do envio) voltam a ser elegíveis.
+		"""
+		now = utcnow()
+		due = or_(
+			EmailOutbox.status == OutboxStatus.pending.value,
+			EmailOutbox.status == OutboxStatus.sending.value
+		)
+		due_ids = select(EmailOutbox.id).where(
+			due,
+			EmailOutbox.next_attempt_at <= now
+		).order_by(EmailOutbox.next_attempt_at).limit(self.batch_size)
+
+		token = str(uuid.uuid4())
+		claimed = db.query(EmailOutbox).filter(
+			EmailOutbox.id.in_(due_ids),
+			due,
+			EmailOutbox.next_attempt_at <= now
+		).update({
+			EmailOutbox.status: OutboxStatus.sending.value,
+			EmailOutbox.claim_token: token,
+			EmailOutbox.next_attempt_at: now + timedelta(seconds=self.lease_seconds),
+			EmailOutbox.attempts: EmailOutbox.attempts + 1
+		}, synchronize_session=False)
+		db.commit()
+
+		if not claimed:
+			return []
+		return db.query(EmailOutbox).filter(EmailOutbox.claim_token == token).all()
+
+	def _failure_values(self, message: EmailOutbox, error: BaseException, now: datetime) -> dict:
+		"""Valores gravados após uma falha: próxima tentativa com backoff exponencial ou DEAD"""
+		last_error = f'{type(error).__name__}: {error}'[:500]
+
+		if message.attempts >= self.max_attempts:
+			return {EmailOutbox.status: OutboxStatus.dead.value, EmailOutbox.last_error: last_error}
+
+		delay = min(self.backoff_max, self.backoff_base * (2 ** (message.attempts - 1)))
+		# jitter para não sincronizar as novas tentativas de um lote inteiro
+		delay *= random.uniform(0.8, 1.2)
+		return {
+			EmailOutbox.status: OutboxStatus.pending.value,
+			EmailOutbox.next_attempt_at: now + timedelta(seconds=delay),
+			EmailOutbox.last_error: last_error
+		}
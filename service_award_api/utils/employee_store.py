@@ -0,0 +1,205 @@
+import sys
+import threading
+from array import array
+from datetime import date
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Employees
+from utils.http_cache import DataVersions
+
+
+class EmployeeRecord:
+	"""Um funcionário lido do EmployeeStore (montado sob demanda, não fica guardado)"""
+
+	__slots__ = ('id', 'employee_id', 'employee_name', 'employee_email', 'hire_date', 'manager_name', 'manager_email')
+
+	def __init__(self, id, employee_id, employee_name, employee_email, hire_date, manager_name, manager_email):
+		self.id = id
+		self.employee_id = employee_id
+		self.employee_name = employee_name
+		self.employee_email = employee_email
+		self.hire_date = hire_date
+		self.manager_name = manager_name
+		self.manager_email = manager_email
+
+
+class EmployeeStore:
+	"""
+	Grafo da organização inteira em memória, em colunas: cada funcionário é um inteiro (nó), os
+	campos numéricos ficam em array() e os subordinados em listas planas no estilo CSR
+	(subordinados de n em children[child_start[n]:child_start[n + 1]]). Fora as strings, nenhum objeto por pessoa.
+	"""
+
+	__slots__ = (
+		'size', 'index', 'emails', 'names', 'manager_names', 'pks', 'employee_ids',
+		'hire_ordinals', 'parents', 'child_start', 'children', '_dates'
+	)
+
+	def __init__(self, rows: List[tuple]):
+		"""
+		Args:
+			rows: Tuplas (id, employee_id, employee_name, employee_email, hire_date, manager_name, manager_email)
+				na ordem em que os subordinados devem aparecer
+		"""
+		intern = sys.intern
+		self.size = len(rows)  # nós 0..size-1 são funcionários; os seguintes, gestores que não estão na tabela
+
+		# o e-mail de cada nó é a mesma string (interned) usada como chave do índice e como gestor dos subordinados
+		self.emails: List[str] = [intern(row[3]) for row in rows]
+		self.index: Dict[str, int] = {email: node for node, email in enumerate(self.emails)}
+		self.names: List[Optional[str]] = [row[2] for row in rows]
+		# o nome do gestor se repete em todos os subordinados: uma string só por gestor
+		self.manager_names: List[str] = [intern(row[5]) if row[5] is not None else None for row in rows]
+		self.pks = array('q', (row[0] for row in rows))
+		self.employee_ids = array('q', (row[1] or 0 for row in rows))
+		self.hire_ordinals = array('l', (row[4].toordinal() for row in rows))
+		self._dates: Dict[int, date] = {}
+
+		parents = array('l', bytes(self.size * array('l').itemsize))
+		for node, row in enumerate(rows):
+			manager = self.index.get(row[6])
+			if manager is None:
+				manager_email = intern(row[6])
+				manager = self.index[manager_email] = len(self.emails)
+				self.emails.append(manager_email)
+				self.names.append(None)
+			parents[node] = manager
+		self.parents = parents
+
+		# CSR: conta os subordinados, acumula os inícios e preenche na ordem original das linhas
+		node_count = len(self.emails)
+		child_count = array('l', bytes(node_count * array('l').itemsize))
+		for manager in parents:
+			child_count[manager] += 1
+
+		child_start = array('l', bytes((node_count + 1) * array('l').itemsize))
+		running = 0
+		for node in range(node_count):
+			child_start[node] = running
+			running += child_count[node]
+		child_start[node_count] = running
+
+		children = array('l', bytes(running * array('l').itemsize))
+		next_slot = array('l', child_start)
+		for node, manager in enumerate(parents):
+			children[next_slot[manager]] = node
+			next_slot[manager] += 1
+
+		self.child_start = child_start
+		self.children = children
+
+	@staticmethod
+	def load(db: Session) -> 'EmployeeStore':
+		"""Lê a tabela employees uma vez (ordem do id, a mesma das consultas por gestor)"""
+		rows = db.execute(select(
+			Employees.id,
+			Employees.employee_id,
+			Employees.employee_name,
+			Employees.employee_email,
+			Employees.hire_date,
+			Employees.manager_name,
+			Employees.manager_email
+		).order_by(Employees.id)).all()
+		return EmployeeStore(rows)
+
+	def hire_date(self, node: int) -> date:
+		ordinal = self.hire_ordinals[node]
+		value = self._dates.get(ordinal)
+		if value is None:
+			# muitas pessoas compartilham a data: um objeto date por dia distinto
+			value = self._dates[ordinal] = date.fromordinal(ordinal)
+		return value
+
+	def record(self, node: int) -> EmployeeRecord:
+		return EmployeeRecord(
+			self.pks[node],
+			self.employee_ids[node] or None,
+			self.names[node],
+			self.emails[node],
+			self.hire_date(node),
+			self.manager_names[node],
+			self.emails[self.parents[node]]
+		)
+
+	def iter_subtree(self, manager_email: str) -> Iterator[int]:
+		"""
+		Nós abaixo de um gestor, em pré-ordem e sem recursão; ciclos e o próprio gestor são ignorados
+
+		Args:
+			manager_email: E-mail do gestor
+
+		Returns:
+			Iterador de nós (funcionários)
+		"""
+		root = self.index.get(manager_email)
+		if root is None:
+			return
+		children, child_start = self.children, self.child_start
+		visited = {root}
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			# invertidos na pilha para sair na ordem original
+			for child in reversed(children[child_start[node]:child_start[node + 1]]):
+				if child not in visited:
+					visited.add(child)
+					stack.append(child)
+			if node != root:
+				yield node
+
+	def tree(self, manager_email: str) -> List[dict]:
+		"""Mesma estrutura de EmployeeHierarchy.get_hierarchy_tree ('hierarchy'), montada a partir da memória"""
+		root = self.index.get(manager_email)
+		if root is None:
+			return []
+		children, child_start = self.children, self.child_start
+		visited = {root}
+		hierarchy: List[dict] = []
+		stack = [(root, hierarchy)]
+		while stack:
+			node, target = stack.pop()
+			parent_email = self.emails[node]
+			for child in children[child_start[node]:child_start[node + 1]]:
+				if child in visited:
+					continue
+				visited.add(child)
+				subordinates: List[dict] = []
+				target.append({
+					'id': self.pks[child],
+					'employee_id': self.employee_ids[child] or None,
+					'employee_name': self.names[child],
+					'employee_email': self.emails[child],
+					'hire_date': self.hire_date(child),
+					'manager_name': self.manager_names[child],
+					'manager_email': parent_email,
+					'subordinates': subordinates
+				})
+				stack.append((child, subordinates))
+		return hierarchy
+
+
+class EmployeeStoreCache:
+	"""EmployeeStore por worker, remontado quando a versão 'employees' do DataVersions muda"""
+
+	def __init__(self):
+		self._version = None
+		self._store: Optional[EmployeeStore] = None
+		self._lock = threading.Lock()
+
+	def get(self, db: Session) -> EmployeeStore:
+		version = DataVersions.current(db, 'employees')
+		if self._version == version:
+			return self._store
+
+		# uma requisição remonta, as concorrentes esperam e reaproveitam
+		with self._lock:
+			if self._version != version:
+				self._store = EmployeeStore.load(db)
+				self._version = version
+			return self._store
+
+
+employee_store_cache = EmployeeStoreCache()
@@ -1,6 +1,10 @@
-from typing import List, Set
-from sqlalchemy.orm import Session
+from typing import Iterator, List, Set
+import orjson
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, aliased
 from models import Employees
+from security import EMPLOYEE_CACHE_ENABLED
+from utils.employee_store import employee_store_cache
 
 class EmployeeHierarchy:
 	"""Classe para gerenciar hierarquia de funcionários"""
@@ -15,8 +19,12 @@ class EmployeeHierarchy:
 			db: Sessão do banco de dados
 			
 		Returns:
-			Lista com todos os funcionários da hierarquia
+			Lista com todos os funcionários da hierarquia (EmployeeRecord se o cache estiver ligado)
 		"""
+		if EMPLOYEE_CACHE_ENABLED:
+			store = employee_store_cache.get(db)
+			return [store.record(node) for node in store.iter_subtree(manager_email)]
+		
 		all_employees = []
 		visited_emails = set()  # Para evitar loops infinitos
 		
@@ -57,6 +65,12 @@ class EmployeeHierarchy:
 		Returns:
 			Dicionário com a estrutura hierárquica
 		"""
+		if EMPLOYEE_CACHE_ENABLED:
+			return {
+				'manager_email': manager_email,
+				'hierarchy': employee_store_cache.get(db).tree(manager_email)
+			}
+		
 		visited_emails = set()
 		
 		def build_tree(current_manager_email: str) -> List[dict]:
@@ -92,6 +106,21 @@ class EmployeeHierarchy:
 			'hierarchy': build_tree(manager_email)
 		}
 	
+	@staticmethod
+	def get_hierarchy_tree_json(manager_email: str, db: Session) -> bytes:
+		"""
+		Retorna a árvore de get_hierarchy_tree já codificada em JSON (bytes), sem passar
+		pelo jsonable_encoder - árvores grandes são serializadas de uma vez pelo orjson
+		
+		Args:
+			manager_email: Email do gerente
+			db: Sessão do banco de dados
+			
+		Returns:
+			JSON da estrutura hierárquica
+		"""
+		return orjson.dumps(EmployeeHierarchy.get_hierarchy_tree(manager_email, db))
+	
 	@staticmethod
 	def get_hierarchy_levels(manager_email: str, db: Session) -> dict:
 		"""
@@ -142,4 +171,80 @@ class EmployeeHierarchy:
 			'manager_email': manager_email,
 			'total_levels': len(levels),
 			'levels': levels
-		}
\ No newline at end of file
+		}
+	
+	@staticmethod
+	def subtree_query(manager_email: str):
+		"""
+		Monta uma CTE recursiva com (nome, e-mail, data de admissão) de todos os
+		funcionários abaixo de um gerente - uma única consulta, sem N+1
+		
+		Args:
+			manager_email: Email do gerente
+			
+		Returns:
+			SELECT sobre a CTE (UNION descarta linhas repetidas, o que também encerra ciclos)
+		"""
+		subtree = select(
+			Employees.employee_name,
+			Employees.employee_email,
+			Employees.hire_date
+		).where(
+			Employees.manager_email == manager_email
+		).cte('subtree', recursive=True)
+		
+		subordinate = aliased(Employees)
+		subtree = subtree.union(
+			select(
+				subordinate.employee_name,
+				subordinate.employee_email,
+				subordinate.hire_date
+			).where(subordinate.manager_email == subtree.c.employee_email)
+		)
+		
+		# o próprio gerente não entra na lista, mesmo que algum ciclo chegue até ele
+		return select(subtree).where(subtree.c.employee_email != manager_email)
+	
+	@staticmethod
+	def iter_subtree_rows(manager_email: str, db: Session, batch_size: int = 1000) -> Iterator[tuple]:
+		"""
+		Percorre (nome, e-mail, data de admissão) de toda a equipe de um gerente,
+		lendo do cursor em lotes em vez de carregar tudo em memória
+		
+		Args:
+			manager_email: Email do gerente
+			db: Sessão do banco de dados
+			batch_size: Quantidade de linhas lidas por vez
+			
+		Returns:
+			Iterador de tuplas (employee_name, employee_email, hire_date)
+		"""
+		if EMPLOYEE_CACHE_ENABLED:
+			store = employee_store_cache.get(db)
+			for node in store.iter_subtree(manager_email):
+				yield (store.names[node], store.emails[node], store.hire_date(node))
+			return
+		
+		result = db.execute(
+			EmployeeHierarchy.subtree_query(manager_email).execution_options(yield_per=batch_size)
+		)
+		for row in result:
+			yield tuple(row)
+	
+	@staticmethod
+	def count_subtree(manager_email: str, db: Session) -> int:
+		"""
+		Conta os funcionários abaixo de um gerente
+		
+		Args:
+			manager_email: Email do gerente
+			db: Sessão do banco de dados
+			
+		Returns:
+			Quantidade de funcionários na hierarquia
+		"""
+		if EMPLOYEE_CACHE_ENABLED:
+			return sum(1 for _ in employee_store_cache.get(db).iter_subtree(manager_email))
+		
+		subtree = EmployeeHierarchy.subtree_query(manager_email).subquery()
+		return db.execute(select(func.count()).select_from(subtree)).scalar()
\ No newline at end of file
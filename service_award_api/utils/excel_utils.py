@@ -1,13 +1,16 @@
 from datetime import datetime
-from typing import Tuple, Optional, List, Dict, Any
-from openpyxl.worksheet.worksheet import Worksheet
+from typing import Tuple, Optional, List, Dict, Any, TYPE_CHECKING
+
+# openpyxl só é carregado no primeiro upload (ver routers/admin.py)
+if TYPE_CHECKING:
+	from openpyxl.worksheet.worksheet import Worksheet
 
 
 class ExcelProcessor:
 	"""Classe para processar arquivos Excel de funcionários"""
 	
 	@staticmethod
-	def find_header_row(sheet: Worksheet) -> Tuple[Optional[int], Optional[tuple]]:
+	def find_header_row(sheet: 'Worksheet') -> Tuple[Optional[int], Optional[tuple]]:
 		"""
 		Encontra a linha que contém os cabeçalhos
 		
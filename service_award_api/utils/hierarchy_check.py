@@ -0,0 +1,112 @@
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Employees
+
+
+class HierarchyCheck:
+	"""Validação do grafo de gestores inteiro (ciclos, órfãos, topos e profundidade) em O(n)"""
+
+	# quantos exemplos de cada problema entram no relatório (as contagens são sempre completas)
+	MAX_EXAMPLES = 50
+
+	@staticmethod
+	def run(db: Session) -> dict:
+		"""
+		Valida a tabela employees inteira com uma única leitura (e-mail, e-mail do gestor)
+
+		Args:
+			db: Sessão do banco de dados
+
+		Returns:
+			Relatório de HierarchyCheck.check
+		"""
+		rows = db.execute(select(Employees.employee_email, Employees.manager_email)).all()
+		return HierarchyCheck.check(rows)
+
+	@staticmethod
+	def check(rows: List[Tuple[str, str]]) -> dict:
+		"""
+		Cada funcionário tem um único gestor, então o grafo é uma floresta mais, eventualmente,
+		ciclos. Uma passada descobre os topos, outra desce em largura a partir deles e quem
+		não foi alcançado está em um ciclo ou pendurado em um.
+
+		Args:
+			rows: Tuplas (employee_email, manager_email)
+
+		Returns:
+			Dicionário com o resumo (valid, contagens, max_depth) e exemplos de cada problema
+		"""
+		manager_of: Dict[str, str] = {email: manager for email, manager in rows}
+		children: Dict[str, List[str]] = {}
+		for email, manager in rows:
+			children.setdefault(manager, []).append(email)
+
+		self_managed = [email for email, manager in rows if email == manager]
+
+		# topos: gestores que não estão cadastrados como funcionários
+		roots = {manager for manager in children if manager not in manager_of}
+
+		# descida em largura a partir dos topos: profundidade e tamanho de cada árvore
+		depth = {root: 0 for root in roots}
+		root_sizes = []
+		max_depth = 0
+		reached = 0
+		for root in roots:
+			level = [root]
+			size = 0
+			while level:
+				next_level = []
+				for manager in level:
+					for email in children.get(manager, ()):
+						if email not in depth:
+							depth[email] = depth[manager] + 1
+							next_level.append(email)
+				if next_level:
+					size += len(next_level)
+					max_depth = max(max_depth, depth[next_level[0]])
+				level = next_level
+			reached += size
+			root_sizes.append({'manager_email': root, 'employees': size})
+		root_sizes.sort(key=lambda root: (-root['employees'], root['manager_email']))
+
+		# o maior topo é o da empresa (legítimo); quem responde a qualquer outro gestor inexistente é órfão
+		main_root = root_sizes[0]['manager_email'] if root_sizes else None
+		orphans = [email for email, manager in rows if manager in roots and manager != main_root]
+
+		# os não alcançados seguem gestores até cair em um ciclo; cada nó é visitado uma vez
+		cycles = []
+		state: Dict[str, int] = {}  # 1 = no caminho atual, 2 = já resolvido
+		for start, _ in rows:
+			if start in depth or start in state:
+				continue
+			path = []
+			node = start
+			while node in manager_of and node not in depth and node not in state:
+				state[node] = 1
+				path.append(node)
+				node = manager_of[node]
+			if state.get(node) == 1:
+				cycle = path[path.index(node):]
+				cycles.append(cycle)
+			for visited in path:
+				state[visited] = 2
+
+		unreachable = len(rows) - reached
+		examples = HierarchyCheck.MAX_EXAMPLES
+		return {
+			'valid': not cycles and not self_managed and len(roots) <= 1,
+			'total_employees': len(rows),
+			'max_depth': max_depth,
+			'root_count': len(roots),
+			'roots': root_sizes[:examples],
+			'orphan_count': len(orphans),
+			'orphans': orphans[:examples],
+			'self_managed_count': len(self_managed),
+			'self_managed': self_managed[:examples],
+			'cycle_count': len(cycles),
+			'cycles': [cycle[:examples] for cycle in cycles[:examples]],
+			'unreachable_count': unreachable
+		}
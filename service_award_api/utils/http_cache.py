@@ -0,0 +1,148 @@
+import hashlib
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models import DataVersion
+
+
+class DataVersions:
+	"""Contadores de versão por tabela, incrementados na mesma transação de cada escrita"""
+
+	# tabelas cujo conteúdo aparece em respostas com ETag
+	TRACKED_TABLES = ('employees', 'users')
+
+	@staticmethod
+	def setup(engine: Engine):
+		"""
+		Cria os contadores que ainda não existem. A versão inicial é o instante atual (ms):
+		um banco recriado do zero não repete versões antigas, então nenhum ETag antigo volta a valer
+
+		Args:
+			engine: Engine do banco de dados
+		"""
+		with engine.begin() as conn:
+			existing = set(conn.execute(select(DataVersion.name)).scalars())
+			for name in DataVersions.TRACKED_TABLES:
+				if name not in existing:
+					conn.execute(insert(DataVersion).values(name=name, version=int(time.time() * 1000)))
+
+	@staticmethod
+	def current(db: Session, name: str) -> int:
+		"""
+		Versão atual dos dados de uma tabela (uma leitura pela chave primária)
+
+		Args:
+			db: Sessão do banco de dados
+			name: Nome da tabela acompanhada
+
+		Returns:
+			Versão atual (0 se o contador ainda não existir)
+		"""
+		return db.execute(select(DataVersion.version).where(DataVersion.name == name)).scalar() or 0
+
+	@staticmethod
+	def bump(connection, names):
+		"""Incrementa os contadores na conexão (e transação) da escrita"""
+		for name in sorted(names):
+			connection.execute(
+				update(DataVersion).where(DataVersion.name == name).values(version=DataVersion.version + 1)
+			)
+
+	@staticmethod
+	def install_events():
+		"""
+		Registra os eventos de sessão que incrementam as versões: after_flush cobre add/alteração/
+		delete de objetos, do_orm_execute cobre query.update(), query.delete() e inserts em massa
+		"""
+		if event.contains(Session, 'after_flush', DataVersions._after_flush):
+			return
+		event.listen(Session, 'after_flush', DataVersions._after_flush)
+		event.listen(Session, 'do_orm_execute', DataVersions._do_orm_execute)
+
+	@staticmethod
+	def _table_name(obj) -> Optional[str]:
+		table = getattr(obj, '__table__', None)
+		return table.name if table is not None else None
+
+	@staticmethod
+	def _after_flush(session: Session, flush_context):
+		changed = set()
+		for obj in list(session.new) + list(session.deleted):
+			changed.add(DataVersions._table_name(obj))
+		for obj in session.dirty:
+			if session.is_modified(obj):
+				changed.add(DataVersions._table_name(obj))
+
+		changed &= set(DataVersions.TRACKED_TABLES)
+		if changed:
+			DataVersions.bump(session.connection(), changed)
+
+	@staticmethod
+	def _do_orm_execute(orm_execute_state):
+		if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+			return
+
+		mapper = orm_execute_state.bind_mapper
+		if mapper is None:
+			return
+
+		name = mapper.local_table.name
+		if name in DataVersions.TRACKED_TABLES:
+			DataVersions.bump(orm_execute_state.session.connection(), [name])
+
+
+class HttpCache:
+	"""ETags fracos e respostas 304 (GET condicional)"""
+
+	# private: as respostas dependem do usuário logado; no-cache: o navegador sempre revalida com If-None-Match
+	CACHE_CONTROL = 'private, no-cache'
+
+	@staticmethod
+	def etag(*parts) -> str:
+		"""
+		Monta um ETag fraco (W/) a partir da versão dos dados e de tudo que muda a resposta
+		(usuário, filtros, cursor...). Fraco porque o mesmo valor vale para o corpo com e sem
+		gzip (GZipMiddleware): identifica o conteúdo, não os bytes.
+
+		Returns:
+			ETag fraco entre aspas, como exige o HTTP
+		"""
+		key = '\x1f'.join('' if part is None else str(part) for part in parts)
+		return 'W/"' + hashlib.sha1(key.encode('utf-8')).hexdigest() + '"'
+
+	@staticmethod
+	def matches(if_none_match: Optional[str], etag: str) -> bool:
+		"""Comparação fraca do If-None-Match com o ETag atual (ignora o prefixo W/ dos dois lados)"""
+		if not if_none_match or not etag:
+			return False
+
+		candidates = {candidate.strip() for candidate in if_none_match.split(',')}
+		if '*' in candidates:
+			return True
+		opaque = etag[2:] if etag.startswith('W/') else etag
+		return any((candidate[2:] if candidate.startswith('W/') else candidate) == opaque for candidate in candidates)
+
+	@staticmethod
+	def not_modified(request: Request, etag: str) -> Optional[Response]:
+		"""
+		Verifica o If-None-Match da requisição
+
+		Args:
+			request: Requisição recebida
+			etag: ETag atual do recurso
+
+		Returns:
+			Resposta 304 se o cliente já tem esta versão; None caso contrário
+		"""
+		if HttpCache.matches(request.headers.get('if-none-match'), etag):
+			return Response(status_code=304, headers=HttpCache.headers(etag))
+		return None
+
+	@staticmethod
+	def headers(etag: str) -> dict:
+		return {'ETag': etag, 'Cache-Control': HttpCache.CACHE_CONTROL}
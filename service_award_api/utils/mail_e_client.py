@@ -0,0 +1,205 @@
+import asyncio
+import json
+import time
+from typing import Callable, Iterable, Optional
+
+from utils.metrics import MAIL_E_FAILURES, MAIL_E_SEND_SECONDS
+
+
+class MailEError(Exception):
+	"""O Mail-E respondeu com STATUS diferente de OK ou fechou a conexão sem responder"""
+
+
+class NothingSentError(ConnectionError):
+	"""A conexão falhou no primeiro pedaço da mensagem: nada chegou ao Mail-E e o envio pode ser refeito"""
+
+
+class MailEClient:
+	"""Cliente assíncrono do Mail-E com pool de conexões persistentes (protocolo JSON + \\n)"""
+
+	def __init__(
+		self,
+		host: str,
+		port: int,
+		pool_size: int = 4,
+		connect_timeout: float = 5,
+		write_timeout: float = 10,
+		read_timeout: float = 10,
+		idle_timeout: float = 60
+	):
+		"""
+		Args:
+			host: IP do Mail-E
+			port: Porta do Mail-E
+			pool_size: Quantidade máxima de conexões ociosas mantidas abertas
+			connect_timeout: Timeout (segundos) para abrir a conexão
+			write_timeout: Timeout (segundos) para enviar o payload
+			read_timeout: Timeout (segundos) para receber a resposta
+			idle_timeout: Segundos sem uso até uma conexão ociosa ser descartada
+		"""
+		self.host = host
+		self.port = port
+		self.pool_size = pool_size
+		self.connect_timeout = connect_timeout
+		self.write_timeout = write_timeout
+		self.read_timeout = read_timeout
+		self.idle_timeout = idle_timeout
+		# pilha (LIFO) de (reader, writer, último uso): reaproveita a conexão mais recente
+		self._pool = []
+
+	async def send(self, payload: dict) -> Optional[dict]:
+		"""
+		Envia um payload ao Mail-E e aguarda a resposta sem bloquear o event loop
+
+		Args:
+			payload: Dicionário que será enviado como uma linha JSON
+
+		Returns:
+			Resposta do Mail-E ou None se o servidor não respondeu
+
+		Raises:
+			asyncio.TimeoutError: Timeout ao conectar, enviar ou receber
+			OSError: Falha de conexão com o Mail-E
+		"""
+		message = (json.dumps(payload) + '\n').encode('utf-8')
+		return await self.send_stream(lambda: (message,))
+
+	async def send_stream(self, make_chunks: Callable[[], Iterable[bytes]]) -> Optional[dict]:
+		"""
+		Envia uma linha JSON gerada em pedaços (payloads grandes não precisam ficar inteiros em memória)
+
+		Args:
+			make_chunks: Função que retorna um novo iterador com os pedaços da linha (terminada em \\n).
+				É chamada de novo só se a conexão do pool falhar antes de qualquer pedaço ser enviado.
+
+		Returns:
+			Resposta do Mail-E ou None se o servidor não respondeu
+
+		Raises:
+			asyncio.TimeoutError: Timeout ao conectar, enviar ou receber
+			OSError: Falha de conexão com o Mail-E
+		"""
+		start = time.perf_counter()
+		try:
+			response = await self._send_stream(make_chunks)
+		except asyncio.TimeoutError:
+			MAIL_E_FAILURES.inc(reason='timeout')
+			raise
+		except OSError:
+			MAIL_E_FAILURES.inc(reason='connection')
+			raise
+
+		if response is None:
+			MAIL_E_FAILURES.inc(reason='no_response')
+		MAIL_E_SEND_SECONDS.observe(time.perf_counter() - start)
+		return response
+
+	async def _send_stream(self, make_chunks: Callable[[], Iterable[bytes]]) -> Optional[dict]:
+		reader, writer, reused = await self._acquire()
+		try:
+			response_data = await self._exchange(reader, writer, make_chunks())
+		except NothingSentError:
+			self._close(writer)
+			if not reused:
+				raise
+			# A conexão do pool caiu sem aviso antes de qualquer byte sair - reconecta e tenta uma única vez
+			reader, writer = await self._connect()
+			try:
+				response_data = await self._exchange(reader, writer, make_chunks())
+			except (OSError, asyncio.TimeoutError):
+				self._close(writer)
+				raise
+		except (OSError, asyncio.TimeoutError):
+			# a mensagem pode já ter sido processada: reenviar aqui duplicaria o e-mail (quem chama decide)
+			self._close(writer)
+			raise
+
+		if response_data:
+			self._release(reader, writer)
+			return json.loads(response_data.decode('utf-8').strip())
+
+		# Servidor fechou a conexão sem resposta - ela não pode voltar para o pool e a mensagem não é reenviada
+		self._close(writer)
+		return None
+
+	@staticmethod
+	def ensure_ok(response: Optional[dict]) -> dict:
+		"""
+		Confirma que o Mail-E aceitou a mensagem
+
+		Args:
+			response: Resposta de send/send_stream
+
+		Returns:
+			A própria resposta, se o STATUS for OK
+
+		Raises:
+			MailEError: Sem resposta ou STATUS de erro (a mensagem deve voltar para a fila)
+		"""
+		if response is None:
+			raise MailEError('o Mail-E fechou a conexão sem responder')
+		if str(response.get('STATUS', '')).upper() != 'OK':
+			raise MailEError(json.dumps(response, ensure_ascii=False)[:300])
+		return response
+
+	def close(self):
+		"""Fecha todas as conexões ociosas do pool"""
+		while self._pool:
+			_, writer, _ = self._pool.pop()
+			self._close(writer)
+
+	async def _acquire(self) -> tuple:
+		"""Retorna (reader, writer, reaproveitado) - usa uma conexão saudável do pool ou abre uma nova"""
+		now = time.monotonic()
+		while self._pool:
+			reader, writer, last_used = self._pool.pop()
+			if now - last_used < self.idle_timeout and self._is_healthy(reader, writer):
+				return reader, writer, True
+			self._close(writer)
+
+		reader, writer = await self._connect()
+		return reader, writer, False
+
+	def _release(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		"""Devolve a conexão ao pool ou fecha se o pool estiver cheio"""
+		if len(self._pool) < self.pool_size and self._is_healthy(reader, writer):
+			self._pool.append((reader, writer, time.monotonic()))
+		else:
+			self._close(writer)
+
+	async def _connect(self) -> tuple:
+		return await asyncio.wait_for(
+			asyncio.open_connection(self.host, self.port),
+			timeout=self.connect_timeout
+		)
+
+	@staticmethod
+	def _is_healthy(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+		"""
+		Health check sem I/O: uma conexão ociosa não pode estar fechada nem ter recebido EOF
+		(o event loop já processou o fechamento enquanto ela estava no pool)
+		"""
+		return not writer.is_closing() and not reader.at_eof()
+
+	async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, chunks: Iterable[bytes]) -> bytes:
+		"""Envia a mensagem (pedaço a pedaço) e lê a resposta até o \\n (ou até o servidor fechar)"""
+		sent = False
+		for chunk in chunks:
+			writer.write(chunk)
+			try:
+				await asyncio.wait_for(writer.drain(), timeout=self.write_timeout)
+			except OSError as error:
+				if not sent:
+					raise NothingSentError(*error.args) from error
+				raise
+			sent = True
+
+		# readline devolve o que chegou até o EOF se o servidor fechar sem \n
+		return await asyncio.wait_for(reader.readline(), timeout=self.read_timeout)
+
+	@staticmethod
+	def _close(writer: asyncio.StreamWriter):
+		try:
+			writer.close()
+		except (OSError, RuntimeError):
+			pass
@@ -0,0 +1,113 @@
+"""
+Servidor Mail-E local (dublê) para testes e testes de carga
+
+Fala o mesmo protocolo do Mail-E real: uma linha JSON por requisição e uma linha
+JSON de resposta, mantendo a conexão aberta para as próximas mensagens.
+
+Uso:
+	python -m utils.mail_e_server --port 5555 --delay 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+from typing import Optional
+
+
+class MailEStubServer:
+	"""Dublê do servidor Mail-E, com latência e taxa de falhas configuráveis"""
+
+	def __init__(self, host: str = '127.0.0.1', port: int = 0, delay: float = 0, failure_rate: float = 0):
+		"""
+		Args:
+			host: Endereço onde o servidor escuta
+			port: Porta (0 escolhe uma porta livre)
+			delay: Segundos de espera antes de cada resposta (simula um Mail-E lento)
+			failure_rate: Fração (0 a 1) das mensagens respondidas com erro
+		"""
+		self.host = host
+		self.port = port
+		self.delay = delay
+		self.failure_rate = failure_rate
+		self.messages_received = 0
+		self.connections_opened = 0
+		self._server: Optional[asyncio.AbstractServer] = None
+		self._handlers = set()
+
+	async def start(self) -> int:
+		"""Inicia o servidor e retorna a porta em uso"""
+		# payloads de organizações grandes podem ter vários MB em uma única linha
+		self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=64 * 1024 * 1024)
+		self.port = self._server.sockets[0].getsockname()[1]
+		return self.port
+
+	async def stop(self):
+		if self._server is not None:
+			self._server.close()
+			# fecha também as conexões persistentes ainda abertas pelos clientes
+			for task in list(self._handlers):
+				task.cancel()
+			await asyncio.gather(*self._handlers, return_exceptions=True)
+			await self._server.wait_closed()
+			self._server = None
+
+	async def serve_forever(self):
+		await self.start()
+		async with self._server:
+			await self._server.serve_forever()
+
+	async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		self.connections_opened += 1
+		task = asyncio.current_task()
+		self._handlers.add(task)
+		try:
+			while True:
+				line = await reader.readline()
+				if not line:
+					break
+
+				self.messages_received += 1
+				response = self._build_response(line)
+
+				if self.delay:
+					await asyncio.sleep(self.delay)
+
+				writer.write((json.dumps(response) + '\n').encode('utf-8'))
+				await writer.drain()
+		except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+			pass
+		finally:
+			self._handlers.discard(task)
+			writer.close()
+
+	def _build_response(self, line: bytes) -> dict:
+		try:
+			payload = json.loads(line)
+		except ValueError:
+			return {'STATUS': 'ERRO', 'MENSAGEM': 'JSON inválido'}
+
+		if self.failure_rate and random.random() < self.failure_rate:
+			return {'STATUS': 'ERRO', 'MENSAGEM': 'Falha simulada'}
+
+		return {
+			'STATUS': 'OK',
+			'CONTENT': payload.get('CONTENT'),
+			'DESTINATARIO': payload.get('DESTINATARIO'),
+			'TOTAL': len(payload.get('ANIVERSARIOS') or [])
+		}
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Servidor Mail-E local para testes')
+	parser.add_argument('--host', default='127.0.0.1')
+	parser.add_argument('--port', type=int, default=5555)
+	parser.add_argument('--delay', type=float, default=0, help='latência por mensagem (segundos)')
+	parser.add_argument('--failure-rate', type=float, default=0, help='fração de respostas com erro')
+	args = parser.parse_args()
+
+	server = MailEStubServer(args.host, args.port, args.delay, args.failure_rate)
+	print(f'Mail-E local escutando em {args.host}:{args.port}')
+	try:
+		asyncio.run(server.serve_forever())
+	except KeyboardInterrupt:
+		pass
@@ -0,0 +1,254 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class Metric:
+	"""
+	Base das métricas em memória. Cada thread grava no seu próprio dicionário (shard), então
+	o caminho quente não pega lock nenhum; o lock só é usado quando uma thread grava pela
+	primeira vez e na leitura (/metrics), que soma os shards.
+	"""
+
+	type_name = ''
+
+	def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+		self.name = name
+		self.documentation = documentation
+		self.labelnames = tuple(labelnames)
+		self._local = threading.local()
+		self._shards: List[dict] = []
+		self._lock = threading.Lock()
+		REGISTRY.register(self)
+
+	def _shard(self) -> dict:
+		shard = getattr(self._local, 'values', None)
+		if shard is None:
+			shard = {}
+			with self._lock:
+				self._shards.append(shard)
+			self._local.values = shard
+		return shard
+
+	def _key(self, labels: dict) -> tuple:
+		return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+	def _snapshots(self) -> List[dict]:
+		# dict.copy() roda inteiro em C (com o GIL): seguro mesmo com outra thread gravando
+		with self._lock:
+			return [shard.copy() for shard in self._shards]
+
+	@staticmethod
+	def _escape(value: str) -> str:
+		return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+	def _labels(self, key: tuple, extra: Optional[Tuple[str, str]] = None) -> str:
+		pairs = list(zip(self.labelnames, key))
+		if extra:
+			pairs.append(extra)
+		if not pairs:
+			return ''
+		return '{' + ','.join(f'{name}="{self._escape(value)}"' for name, value in pairs) + '}'
+
+	def samples(self) -> List[str]:
+		raise NotImplementedError
+
+
+class Counter(Metric):
+	"""Valor que só cresce (total de requisições, falhas, linhas processadas...)"""
+
+	type_name = 'counter'
+
+	def inc(self, amount: float = 1, **labels):
+		shard = self._shard()
+		key = self._key(labels)
+		shard[key] = shard.get(key, 0) + amount
+
+	def values(self) -> Dict[tuple, float]:
+		merged: Dict[tuple, float] = {}
+		for shard in self._snapshots():
+			for key, value in shard.items():
+				merged[key] = merged.get(key, 0) + value
+		return merged
+
+	def samples(self) -> List[str]:
+		return [f'{self.name}{self._labels(key)} {value}' for key, value in sorted(self.values().items())]
+
+
+class Gauge(Counter):
+	"""Valor que sobe e desce (requisições em andamento)"""
+
+	type_name = 'gauge'
+
+	def dec(self, amount: float = 1, **labels):
+		self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+	"""Distribuição de valores em faixas cumulativas (latências, tamanhos)"""
+
+	type_name = 'histogram'
+
+	DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+	def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+		super().__init__(name, documentation, labelnames)
+		self.buckets = tuple(sorted(buckets))
+
+	def observe(self, value: float, **labels):
+		shard = self._shard()
+		key = self._key(labels)
+		counts = shard.get(key)
+		if counts is None:
+			# uma posição por faixa + "+Inf", depois soma e quantidade
+			counts = shard[key] = [0] * (len(self.buckets) + 3)
+		counts[bisect_left(self.buckets, value)] += 1
+		counts[-2] += value
+		counts[-1] += 1
+
+	def values(self) -> Dict[tuple, list]:
+		merged: Dict[tuple, list] = {}
+		for shard in self._snapshots():
+			for key, counts in shard.items():
+				counts = list(counts)
+				total = merged.get(key)
+				merged[key] = counts if total is None else [a + b for a, b in zip(total, counts)]
+		return merged
+
+	def samples(self) -> List[str]:
+		lines = []
+		for key, counts in sorted(self.values().items()):
+			cumulative = 0
+			for bound, count in zip(self.buckets + (float('inf'),), counts):
+				cumulative += count
+				le = '+Inf' if bound == float('inf') else repr(bound)
+				lines.append(f'{self.name}_bucket{self._labels(key, ("le", le))} {cumulative}')
+			lines.append(f'{self.name}_sum{self._labels(key)} {counts[-2]}')
+			lines.append(f'{self.name}_count{self._labels(key)} {counts[-1]}')
+		return lines
+
+
+class MetricsRegistry:
+	"""Conjunto de métricas exportadas em /metrics (formato texto do Prometheus)"""
+
+	def __init__(self):
+		self._metrics: List[Metric] = []
+		self._lock = threading.Lock()
+
+	def register(self, metric: Metric):
+		with self._lock:
+			self._metrics.append(metric)
+
+	def render(self) -> str:
+		lines = []
+		for metric in list(self._metrics):
+			lines.append(f'# HELP {metric.name} {metric.documentation}')
+			lines.append(f'# TYPE {metric.name} {metric.type_name}')
+			lines.extend(metric.samples())
+		return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ========== MÉTRICAS DA APLICAÇÃO ==========
+HTTP_REQUEST_SECONDS = Histogram(
+	'http_request_duration_seconds', 'Latência das requisições HTTP', ('method', 'route', 'status')
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge('http_requests_in_flight', 'Requisições HTTP em andamento')
+
+DB_QUERIES = Counter('db_queries_total', 'Consultas executadas no banco')
+DB_QUERY_SECONDS = Histogram('db_query_duration_seconds', 'Tempo de cada consulta no banco')
+DB_QUERIES_PER_REQUEST = Histogram(
+	'db_queries_per_request', 'Consultas ao banco por requisição HTTP', ('route',),
+	buckets=(1, 2, 5, 10, 25, 50, 100, 250, 1000)
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+	'db_time_per_request_seconds', 'Tempo gasto no banco por requisição HTTP', ('route',)
+)
+
+MAIL_E_SEND_SECONDS = Histogram('mail_e_send_duration_seconds', 'Latência dos envios ao Mail-E')
+MAIL_E_FAILURES = Counter('mail_e_send_failures_total', 'Envios ao Mail-E que falharam', ('reason',))
+
+UPLOAD_ROWS = Counter('upload_rows_total', 'Linhas processadas nos uploads de Excel', ('result',))
+UPLOAD_ROWS_PER_SECOND = Histogram(
+	'upload_rows_per_second', 'Vazão de cada upload de Excel (linhas/s)',
+	buckets=(10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+)
+
+BCRYPT_VERIFY_SECONDS = Histogram(
+	'bcrypt_verify_duration_seconds', 'Tempo de verificação de senha (bcrypt)',
+	buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2)
+)
+
+
+# [consultas, segundos] da requisição atual - preenchido pelos eventos do engine
+_request_db_stats: ContextVar[Optional[list]] = ContextVar('request_db_stats', default=None)
+
+
+def instrument_engine(engine: Engine):
+	"""Conta e cronometra cada consulta do engine (total e por requisição)"""
+
+	@event.listens_for(engine, 'before_cursor_execute')
+	def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+		conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+	@event.listens_for(engine, 'after_cursor_execute')
+	def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+		elapsed = time.perf_counter() - conn.info['metrics_query_start'].pop()
+		DB_QUERIES.inc()
+		DB_QUERY_SECONDS.observe(elapsed)
+
+		stats = _request_db_stats.get()
+		if stats is not None:
+			stats[0] += 1
+			stats[1] += elapsed
+
+	@event.listens_for(engine, 'handle_error')
+	def _handle_error(exception_context):
+		# consulta que falhou não passa pelo after_cursor_execute
+		starts = exception_context.connection.info.get('metrics_query_start') if exception_context.connection else None
+		if starts:
+			starts.pop()
+
+
+class MetricsMiddleware:
+	"""Middleware ASGI: latência por rota/status, requisições em andamento e uso do banco por requisição"""
+
+	def __init__(self, app):
+		self.app = app
+
+	async def __call__(self, scope, receive, send):
+		if scope['type'] != 'http':
+			await self.app(scope, receive, send)
+			return
+
+		status_holder = {'status': 500}
+
+		async def send_wrapper(message):
+			if message['type'] == 'http.response.start':
+				status_holder['status'] = message['status']
+			await send(message)
+
+		stats = [0, 0.0]
+		token = _request_db_stats.set(stats)
+		HTTP_REQUESTS_IN_FLIGHT.inc()
+		start = time.perf_counter()
+		try:
+			await self.app(scope, receive, send_wrapper)
+		finally:
+			elapsed = time.perf_counter() - start
+			HTTP_REQUESTS_IN_FLIGHT.dec()
+			_request_db_stats.reset(token)
+
+			# o template da rota (ex.: /employees/{employee_id}) evita uma série por id
+			route = scope.get('route')
+			route_path = getattr(route, 'path', 'unmatched')
+			HTTP_REQUEST_SECONDS.observe(elapsed, method=scope['method'], route=route_path, status=status_holder['status'])
+			DB_QUERIES_PER_REQUEST.observe(stats[0], route=route_path)
+			DB_SECONDS_PER_REQUEST.observe(stats[1], route=route_path)
@@ -0,0 +1,237 @@
+import threading
+from calendar import isleap
+from datetime import date
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from utils.employee_store import EmployeeStore, employee_store_cache
+
+# numpy só é carregado na primeira geração do relatório, não no startup dos workers
+if TYPE_CHECKING:
+	import numpy
+
+# date(1970, 1, 1).toordinal(): converte os ordinais do EmployeeStore para dias do datetime64
+EPOCH_ORDINAL = 719163
+
+
+class OrgArrays:
+	"""
+	Arrays NumPy derivados do EmployeeStore, na pré-ordem da árvore (Euler tour): a equipe inteira
+	de um nó é o intervalo contíguo [start + 1, start + size) - somas por equipe viram diferenças
+	de somas acumuladas. Nomes e e-mails continuam só no store (nada da organização é copiado).
+	Os totais da empresa usam employee_hire_dates, com todos os funcionários: quem está preso em um
+	ciclo de gestores fica fora da pré-ordem (e das equipes), mas não da contagem geral.
+	"""
+
+	def __init__(self, store: EmployeeStore, employee_hire_dates: 'numpy.ndarray', order: 'numpy.ndarray',
+				 position: 'numpy.ndarray', size: 'numpy.ndarray', hire_dates: 'numpy.ndarray',
+				 is_employee: 'numpy.ndarray', managers: 'numpy.ndarray'):
+		self.store = store
+		self.employee_hire_dates = employee_hire_dates  # datetime64[D] por nó, só os funcionários (0..store.size-1)
+		self.order = order  # posição -> nó
+		self.position = position  # nó -> posição na pré-ordem (-1 se preso em ciclo)
+		self.size = size  # nó -> tamanho da equipe, contando o próprio nó
+		self.hire_dates = hire_dates  # datetime64[D] por posição (NaT para gestores fora da tabela)
+		self.is_employee = is_employee  # bool por posição
+		self.managers = managers  # nós com ao menos um subordinado
+
+	@staticmethod
+	def build(store: EmployeeStore) -> 'OrgArrays':
+		import numpy as np
+
+		node_count = len(store.emails)
+		children, child_start, parents = store.children, store.child_start, store.parents
+
+		# topos: os gestores que não estão na tabela e quem é gestor de si mesmo (comum na linha do CEO) -
+		# pré-ordem sem recursão a partir deles, ignorando a aresta do nó para ele mesmo;
+		# nós presos em outros ciclos ficam de fora (tamanho 0)
+		self_managed = [node for node in range(store.size) if parents[node] == node]
+		order = []
+		stack = list(range(node_count - 1, store.size - 1, -1)) + self_managed[::-1]
+		while stack:
+			node = stack.pop()
+			order.append(node)
+			stack.extend(child for child in reversed(children[child_start[node]:child_start[node + 1]]) if child != node)
+
+		position = np.full(node_count, -1, dtype=np.int64)
+		position[order] = np.arange(len(order))
+
+		# tamanho das equipes das folhas para cima (na pré-ordem reversa cada nó já está completo)
+		size = [0] * node_count
+		for node in reversed(order):
+			size[node] += 1
+			if node < store.size and parents[node] != node:
+				size[parents[node]] += size[node]
+
+		order_array = np.array(order, dtype=np.int64)
+		hire_by_node = np.full(node_count, np.datetime64('NaT'), dtype='datetime64[D]')
+		ordinals = np.frombuffer(store.hire_ordinals, dtype=f'i{store.hire_ordinals.itemsize}')
+		hire_by_node[:store.size] = (ordinals - EPOCH_ORDINAL).astype('datetime64[D]')
+
+		return OrgArrays(
+			store,
+			hire_by_node[:store.size],
+			order_array,
+			position,
+			np.array(size, dtype=np.int64),
+			hire_by_node[order_array],
+			order_array < store.size,
+			np.flatnonzero(np.diff(np.frombuffer(child_start, dtype=f'i{child_start.itemsize}')) > 0)
+		)
+
+	def manager_name(self, node: int) -> Optional[str]:
+		"""Nome do gestor; os que não estão na tabela levam o nome gravado nos subordinados"""
+		store = self.store
+		if node < store.size:
+			return store.names[node]
+		return store.manager_names[store.children[store.child_start[node]]]
+
+
+class MilestoneReport:
+	"""
+	Relatório mensal de marcos de tempo de empresa (5/10/15... anos) da organização inteira,
+	calculado com NumPy sobre as datas de admissão e agrupado por mês e por equipe de gestor
+	"""
+
+	def __init__(self, milestone_years: Sequence[int]):
+		"""
+		Args:
+			milestone_years: Anos de empresa contados como marco
+		"""
+		self.milestone_years = tuple(sorted(milestone_years))
+		self._arrays: Optional[OrgArrays] = None
+		self._lock = threading.Lock()
+
+	def arrays(self, db: Session) -> OrgArrays:
+		"""Arrays do EmployeeStore compartilhado (employee_store_cache), refeitos só quando o store é remontado"""
+		store = employee_store_cache.get(db)
+		arrays = self._arrays
+		if arrays is not None and arrays.store is store:
+			return arrays
+
+		with self._lock:
+			if self._arrays is None or self._arrays.store is not store:
+				self._arrays = OrgArrays.build(store)
+			return self._arrays
+
+	def report(self, db: Session, year: int, manager_email: Optional[str] = None, limit: Optional[int] = None) -> Optional[dict]:
+		"""
+		Quantas pessoas completam cada marco em cada mês do ano, no total e por equipe de gestor
+
+		Args:
+			db: Sessão do banco de dados
+			year: Ano do relatório
+			manager_email: Se informado, detalha só a equipe deste gestor (com a lista de pessoas)
+			limit: Máximo de gestores listados (maiores totais primeiro)
+
+		Returns:
+			Dicionário do relatório; None se manager_email não for gestor de ninguém
+		"""
+		import numpy as np
+
+		org = self.arrays(db)
+		hits, hire_months, milestone_slot, tenure = self._milestones(org.hire_dates, year)
+		hits &= org.is_employee
+
+		if manager_email:
+			node = org.store.index.get(manager_email)
+			# size 1 = ninguém abaixo; size 0 = gestor preso em ciclo
+			if node is None or org.size[node] <= 1:
+				return None
+			start = int(org.position[node]) + 1
+			team = slice(start, start + int(org.size[node]) - 1)
+			return {
+				'year': year,
+				'manager_email': manager_email,
+				'total': int(hits[team].sum()),
+				'months': self._months(hits[team], hire_months[team], milestone_slot[team]),
+				'employees': self._drill_down(org, year, np.flatnonzero(hits[team]) + start, tenure)
+			}
+
+		# soma acumulada por mês na pré-ordem: equipe de n = P[start + size] - P[start + 1]
+		by_month = np.zeros((len(hits) + 1, 12), dtype=np.int32)
+		hit_positions = np.flatnonzero(hits)
+		by_month[hit_positions + 1, hire_months[hit_positions]] = 1
+		np.cumsum(by_month, axis=0, out=by_month)
+
+		managers = org.managers[org.position[org.managers] >= 0]
+		starts = org.position[managers]
+		team_by_month = by_month[starts + org.size[managers]] - by_month[starts + 1]
+		totals = team_by_month.sum(axis=1)
+
+		ranked = np.flatnonzero(totals > 0)
+		ranked = ranked[np.lexsort((starts[ranked], -totals[ranked]))]
+		if limit:
+			ranked = ranked[:limit]
+
+		# totais da empresa sobre todos os funcionários, inclusive os que não entram em nenhuma equipe
+		company_hits, company_months, company_slot, _ = self._milestones(org.employee_hire_dates, year)
+		return {
+			'year': year,
+			'total': int(company_hits.sum()),
+			'months': self._months(company_hits, company_months, company_slot),
+			'managers': [
+				{
+					'manager_email': org.store.emails[managers[i]],
+					'manager_name': org.manager_name(managers[i]),
+					'total': int(totals[i]),
+					'by_month': team_by_month[i].tolist()
+				}
+				for i in ranked.tolist()
+			]
+		}
+
+	def _milestones(self, hire_dates: 'numpy.ndarray', year: int) -> tuple:
+		"""
+		Anos de empresa completados no ano, para todos de uma vez
+
+		Returns:
+			Tupla (quem completa marco, mês da admissão com 0 = janeiro, índice do marco, anos de empresa)
+		"""
+		import numpy as np
+
+		milestones = np.array(self.milestone_years, dtype=np.int64)
+		hire_years = hire_dates.astype('datetime64[Y]').astype(np.int64) + 1970
+		hire_months = hire_dates.astype('datetime64[M]').astype(np.int64) % 12
+		tenure = year - hire_years
+		hits = np.isin(tenure, milestones)
+		milestone_slot = np.searchsorted(milestones, tenure)  # só vale onde hits é True
+		return hits, hire_months, milestone_slot, tenure
+
+	def _months(self, hits: 'numpy.ndarray', hire_months: 'numpy.ndarray', milestone_slot: 'numpy.ndarray') -> List[dict]:
+		"""Contagem mês x marco com um único bincount"""
+		import numpy as np
+
+		milestone_count = len(self.milestone_years)
+		cells = np.bincount(
+			hire_months[hits] * milestone_count + milestone_slot[hits],
+			minlength=12 * milestone_count
+		).reshape(12, milestone_count)
+		return [
+			{
+				'month': month + 1,
+				'total': int(cells[month].sum()),
+				'by_milestone': {str(years): int(count) for years, count in zip(self.milestone_years, cells[month].tolist())}
+			}
+			for month in range(12)
+		]
+
+	@staticmethod
+	def _drill_down(org: OrgArrays, year: int, positions: 'numpy.ndarray', tenure: 'numpy.ndarray') -> List[dict]:
+		"""Pessoas da equipe que completam marco no ano, em ordem de data do aniversário"""
+		employees = []
+		for position in positions.tolist():
+			node = int(org.order[position])
+			hire_date = org.hire_dates[position].item()
+			# quem entrou em 29/02 comemora em 28/02 nos anos não bissextos
+			day = 28 if hire_date.month == 2 and hire_date.day == 29 and not isleap(year) else hire_date.day
+			employees.append({
+				'employee_email': org.store.emails[node],
+				'employee_name': org.store.names[node],
+				'hire_date': hire_date,
+				'years': int(tenure[position]),
+				'anniversary_date': date(year, hire_date.month, day)
+			})
+		employees.sort(key=lambda employee: (employee['anniversary_date'], employee['employee_email']))
+		return employees
@@ -0,0 +1,190 @@
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import extract, select
+from sqlalchemy.orm import Session
+
+from models import Employees
+from utils.http_cache import DataVersions
+
+
+class OrgAnalytics:
+	"""
+	Indicadores por gestor (subordinados diretos, equipe total, profundidade e marcos de tempo
+	de empresa) calculados em uma única passada de baixo para cima sobre a tabela employees.
+	O resultado fica em memória até a próxima escrita (versão 'employees' do DataVersions).
+	"""
+
+	def __init__(self, milestone_years: Sequence[int]):
+		"""
+		Args:
+			milestone_years: Anos de empresa contados como marco (ex.: 5, 10, 15...)
+		"""
+		self.milestone_years = tuple(sorted(milestone_years))
+		self._cache_key = None
+		self._cache: Optional[dict] = None
+		self._lock = threading.Lock()
+
+	def get(self, db: Session, year: int) -> dict:
+		"""
+		Indicadores de todos os gestores, recalculados só quando os funcionários mudaram
+
+		Args:
+			db: Sessão do banco de dados
+			year: Ano de referência dos marcos (quem completa N anos de empresa neste ano)
+
+		Returns:
+			Dicionário com 'summary' e 'managers' (ordenados pela equipe total, maior primeiro)
+		"""
+		key = (DataVersions.current(db, 'employees'), year)
+		if self._cache_key == key:
+			return self._cache
+
+		# uma requisição calcula, as concorrentes esperam e reaproveitam o resultado
+		with self._lock:
+			if self._cache_key != key:
+				# só o ano de admissão interessa: vem pronto do banco, sem converter 200 mil datas
+				rows = db.execute(select(
+					Employees.employee_email,
+					Employees.employee_name,
+					Employees.manager_email,
+					extract('year', Employees.hire_date)
+				)).all()
+				analytics = self.compute(rows, year)
+
+				# gestores que não estão na tabela (normalmente só o topo) levam o nome gravado nos subordinados
+				unnamed = [manager for manager in analytics['managers'] if manager['manager_name'] is None]
+				if unnamed:
+					names = dict(db.query(Employees.manager_email, Employees.manager_name).filter(
+						Employees.manager_email.in_([manager['manager_email'] for manager in unnamed])
+					).distinct().all())
+					for manager in unnamed:
+						manager['manager_name'] = names.get(manager['manager_email'])
+
+				self._cache = analytics
+				self._cache_key = key
+			return self._cache
+
+	def compute(self, rows: List[tuple], year: int) -> dict:
+		"""
+		Calcula os indicadores em O(n): monta o grafo gestor -> subordinados, ordena em largura a
+		partir dos topos e acumula os totais de cada nó no seu gestor, das folhas para cima
+
+		Args:
+			rows: Tuplas (employee_email, employee_name, manager_email, ano de admissão)
+			year: Ano de referência dos marcos
+
+		Returns:
+			Dicionário com 'summary' e 'managers'
+		"""
+		milestone_index = {years: position for position, years in enumerate(self.milestone_years)}
+		milestone_count = len(self.milestone_years)
+
+		total_employees = len(rows)
+		emails = [row[0] for row in rows]
+		names = [row[1] for row in rows]
+		index: Dict[str, int] = {email: position for position, email in enumerate(emails)}
+
+		# gestores que não estão na tabela (ex.: diretoria cadastrada só como usuário) viram nós extras, sem gestor
+		parent = [-1] * total_employees
+		for position, row in enumerate(rows):
+			manager = index.get(row[2])
+			if manager is None:
+				manager = index[row[2]] = len(emails)
+				emails.append(row[2])
+				names.append(None)
+				parent.append(-1)
+			parent[position] = manager
+
+		# subordinados de cada nó em listas planas de inteiros (CSR): subordinados de n em
+		# children[first_child[n]:first_child[n + 1]], sem criar uma lista por nó
+		node_count = len(emails)
+		child_count = [0] * node_count
+		for node in range(total_employees):
+			child_count[parent[node]] += 1
+
+		first_child = [0] * (node_count + 1)
+		running = 0
+		for node in range(node_count):
+			first_child[node] = running
+			running += child_count[node]
+		first_child[node_count] = running
+
+		children = [0] * running
+		next_slot = first_child[:-1]
+		for node in range(total_employees):
+			manager = parent[node]
+			children[next_slot[manager]] = node
+			next_slot[manager] += 1
+
+		# ordem em largura a partir dos topos; nós presos em ciclos de gestores nunca são alcançados
+		order = [node for node in range(node_count) if parent[node] < 0]
+		for node in order:
+			order.extend(children[first_child[node]:first_child[node + 1]])
+
+		level = [0] * node_count
+		for node in order:
+			manager = parent[node]
+			if manager >= 0:
+				level[node] = level[manager] + 1
+
+		descendants = [0] * node_count
+		height = [0] * node_count
+		milestones: List[Optional[List[int]]] = [None] * node_count
+		own_milestone = [
+			milestone_index.get(year - row[3], -1) if row[3] is not None else -1
+			for row in rows
+		]
+
+		# das folhas para cima: cada nó já está completo quando é somado ao seu gestor
+		for node in reversed(order):
+			manager = parent[node]
+			if manager < 0:
+				continue
+
+			descendants[manager] += descendants[node] + 1
+			if height[node] + 1 > height[manager]:
+				height[manager] = height[node] + 1
+
+			milestone = own_milestone[node] if node < total_employees else -1
+			counts = milestones[node]
+			if milestone >= 0 or counts is not None:
+				manager_counts = milestones[manager]
+				if manager_counts is None:
+					manager_counts = milestones[manager] = [0] * milestone_count
+				if milestone >= 0:
+					manager_counts[milestone] += 1
+				if counts is not None:
+					for position in range(milestone_count):
+						manager_counts[position] += counts[position]
+
+		empty_counts = [0] * milestone_count
+		milestone_labels = [str(years) for years in self.milestone_years]
+		managers = []
+		for node in range(node_count):
+			if not child_count[node]:
+				continue
+			managers.append({
+				'manager_email': emails[node],
+				'manager_name': names[node],
+				'level': level[node],
+				'direct_reports': child_count[node],
+				'total_descendants': descendants[node],
+				'max_depth': height[node],
+				'milestones': dict(zip(milestone_labels, milestones[node] or empty_counts))
+			})
+		managers.sort(key=lambda manager: (-manager['total_descendants'], manager['manager_email']))
+
+		total_direct_reports = sum(manager['direct_reports'] for manager in managers)
+		return {
+			'summary': {
+				'year': year,
+				'total_employees': total_employees,
+				'total_managers': len(managers),
+				'top_level_managers': sum(1 for node in range(node_count) if parent[node] < 0 and child_count[node]),
+				'max_depth': max(height, default=0),
+				'average_span_of_control': round(total_direct_reports / len(managers), 2) if managers else 0,
+				'unreachable_employees': node_count - len(order)
+			},
+			'managers': managers
+		}
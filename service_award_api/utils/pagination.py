@@ -0,0 +1,100 @@
+import base64
+import json
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+class KeysetPaginator:
+	"""Paginação por cursor (keyset): a página N custa o mesmo que a página 1, sem OFFSET"""
+
+	DEFAULT_PAGE_SIZE = 100
+	MAX_PAGE_SIZE = 1000
+
+	def __init__(self, id_column, sort_columns: Dict[str, Tuple[Any, Callable[[Any], Any]]]):
+		"""
+		Args:
+			id_column: Coluna única usada para desempate (ex.: Employees.id)
+			sort_columns: Nome do atributo -> (expressão SQL, função que converte o valor salvo no cursor).
+				Colunas de texto que aceitam nulo devem usar coalesce(coluna, '') como expressão; as numéricas,
+				coalesce(coluna, 0) com um conversor que aceite '' (o valor gravado no cursor para nulo). Cada
+				expressão precisa de um índice (expressão, id) idêntico, com o padrão literal (ver models.py).
+		"""
+		self.id_column = id_column
+		self.sort_columns = {'id': (id_column, int), **sort_columns}
+
+	@staticmethod
+	def encode_cursor(values: list) -> str:
+		raw = json.dumps(values, default=lambda v: v.isoformat() if isinstance(v, date) else str(v))
+		return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+	@staticmethod
+	def decode_cursor(cursor: str) -> list:
+		try:
+			padded = cursor + '=' * (-len(cursor) % 4)
+			values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+		except (ValueError, TypeError):
+			raise HTTPException(status_code=400, detail='Cursor de paginação inválido')
+		if not isinstance(values, list) or len(values) != 3:
+			raise HTTPException(status_code=400, detail='Cursor de paginação inválido')
+		return values
+
+	def paginate(self, query, sort: Optional[str], cursor: Optional[str], limit: Optional[int]) -> Tuple[List[Any], Optional[str]]:
+		"""
+		Aplica ordenação, posição do cursor e limite à consulta
+
+		Args:
+			query: Consulta já filtrada
+			sort: Nome da ordenação (prefixo '-' para decrescente); padrão é o id
+			cursor: Cursor retornado pela página anterior
+			limit: Tamanho da página
+
+		Returns:
+			Tupla (itens da página, cursor da próxima página ou None se for a última)
+		"""
+		sort = sort or 'id'
+		descending = sort.startswith('-')
+		sort_name = sort.lstrip('-')
+		if sort_name not in self.sort_columns:
+			allowed = ', '.join(self.sort_columns)
+			raise HTTPException(status_code=400, detail=f'Ordenação inválida. Use uma de: {allowed}')
+
+		limit = min(limit or self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE)
+		sort_column, parse_value = self.sort_columns[sort_name]
+
+		if cursor:
+			cursor_sort, cursor_value, cursor_id = self.decode_cursor(cursor)
+			if cursor_sort != sort:
+				raise HTTPException(status_code=400, detail='O cursor pertence a outra ordenação')
+			try:
+				cursor_value = parse_value(cursor_value)
+				cursor_id = int(cursor_id)
+			except (ValueError, TypeError):
+				raise HTTPException(status_code=400, detail='Cursor de paginação inválido')
+
+			# continua exatamente depois do último item (valor, id) da página anterior; o limite de intervalo
+			# (>= / <=) fora do OR é o que deixa o SQLite buscar direto no índice em vez de percorrê-lo do início
+			if descending:
+				after = and_(sort_column <= cursor_value, or_(sort_column < cursor_value, self.id_column < cursor_id))
+			else:
+				after = and_(sort_column >= cursor_value, or_(sort_column > cursor_value, self.id_column > cursor_id))
+			query = query.filter(after)
+
+		if descending:
+			query = query.order_by(sort_column.desc(), self.id_column.desc())
+		else:
+			query = query.order_by(sort_column.asc(), self.id_column.asc())
+
+		# busca um item a mais só para saber se existe próxima página
+		rows = query.limit(limit + 1).all()
+		items = rows[:limit]
+
+		next_cursor = None
+		if len(rows) > limit:
+			last = items[-1]
+			last_value = getattr(last, sort_name)
+			next_cursor = self.encode_cursor([sort, '' if last_value is None else last_value, last.id])
+
+		return items, next_cursor
@@ -0,0 +1,80 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+	"""Limitador de tentativas (token bucket) em memória, indexado por chave"""
+
+	def __init__(self, capacity: int, refill_per_second: float, idle_ttl: float = 900, sweep_interval: float = 60):
+		"""
+		Args:
+			capacity: Quantidade máxima de tentativas em rajada
+			refill_per_second: Tokens devolvidos ao bucket por segundo
+			idle_ttl: Segundos sem uso até o bucket ser descartado
+			sweep_interval: Intervalo mínimo entre as limpezas de buckets ociosos
+		"""
+		self.capacity = float(capacity)
+		self.refill_per_second = float(refill_per_second)
+		# Um bucket ocioso só pode ser descartado depois de estar cheio de novo
+		self.idle_ttl = max(float(idle_ttl), self.capacity / self.refill_per_second)
+		self.sweep_interval = sweep_interval
+
+		# chave -> [tokens, último acesso], do acesso mais antigo para o mais recente
+		self._buckets = OrderedDict()
+		self._lock = threading.Lock()
+		self._next_sweep = time.monotonic() + sweep_interval
+
+	def try_acquire(self, key: str) -> float:
+		"""
+		Consome um token do bucket da chave
+
+		Args:
+			key: Chave do bucket (e-mail, IP, ...)
+
+		Returns:
+			0 se a tentativa foi permitida, ou os segundos até o próximo token
+		"""
+		now = time.monotonic()
+		with self._lock:
+			if now >= self._next_sweep:
+				self._sweep(now)
+
+			bucket = self._buckets.get(key)
+			if bucket is None:
+				bucket = [self.capacity, now]
+				self._buckets[key] = bucket
+			else:
+				# Repõe os tokens proporcionais ao tempo desde o último acesso
+				elapsed = now - bucket[1]
+				bucket[0] = min(self.capacity, bucket[0] + elapsed * self.refill_per_second)
+				bucket[1] = now
+				self._buckets.move_to_end(key)
+
+			if bucket[0] >= 1:
+				bucket[0] -= 1
+				return 0
+
+			return (1 - bucket[0]) / self.refill_per_second
+
+	def refund(self, key: str):
+		"""Devolve o token consumido por try_acquire (ex.: a tentativa foi barrada por outro limite)"""
+		with self._lock:
+			bucket = self._buckets.get(key)
+			if bucket is not None:
+				bucket[0] = min(self.capacity, bucket[0] + 1)
+
+	def reset(self, key: str):
+		"""Remove o bucket da chave (ex.: após um login bem-sucedido)"""
+		with self._lock:
+			self._buckets.pop(key, None)
+
+	def _sweep(self, now: float):
+		"""Descarta os buckets ociosos - como estão ordenados por acesso, para no primeiro ativo"""
+		limit = now - self.idle_ttl
+		while self._buckets:
+			key, bucket = next(iter(self._buckets.items()))
+			if bucket[1] > limit:
+				break
+			self._buckets.popitem(last=False)
+		self._next_sweep = now + self.sweep_interval
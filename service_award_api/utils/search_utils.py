@@ -0,0 +1,231 @@
+import logging
+import re
+from typing import List
+
+from sqlalchemy import Integer, and_, inspect, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models import Employees, User
+
+logger = logging.getLogger(__name__)
+
+
+# tabela FTS5 -> (tabela de origem, colunas indexadas)
+FTS_TABLES = {
+	'employees_fts': ('employees', ['employee_name', 'employee_email', 'manager_name']),
+	'users_fts': ('users', ['email', 'name', 'surname'])
+}
+
+
+class SearchIndex:
+	"""Busca por prefixo (typeahead) em funcionários e usuários, com índice FTS5 no SQLite"""
+
+	# None = ainda não verificado (workers que sobem sem rodar o setup descobrem na primeira busca)
+	fts_enabled = None
+
+	# acima disso o termo é genérico demais para valer a pena ordenar por relevância
+	RANK_MAX_CANDIDATES = 500
+
+	@staticmethod
+	def setup(engine: Engine):
+		"""
+		Cria os índices FTS5 e os triggers que os mantêm atualizados a cada INSERT/UPDATE/DELETE
+		(inclusive uploads e limpezas em massa). Em bancos sem FTS5 a busca usa LIKE.
+
+		Args:
+			engine: Engine do banco de dados
+		"""
+		if engine.dialect.name != 'sqlite':
+			SearchIndex.fts_enabled = False
+			return
+
+		with engine.begin() as conn:
+			existing = set(inspect(conn).get_table_names())
+			try:
+				for fts_table, (source, columns) in FTS_TABLES.items():
+					created = fts_table not in existing
+					SearchIndex._create_fts(conn, fts_table, source, columns)
+					if created:
+						# índice novo sobre uma tabela que já tem dados: indexa tudo uma vez
+						conn.execute(text(f"INSERT INTO {fts_table}({fts_table}) VALUES('rebuild')"))
+			except Exception as e:
+				# SQLite compilado sem FTS5
+				logger.warning('Busca FTS5 indisponível, usando LIKE: %s', e)
+				SearchIndex.fts_enabled = False
+				return
+
+		SearchIndex.fts_enabled = True
+
+	@staticmethod
+	def use_fts(db: Session) -> bool:
+		"""Indica se os índices FTS5 existem neste banco (verificado uma vez por worker)"""
+		if SearchIndex.fts_enabled is None:
+			bind = db.get_bind()
+			SearchIndex.fts_enabled = bind.dialect.name == 'sqlite' and all(
+				inspect(bind).has_table(fts_table) for fts_table in FTS_TABLES
+			)
+		return SearchIndex.fts_enabled
+
+	@staticmethod
+	def _create_fts(conn, fts_table: str, source: str, columns: List[str]):
+		column_list = ', '.join(columns)
+		new_values = ', '.join(f'new.{column}' for column in columns)
+		old_values = ', '.join(f'old.{column}' for column in columns)
+
+		# remove_diacritics: "joao" encontra "JOÃO"; prefix: acelera prefixos curtos do typeahead
+		conn.execute(text(
+			f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+			f"{column_list}, content='{source}', content_rowid='id', "
+			f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+		))
+		conn.execute(text(
+			f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} BEGIN "
+			f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+		))
+		conn.execute(text(
+			f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} BEGIN "
+			f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+		))
+		conn.execute(text(
+			f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {source} BEGIN "
+			f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+			f"INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+		))
+
+	@staticmethod
+	def tokenize(term: str) -> List[str]:
+		"""Separa o termo em palavras (e-mails viram nome, domínio, ...), como o tokenizer do FTS5"""
+		return re.findall(r'\w+', term.lower())[:8]
+
+	@staticmethod
+	def match_expression(tokens: List[str]) -> str:
+		"""Todas as palavras precisam aparecer; a última é tratada como prefixo"""
+		return ' '.join(f'"{token}"*' for token in tokens)
+
+	@staticmethod
+	def _fts_search(db: Session, model, fts_table: str, tokens: List[str], limit: int) -> list:
+		"""
+		Consulta o índice FTS5. Ordenar por relevância (bm25) exige pontuar todos os resultados,
+		o que fica caro em prefixos curtos ("a", "jo") numa base grande: nesse caso devolve os
+		primeiros resultados do índice sem ordenar por relevância.
+		"""
+		match = SearchIndex.match_expression(tokens)
+		table = model.__tablename__
+
+		candidates = db.execute(
+			text(f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :match LIMIT :probe"),
+			{'match': match, 'probe': SearchIndex.RANK_MAX_CANDIDATES + 1}
+		).scalars().all()
+
+		if len(candidates) > SearchIndex.RANK_MAX_CANDIDATES:
+			ids = candidates[:limit]
+			rows = db.query(model).filter(model.id.in_(ids)).all()
+			rows_by_id = {row.id: row for row in rows}
+			return [rows_by_id[row_id] for row_id in ids if row_id in rows_by_id]
+
+		statement = text(
+			f"SELECT {table}.* FROM {fts_table} "
+			f"JOIN {table} ON {table}.id = {fts_table}.rowid "
+			f"WHERE {fts_table} MATCH :match ORDER BY {fts_table}.rank LIMIT :limit"
+		)
+		return db.query(model).from_statement(statement).params(match=match, limit=limit).all()
+
+	@staticmethod
+	def search_employees(db: Session, term: str, limit: int = 20) -> List[Employees]:
+		"""
+		Busca funcionários por nome, e-mail ou nome do gestor
+
+		Args:
+			db: Sessão do banco de dados
+			term: Texto digitado (prefixos de palavras)
+			limit: Quantidade máxima de resultados
+
+		Returns:
+			Lista de funcionários, dos mais relevantes para os menos relevantes
+		"""
+		tokens = SearchIndex.tokenize(term)
+		if not tokens:
+			return []
+
+		if SearchIndex.use_fts(db):
+			return SearchIndex._fts_search(db, Employees, 'employees_fts', tokens, limit)
+
+		query = db.query(Employees)
+		for token in tokens:
+			pattern = f'%{token}%'
+			query = query.filter(or_(
+				Employees.employee_name.ilike(pattern),
+				Employees.employee_email.ilike(pattern),
+				Employees.manager_name.ilike(pattern)
+			))
+		return query.order_by(Employees.employee_name).limit(limit).all()
+
+	@staticmethod
+	def employees_filter(db: Session, term: str):
+		"""
+		Filtro SQL com os funcionários que casam com o termo, para combinar com outros filtros,
+		ordenação e paginação por cursor (ex.: GET /employees/all?q=). Um termo só de dígitos
+		também encontra o employee_id exato.
+
+		Args:
+			db: Sessão do banco de dados
+			term: Texto digitado (prefixos de palavras)
+
+		Returns:
+			Expressão para query.filter() ou None se o termo não tiver palavras
+		"""
+		tokens = SearchIndex.tokenize(term)
+		if not tokens:
+			return None
+
+		if SearchIndex.use_fts(db):
+			matches = Employees.id.in_(
+				text("SELECT rowid FROM employees_fts WHERE employees_fts MATCH :search_match")
+				.bindparams(search_match=SearchIndex.match_expression(tokens))
+				.columns(rowid=Integer)
+			)
+		else:
+			matches = and_(*(
+				or_(
+					Employees.employee_name.ilike(f'%{token}%'),
+					Employees.employee_email.ilike(f'%{token}%'),
+					Employees.manager_name.ilike(f'%{token}%')
+				)
+				for token in tokens
+			))
+
+		term = term.strip()
+		if term.isdigit():
+			matches = or_(matches, Employees.employee_id == int(term))
+		return matches
+
+	@staticmethod
+	def search_users(db: Session, term: str, limit: int = 20) -> List[User]:
+		"""
+		Busca usuários por e-mail, nome ou sobrenome
+
+		Args:
+			db: Sessão do banco de dados
+			term: Texto digitado (prefixos de palavras)
+			limit: Quantidade máxima de resultados
+
+		Returns:
+			Lista de usuários, dos mais relevantes para os menos relevantes
+		"""
+		tokens = SearchIndex.tokenize(term)
+		if not tokens:
+			return []
+
+		if SearchIndex.use_fts(db):
+			return SearchIndex._fts_search(db, User, 'users_fts', tokens, limit)
+
+		query = db.query(User)
+		for token in tokens:
+			pattern = f'%{token}%'
+			query = query.filter(or_(
+				User.email.ilike(pattern),
+				User.name.ilike(pattern),
+				User.surname.ilike(pattern)
+			))
+		return query.order_by(User.name).limit(limit).all()
@@ -0,0 +1,179 @@
+import hashlib
+import zlib
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from models import EmployeeSnapshot, Employees
+from utils.email_outbox import utcnow
+
+
+class EmployeeSnapshots:
+	"""Snapshots da tabela employees endereçados por conteúdo (sha256), com diff e rollback"""
+
+	# ordem das colunas em cada linha do snapshot; o e-mail é a chave de comparação
+	FIELDS = ('employee_id', 'employee_name', 'employee_email', 'hire_date', 'manager_name', 'manager_email')
+	EMAIL = FIELDS.index('employee_email')
+	HIRE_DATE = FIELDS.index('hire_date')
+
+	COMPRESSION_LEVEL = 6
+	WRITE_CHUNK_SIZE = 5000  # linhas por comando no rollback (fica abaixo do limite de parâmetros do SQLite)
+
+	@staticmethod
+	def capture(db: Session, reason: str, created_by: Optional[str] = None) -> Tuple[EmployeeSnapshot, bool]:
+		"""
+		Grava o estado atual da tabela employees (na transação da sessão; quem chama faz o commit)
+
+		Args:
+			db: Sessão do banco de dados
+			reason: Origem do snapshot (upload, clear_all, rollback ou manual)
+			created_by: E-mail de quem disparou
+
+		Returns:
+			(snapshot, criado). Se um snapshot com o mesmo conteúdo já existe, ele é devolvido e nada é gravado
+		"""
+		rows = db.execute(
+			select(*(getattr(Employees, field) for field in EmployeeSnapshots.FIELDS)).order_by(Employees.employee_email)
+		).all()
+		# linhas ordenadas por e-mail: o mesmo conteúdo sempre gera os mesmos bytes (e o mesmo hash)
+		content = orjson.dumps([tuple(row) for row in rows])
+		content_hash = hashlib.sha256(content).hexdigest()
+
+		existing = db.query(EmployeeSnapshot).filter(EmployeeSnapshot.content_hash == content_hash).first()
+		if existing is not None:
+			return existing, False
+
+		payload = zlib.compress(content, EmployeeSnapshots.COMPRESSION_LEVEL)
+		snapshot = EmployeeSnapshot(
+			content_hash=content_hash,
+			reason=reason,
+			employee_count=len(rows),
+			size_bytes=len(payload),
+			payload=payload,
+			created_at=utcnow(),
+			created_by=created_by
+		)
+		db.add(snapshot)
+		db.flush()
+		return snapshot, True
+
+	@staticmethod
+	def load(snapshot: EmployeeSnapshot) -> List[list]:
+		"""Linhas do snapshot (listas na ordem de FIELDS, data em ISO), ordenadas por e-mail"""
+		return orjson.loads(zlib.decompress(snapshot.payload))
+
+	@staticmethod
+	def diff(old_rows: List[list], new_rows: List[list], limit: int) -> dict:
+		"""
+		Compara dois snapshots pelo e-mail em O(n): um dicionário do antigo e uma passada pelo novo
+
+		Args:
+			old_rows: Linhas do snapshot de origem
+			new_rows: Linhas do snapshot de destino
+			limit: Máximo de itens listados em cada categoria (as contagens são sempre completas)
+
+		Returns:
+			Dicionário com contagens e listas de adicionados, removidos e alterados
+		"""
+		email = EmployeeSnapshots.EMAIL
+		old_by_email: Dict[str, list] = {row[email]: row for row in old_rows}
+
+		added, changed = [], []
+		added_count = changed_count = 0
+		for row in new_rows:
+			old = old_by_email.pop(row[email], None)
+			if old is None:
+				added_count += 1
+				if len(added) < limit:
+					added.append(EmployeeSnapshots._as_dict(row))
+			elif old != row:
+				changed_count += 1
+				if len(changed) < limit:
+					changed.append({
+						'employee_email': row[email],
+						'changes': {
+							field: [old_value, new_value]
+							for field, old_value, new_value in zip(EmployeeSnapshots.FIELDS, old, row)
+							if old_value != new_value
+						}
+					})
+
+		# o que sobrou no dicionário não existe no destino
+		removed = [EmployeeSnapshots._as_dict(row) for row in list(old_by_email.values())[:limit]]
+		return {
+			'added_count': added_count,
+			'removed_count': len(old_by_email),
+			'changed_count': changed_count,
+			'added': added,
+			'removed': removed,
+			'changed': changed
+		}
+
+	@staticmethod
+	def restore(db: Session, snapshot: EmployeeSnapshot) -> dict:
+		"""
+		Deixa a tabela employees igual ao snapshot com escritas em conjunto (DELETE ... IN, UPDATE em
+		massa pela chave e INSERT em lotes); registros iguais não são tocados e mantêm o id.
+		Roda na transação da sessão; quem chama faz o commit.
+
+		Args:
+			db: Sessão do banco de dados
+			snapshot: Snapshot a restaurar
+
+		Returns:
+			Contagens de inseridos, atualizados e removidos
+		"""
+		fields = EmployeeSnapshots.FIELDS
+		email = EmployeeSnapshots.EMAIL
+		hire_date = EmployeeSnapshots.HIRE_DATE
+		chunk = EmployeeSnapshots.WRITE_CHUNK_SIZE
+
+		current = {
+			row[email + 1]: (row[0], list(row[1:]))
+			for row in db.execute(select(Employees.id, *(getattr(Employees, field) for field in fields))).all()
+		}
+
+		to_insert, to_update, freed_employee_ids = [], [], []
+		for row in EmployeeSnapshots.load(snapshot):
+			values = dict(zip(fields, row))
+			values['hire_date'] = date.fromisoformat(row[hire_date])
+			existing = current.pop(row[email], None)
+			if existing is None:
+				to_insert.append(values)
+				continue
+
+			employee_pk, current_row = existing
+			current_row[hire_date] = current_row[hire_date].isoformat()
+			if current_row != row:
+				# só as colunas que mudaram: menos índices (e menos linhas do FTS) para manter
+				changed = {field: values[field] for field, old, new in zip(fields, current_row, row) if old != new}
+				to_update.append({'id': employee_pk, **changed})
+				if 'employee_id' in changed:
+					freed_employee_ids.append(employee_pk)
+		to_delete = [employee_pk for employee_pk, _ in current.values()]
+		# o UPDATE em massa agrupa linhas consecutivas com as mesmas colunas em um único executemany
+		to_update.sort(key=lambda values: tuple(values))
+
+		for start in range(0, len(to_delete), chunk):
+			db.execute(delete(Employees).where(Employees.id.in_(to_delete[start:start + chunk])))
+
+		# employee_id é único: quem troca de employee_id o libera antes (NULL pode repetir), evitando colisões no meio do lote
+		for start in range(0, len(freed_employee_ids), chunk):
+			db.execute(
+				update(Employees).where(Employees.id.in_(freed_employee_ids[start:start + chunk])).values(employee_id=None)
+			)
+
+		for start in range(0, len(to_update), chunk):
+			db.execute(update(Employees), to_update[start:start + chunk])
+
+		for start in range(0, len(to_insert), chunk):
+			db.execute(insert(Employees), to_insert[start:start + chunk])
+
+		return {'inserted': len(to_insert), 'updated': len(to_update), 'deleted': len(to_delete)}
+
+	@staticmethod
+	def _as_dict(row: list) -> dict:
+		return dict(zip(EmployeeSnapshots.FIELDS, row))
@@ -0,0 +1,198 @@
+import heapq
+import json
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+	"""Consultas de uma requisição, agrupadas pelo formato (texto normalizado) da consulta"""
+
+	__slots__ = ('queries', 'db_time', 'statements')
+
+	def __init__(self):
+		self.queries = 0
+		self.db_time = 0.0
+		self.statements: Dict[str, list] = {}  # formato -> [quantidade, segundos]
+
+	def add(self, statement: str, elapsed: float):
+		self.queries += 1
+		self.db_time += elapsed
+		stats = self.statements.get(statement)
+		if stats is None:
+			self.statements[statement] = [1, elapsed]
+		else:
+			stats[0] += 1
+			stats[1] += elapsed
+
+	def repeated(self, threshold: int) -> List[dict]:
+		"""Formatos executados mais de `threshold` vezes (padrão típico de N+1)"""
+		return [
+			{'statement': statement, 'count': count, 'db_time_ms': round(seconds * 1000, 2)}
+			for statement, (count, seconds) in sorted(self.statements.items(), key=lambda item: -item[1][0])
+			if count > threshold
+		]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar('sql_profile', default=None)
+
+
+class SqlProfiler:
+	"""Profiler de consultas por requisição (opcional, ligado por SQL_PROFILER=true)"""
+
+	# literais e listas de parâmetros viram "?": consultas iguais com valores diferentes têm o mesmo formato
+	_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+	_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+	_PARAM_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+	_WHITESPACE = re.compile(r'\s+')
+
+	def __init__(self, engine: Engine, repeat_threshold: int = 10, keep_slowest: int = 50, log_path: str = 'sql_profile.jsonl'):
+		"""
+		Args:
+			engine: Engine do banco de dados
+			repeat_threshold: Quantidade de repetições do mesmo formato de consulta que marca a requisição
+			keep_slowest: Quantas das requisições mais lentas são gravadas no log
+			log_path: Arquivo JSON lines com as requisições lentas ou marcadas
+		"""
+		self.engine = engine
+		self.repeat_threshold = repeat_threshold
+		self.keep_slowest = keep_slowest
+		self.log_path = log_path
+		self._slowest: List[float] = []  # min-heap com as durações das mais lentas
+		self._lock = threading.Lock()
+
+	@staticmethod
+	@lru_cache(maxsize=2048)
+	def normalize(statement: str) -> str:
+		"""
+		Normaliza o texto da consulta para agrupar execuções do mesmo formato
+
+		Args:
+			statement: SQL enviado ao banco
+
+		Returns:
+			SQL sem literais, com listas IN (?, ?, ...) colapsadas e espaços simplificados
+		"""
+		normalized = SqlProfiler._STRING_LITERAL.sub('?', statement)
+		normalized = SqlProfiler._NUMBER_LITERAL.sub('?', normalized)
+		normalized = SqlProfiler._PARAM_LIST.sub('(?...)', normalized)
+		return SqlProfiler._WHITESPACE.sub(' ', normalized).strip()
+
+	def install(self):
+		"""Registra os eventos do engine que alimentam o perfil da requisição atual"""
+
+		@event.listens_for(self.engine, 'before_cursor_execute')
+		def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+			if _current_profile.get() is not None:
+				conn.info.setdefault('profiler_query_start', []).append(time.perf_counter())
+
+		@event.listens_for(self.engine, 'after_cursor_execute')
+		def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+			profile = _current_profile.get()
+			starts = conn.info.get('profiler_query_start')
+			if profile is None or not starts:
+				return
+			profile.add(self.normalize(statement), time.perf_counter() - starts.pop())
+
+		@event.listens_for(self.engine, 'handle_error')
+		def _handle_error(exception_context):
+			connection = exception_context.connection
+			starts = connection.info.get('profiler_query_start') if connection is not None else None
+			if starts:
+				starts.pop()
+
+	def start_request(self):
+		profile = RequestProfile()
+		return profile, _current_profile.set(profile)
+
+	def end_request(self, token):
+		_current_profile.reset(token)
+
+	def record(self, method: str, path: str, status: int, duration: float, profile: RequestProfile, repeated: List[dict]):
+		"""Grava no log a requisição se ela for marcada (N+1) ou estiver entre as mais lentas até agora"""
+		with self._lock:
+			is_slowest = len(self._slowest) < self.keep_slowest or duration > self._slowest[0]
+			if is_slowest:
+				if len(self._slowest) < self.keep_slowest:
+					heapq.heappush(self._slowest, duration)
+				else:
+					heapq.heapreplace(self._slowest, duration)
+
+			if not (is_slowest or repeated):
+				return
+
+			slowest_statements = sorted(profile.statements.items(), key=lambda item: -item[1][1])[:5]
+			entry = {
+				'timestamp': datetime.now().isoformat(timespec='seconds'),
+				'method': method,
+				'path': path,
+				'status': status,
+				'duration_ms': round(duration * 1000, 2),
+				'db_queries': profile.queries,
+				'db_time_ms': round(profile.db_time * 1000, 2),
+				'reason': 'repeated_statements' if repeated else 'slowest',
+				'repeated_statements': repeated,
+				'top_statements': [
+					{'statement': statement, 'count': count, 'db_time_ms': round(seconds * 1000, 2)}
+					for statement, (count, seconds) in slowest_statements
+				]
+			}
+			with open(self.log_path, 'a', encoding='utf-8') as f:
+				f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+class SqlProfilerMiddleware:
+	"""
+	Middleware ASGI de depuração: adiciona X-DB-Queries e X-DB-Time (ms) às respostas e
+	X-DB-Repeated quando algum formato de consulta passa do limite de repetições
+	"""
+
+	def __init__(self, app, profiler: SqlProfiler):
+		self.app = app
+		self.profiler = profiler
+
+	async def __call__(self, scope, receive, send):
+		if scope['type'] != 'http':
+			await self.app(scope, receive, send)
+			return
+
+		profile, token = self.profiler.start_request()
+		status_holder = {'status': 500}
+
+		async def send_wrapper(message):
+			if message['type'] == 'http.response.start':
+				status_holder['status'] = message['status']
+				# consultas feitas até o início da resposta (respostas em streaming podem fazer mais depois)
+				headers = list(message.get('headers', []))
+				headers.append((b'x-db-queries', str(profile.queries).encode('latin-1')))
+				headers.append((b'x-db-time', f'{profile.db_time * 1000:.2f}'.encode('latin-1')))
+				repeated = profile.repeated(self.profiler.repeat_threshold)
+				if repeated:
+					headers.append((b'x-db-repeated', str(repeated[0]['count']).encode('latin-1')))
+				message = {**message, 'headers': headers}
+			await send(message)
+
+		start = time.perf_counter()
+		try:
+			await self.app(scope, receive, send_wrapper)
+		finally:
+			duration = time.perf_counter() - start
+			self.profiler.end_request(token)
+
+			repeated = profile.repeated(self.profiler.repeat_threshold)
+			if repeated:
+				logger.warning(
+					'%s %s: consulta repetida %sx (possível N+1): %s',
+					scope['method'], scope['path'], repeated[0]['count'], repeated[0]['statement'][:200]
+				)
+			self.profiler.record(scope['method'], scope['path'], status_holder['status'], duration, profile, repeated)
@@ -0,0 +1,115 @@
+import mimetypes
+import os
+import re
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+from utils.http_cache import HttpCache
+
+
+class StaticAsset:
+	"""Um arquivo do build do React, com o stat e as versões pré-comprimidas já resolvidos"""
+
+	__slots__ = ('path', 'stat', 'media_type', 'cache_control', 'variants')
+
+	def __init__(self, path: str, stat: os.stat_result, media_type: str, cache_control: str):
+		self.path = path
+		self.stat = stat
+		self.media_type = media_type
+		self.cache_control = cache_control
+		self.variants: Dict[str, tuple] = {}  # encoding -> (caminho, stat)
+
+
+class StaticManifest:
+	"""Índice em memória do frontend/build, montado uma vez no startup"""
+
+	# arquivos com hash de conteúdo no nome (ex.: main.3f2a1b9c.js) nunca mudam
+	HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.', re.IGNORECASE)
+	IMMUTABLE = 'public, max-age=31536000, immutable'
+	REVALIDATE = 'no-cache'
+
+	# extensão do arquivo pré-comprimido -> Content-Encoding, na ordem de preferência
+	ENCODINGS = (('.br', 'br'), ('.gz', 'gzip'))
+
+	def __init__(self, build_path: str):
+		"""
+		Args:
+			build_path: Pasta do build do React (ex.: frontend/build)
+		"""
+		self.build_path = build_path
+		self.assets: Dict[str, StaticAsset] = {}
+		self.index: Optional[StaticAsset] = None
+
+		if os.path.isdir(build_path):
+			self._scan()
+
+	@property
+	def has_index(self) -> bool:
+		return self.index is not None
+
+	def _scan(self):
+		compressed = []
+		for root, _, files in os.walk(self.build_path):
+			for name in files:
+				full_path = os.path.join(root, name)
+				relative = os.path.relpath(full_path, self.build_path).replace(os.sep, '/')
+
+				if any(name.endswith(extension) for extension, _ in self.ENCODINGS):
+					compressed.append((relative, full_path))
+					continue
+
+				media_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+				cache_control = self.IMMUTABLE if self.HASHED_NAME.search(name) else self.REVALIDATE
+				self.assets[relative] = StaticAsset(full_path, os.stat(full_path), media_type, cache_control)
+
+		# liga cada .br/.gz ao arquivo original (ex.: static/js/main.abc123.js.br)
+		for relative, full_path in compressed:
+			for extension, encoding in self.ENCODINGS:
+				if relative.endswith(extension):
+					original = self.assets.get(relative[:-len(extension)])
+					if original is not None:
+						original.variants[encoding] = (full_path, os.stat(full_path))
+
+		self.index = self.assets.get('index.html')
+
+	def response(self, full_path: str, request: Request) -> Response:
+		"""
+		Responde um arquivo do build sem acessar o disco para decidir qual arquivo é;
+		caminhos desconhecidos (rotas do React Router) recebem o index.html
+
+		Args:
+			full_path: Caminho pedido, relativo à raiz do site
+			request: Requisição recebida (If-None-Match e Accept-Encoding)
+
+		Returns:
+			Arquivo com os headers de cache (ou 304 se o navegador já tem esta versão)
+		"""
+		asset = self.assets.get(full_path) or self.index
+		path, stat = asset.path, asset.stat
+
+		headers = {'Cache-Control': asset.cache_control}
+		if asset.variants:
+			headers['Vary'] = 'Accept-Encoding'
+			accepted = {item.split(';')[0].strip() for item in request.headers.get('accept-encoding', '').split(',')}
+			for _, encoding in self.ENCODINGS:
+				if encoding in asset.variants and encoding in accepted:
+					path, stat = asset.variants[encoding]
+					headers['Content-Encoding'] = encoding
+					break
+
+		response = FileResponse(path, stat_result=stat, media_type=asset.media_type, headers=headers)
+
+		etag = response.headers.get('etag')
+		if etag and 'Content-Encoding' not in headers:
+			# sem variante pré-comprimida o GZipMiddleware pode comprimir o arquivo: o ETag não pode ser forte
+			etag = response.headers['etag'] = 'W/' + etag
+
+		if HttpCache.matches(request.headers.get('if-none-match'), etag):
+			not_modified_headers = {'ETag': etag, 'Cache-Control': asset.cache_control}
+			if asset.variants:
+				not_modified_headers['Vary'] = 'Accept-Encoding'
+			return Response(status_code=304, headers=not_modified_headers)
+
+		return response